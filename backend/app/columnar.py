@@ -0,0 +1,167 @@
+"""Arrow IPC copies of the crosswalk that are read through a memory map.
+
+``mnet_data.json`` is one nested document that every consumer parses in
+full. The columnar copy splits it into the normalized ``mosids``, ``nocs``,
+``noc_task_statements``, ``mosid_noc_mappings`` and ``mosid_noc_titles``
+tables, with the same columns and row IDs as the SQLite artifact. The files are uncompressed Arrow IPC, so opening one maps
+the file and hands out column buffers that point into the page cache.
+Nothing is decoded until a column is read.
+
+pyarrow is optional (``poetry install -E columnar``) and only imported
+when one of these functions runs.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Iterable, Mapping, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from app.loader import TABLE_COLUMNS, build_rows
+
+if TYPE_CHECKING:
+    import pyarrow
+
+ARROW_SUFFIX = ".arrow"
+
+INTEGER_COLUMNS = frozenset({"id", "position"})
+
+# Same columns as the SQLite tables; integer keys are 32-bit, everything else text.
+MNET_TABLES: dict[str, tuple[tuple[str, str], ...]] = {
+    table: tuple(
+        (column, "int32" if column in INTEGER_COLUMNS or column.endswith("_id") else "string")
+        for column in TABLE_COLUMNS[table]
+    )
+    for table in ("mosids", "nocs", "noc_task_statements", "mosid_noc_mappings", "mosid_noc_titles")
+}
+
+DEFAULT_BATCH_SIZE = 65_536
+
+
+def require_pyarrow():
+    """Import pyarrow or explain how to install it."""
+
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+    except ImportError as exc:  # pragma: no cover - depends on the environment
+        raise RuntimeError("Columnar output needs pyarrow: poetry install -E columnar") from exc
+    return pyarrow
+
+
+class TableWriter:
+    """Appends rows to an Arrow IPC file one record batch at a time.
+
+    The file is written under a temporary name and renamed into place on
+    ``close``, so readers never map a half-written table.
+    """
+
+    def __init__(self, path: Path, fields: Sequence[tuple[str, str]], batch_size: int = DEFAULT_BATCH_SIZE):
+        pa = require_pyarrow()
+        self.path = Path(path)
+        self.schema = pa.schema([(name, getattr(pa, type_name)()) for name, type_name in fields])
+        self.batch_size = batch_size
+        self.rows = 0
+        self._columns: list[list] = [[] for _ in fields]
+        self._tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        self._writer = pa.ipc.new_file(str(self._tmp_path), self.schema)
+
+    def __enter__(self) -> "TableWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, row: Sequence[Any]) -> None:
+        for column, value in zip(self._columns, row):
+            column.append(value)
+        self.rows += 1
+        if len(self._columns[0]) >= self.batch_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._columns[0]:
+            pa = require_pyarrow()
+            self._writer.write_batch(pa.record_batch(self._columns, schema=self.schema))
+            self._columns = [[] for _ in self._columns]
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        self._writer.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+
+def write_table(path: Path, fields: Sequence[tuple[str, str]], rows: Iterable[Sequence[Any]]) -> int:
+    """Write ``rows`` to one Arrow file and return how many were written."""
+
+    with TableWriter(path, fields) as writer:
+        for row in rows:
+            writer.write(row)
+    return writer.rows
+
+
+def table_path(directory: Path, table: str) -> Path:
+    return Path(directory) / f"{table}{ARROW_SUFFIX}"
+
+
+def write_mnet_tables(mnet_data: Mapping[str, Iterable[Mapping[str, Any]]], directory: Path) -> dict[str, int]:
+    """Write the crosswalk as one Arrow file per table; returns row counts."""
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    rows = build_rows(mnet_data, [])
+    return {table: write_table(table_path(directory, table), fields, rows[table]) for table, fields in MNET_TABLES.items()}
+
+
+def read_table(path: Path) -> "pyarrow.Table":
+    """Memory-map an Arrow file; column buffers reference the mapping, not copies."""
+
+    pa = require_pyarrow()
+    with pa.memory_map(str(path)) as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def read_mnet_tables(directory: Path) -> dict[str, "pyarrow.Table"]:
+    return {table: read_table(table_path(directory, table)) for table in MNET_TABLES}
+
+
+def mnet_table_files(directory: Path) -> list[Path]:
+    return [table_path(directory, table) for table in MNET_TABLES]
+
+
+def read_mnet_data(directory: Path) -> dict[str, list[dict[str, Any]]]:
+    """Rebuild the ``mnet_data.json`` mapping from the columnar tables."""
+
+    tables = {table: value.to_pydict() for table, value in read_mnet_tables(directory).items()}
+    mosids, nocs = tables["mosids"], tables["nocs"]
+    mappings, overrides = tables["mosid_noc_mappings"], tables["mosid_noc_titles"]
+
+    noc_titles = dict(zip(nocs["noc"], nocs["title"]))
+    statements: dict[str, list[str]] = {noc_code: [] for noc_code in noc_titles}
+    rows = tables["noc_task_statements"]
+    for noc_code, _, statement in sorted(zip(rows["noc"], rows["position"], rows["statement"])):
+        statements[noc_code].append(statement)
+    mapping_titles = dict(zip(overrides["mapping_id"], overrides["title"]))
+
+    data: dict[str, list[dict[str, Any]]] = {}
+    labels: dict[str, str] = {}
+    for code, title in zip(mosids["mosid"], mosids["title"]):
+        labels[code] = f"{code}: {title}"
+        data[labels[code]] = []
+    for mapping_id, code, noc_code in sorted(zip(mappings["id"], mappings["mosid"], mappings["noc"])):
+        data[labels[code]].append(
+            {
+                "noc_code": noc_code,
+                "civilian_title": mapping_titles.get(mapping_id, noc_titles[noc_code]),
+                "task_statements": list(statements[noc_code]),
+            }
+        )
+    return data
@@ -0,0 +1,334 @@
+"""Build and open the read-only SQLite artifact served by the backend.
+
+The database is produced by an explicit build step from the curated JSON and
+YAML sources. A content hash of those sources is stored inside the artifact so
+that the server can open it read-only at startup and only rebuild it when the
+sources have changed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from app.loader import LoadStats, bulk_load, load_sources
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+DEFAULT_DB_PATH = Path(__file__).resolve().parent.parent / "mnet.db"
+MNET_DATA_PATH = DATA_DIR / "mnet_data.json"
+RANKS_PATH = DATA_DIR / "rank_responsibilities.yaml"
+
+SCHEMA_PATH = Path(__file__).resolve().parent.parent / "db" / "schema.sql"
+
+# Bump whenever the table layout or loading rules change so that existing
+# artifacts are rebuilt even if the source files are untouched.
+SCHEMA_VERSION = 6
+
+# Created after the bulk load so rows are not indexed one insert at a time.
+# ``nocs`` and ``noc_task_statements`` are clustered on their primary keys,
+# and ``mosids`` and ``ranks`` are searched through the automatic indexes
+# behind their key constraints. The loader writes at most one title override
+# per mapping; declaring that unique lets SQLite join the overrides without
+# giving up the index order of the profile queries. The mapping indexes lead
+# with the join key and carry the selected columns, so lookups never touch
+# the table b-tree; the first keeps ``id`` next so equivalencies come back in
+# source order without a sort.
+INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_mosid_noc_mappings_mosid ON mosid_noc_mappings (mosid, id, noc)",
+    "CREATE INDEX IF NOT EXISTS idx_mosid_noc_mappings_noc ON mosid_noc_mappings (noc, mosid)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_mosid_noc_titles_mapping ON mosid_noc_titles (mapping_id)",
+    "CREATE INDEX IF NOT EXISTS idx_rank_responsibilities_rank ON rank_responsibilities (rank_id, id, responsibility)",
+)
+
+# Profile rows are ``(mosid, title, mapping id, noc, civilian title,
+# statement)``, one per task statement. The mapping and statement columns
+# are NULL for a MOSID without equivalencies or a NOC without statements.
+# A mapping's civilian title falls back to the NOC's when it has no
+# override. Rows are grouped in Python by ``group_mosid_rows``. Ordering on
+# ``m.rowid`` as well as the code tells SQLite each ``mosids`` row is
+# distinct, so the rest of the ``ORDER BY`` is satisfied by the index order
+# instead of a per-MOSID sort.
+_PROFILE_COLUMNS = "m.mosid, m.title, mm.id, mm.noc, COALESCE(mt.title, n.title), s.statement"
+_PROFILE_JOINS = """
+    LEFT JOIN mosid_noc_mappings AS mm ON mm.mosid = m.mosid
+    LEFT JOIN nocs AS n ON n.noc = mm.noc
+    LEFT JOIN mosid_noc_titles AS mt ON mt.mapping_id = mm.id
+    LEFT JOIN noc_task_statements AS s ON s.noc = mm.noc"""
+
+MOSID_PROFILE_SQL = f"""
+    SELECT {_PROFILE_COLUMNS}
+    FROM mosids AS m{_PROFILE_JOINS}
+    WHERE m.mosid = ?
+    ORDER BY m.mosid, m.rowid, mm.id, s.position
+"""
+
+ALL_MOSID_PROFILES_SQL = f"""
+    SELECT {_PROFILE_COLUMNS}
+    FROM mosids AS m{_PROFILE_JOINS}
+    ORDER BY m.mosid, m.rowid, mm.id, s.position
+"""
+
+# Full-crosswalk export, resumable from the last MOSID sent. Optional
+# filters are appended by ``iter_export_profiles``.
+EXPORT_PROFILES_SQL = f"""
+    SELECT {_PROFILE_COLUMNS}
+    FROM mosids AS m{_PROFILE_JOINS}
+    WHERE m.mosid > ?{{filters}}
+    ORDER BY m.mosid, m.rowid, mm.id, s.position
+"""
+
+# Every MOSID↔NOC mapping in reverse-lookup order, read once to build the
+# precomputed NOC index.
+NOC_MAPPINGS_SQL = """
+    SELECT mm.noc, COALESCE(mt.title, n.title), m.mosid, m.title
+    FROM mosid_noc_mappings AS mm
+    JOIN mosids AS m ON m.mosid = mm.mosid
+    JOIN nocs AS n ON n.noc = mm.noc
+    LEFT JOIN mosid_noc_titles AS mt ON mt.mapping_id = mm.id
+    ORDER BY mm.noc, mm.mosid
+"""
+
+# Every NOC's own title and canonical task statements, read once to build
+# the recommendation vectors.
+NOC_STATEMENTS_SQL = """
+    SELECT n.noc, n.title, s.statement
+    FROM nocs AS n
+    LEFT JOIN noc_task_statements AS s ON s.noc = n.noc
+    ORDER BY n.noc, s.position
+"""
+
+# Codes are bound directly in ``IN (...)`` lists of at most this many, which
+# stays clear of SQLite's host-parameter limit. Larger batches run one such
+# query per chunk rather than staging the codes in a temporary table, so the
+# lookup also works on the read-only (``query_only``) pooled connections.
+BATCH_IN_LIMIT = 500
+
+MOSID_PROFILES_IN_SQL = f"""
+    SELECT {_PROFILE_COLUMNS}
+    FROM mosids AS m{_PROFILE_JOINS}
+    WHERE m.mosid IN ({{placeholders}})
+    ORDER BY m.mosid, m.rowid, mm.id, s.position
+"""
+
+RANK_RESPONSIBILITIES_SQL = """
+    SELECT rr.responsibility
+    FROM ranks AS r
+    LEFT JOIN rank_responsibilities AS rr ON rr.rank_id = r.id
+    WHERE r.rank_name = ?
+    ORDER BY rr.id
+"""
+
+ALL_RANK_RESPONSIBILITIES_SQL = """
+    SELECT r.rank_name, rr.responsibility
+    FROM ranks AS r
+    LEFT JOIN rank_responsibilities AS rr ON rr.rank_id = r.id
+    ORDER BY r.id, rr.id
+"""
+
+
+def source_hash(mnet_path: Path = MNET_DATA_PATH, ranks_path: Path = RANKS_PATH) -> str:
+    """Return a SHA-256 digest covering the schema version and source files."""
+
+    digest = hashlib.sha256(f"schema:{SCHEMA_VERSION}\n".encode())
+    for path in (*source_files(mnet_path), ranks_path):
+        digest.update(f"{Path(path).name}\n".encode())
+        digest.update(Path(path).read_bytes())
+    return digest.hexdigest()
+
+
+def source_files(mnet_path: Path) -> list[Path]:
+    """The file(s) behind ``mnet_path``, which may be a columnar table directory."""
+
+    if Path(mnet_path).is_dir():
+        from app.columnar import mnet_table_files
+
+        return mnet_table_files(mnet_path)
+    return [Path(mnet_path)]
+
+
+def create_schema(conn: sqlite3.Connection) -> None:
+    """Create every table in ``db/schema.sql``."""
+
+    conn.executescript(SCHEMA_PATH.read_text())
+
+
+def build_database(
+    db_path: Path = DEFAULT_DB_PATH,
+    mnet_path: Path = MNET_DATA_PATH,
+    ranks_path: Path = RANKS_PATH,
+) -> tuple[str, LoadStats]:
+    """Build a fresh database artifact at ``db_path``.
+
+    The artifact is written to a temporary file in the same directory and
+    moved into place with an atomic rename, so concurrent readers either see
+    the previous artifact or the complete new one, never a partial build.
+    Returns the source hash stored in the artifact and the bulk load stats.
+    """
+
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    digest = source_hash(mnet_path, ranks_path)
+
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{db_path.name}.", suffix=".tmp", dir=db_path.parent)
+    os.close(fd)
+    try:
+        conn = sqlite3.connect(tmp_name)
+        try:
+            # The temporary file is discarded on failure, so durability during
+            # the build only costs time.
+            conn.execute("PRAGMA journal_mode = OFF")
+            conn.execute("PRAGMA synchronous = OFF")
+            create_schema(conn)
+            stats = bulk_load(conn, *load_sources(mnet_path, ranks_path), indexes=INDEXES)
+            conn.execute("INSERT INTO search_index (search_index) VALUES ('optimize')")
+            conn.executemany(
+                "INSERT INTO build_info (key, value) VALUES (?, ?)",
+                (
+                    ("schema_version", str(SCHEMA_VERSION)),
+                    ("source_hash", digest),
+                    ("built_at", datetime.now(timezone.utc).isoformat()),
+                ),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        os.replace(tmp_name, db_path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return digest, stats
+
+
+def connect_readonly(db_path: Path = DEFAULT_DB_PATH) -> sqlite3.Connection:
+    """Open ``db_path`` in SQLite read-only mode."""
+
+    return sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+
+
+def read_build_info(db_path: Path = DEFAULT_DB_PATH) -> dict[str, str]:
+    """Return the metadata stored in an artifact, or ``{}`` if it is unusable."""
+
+    if not Path(db_path).is_file():
+        return {}
+    try:
+        conn = connect_readonly(db_path)
+        try:
+            return dict(conn.execute("SELECT key, value FROM build_info"))
+        finally:
+            conn.close()
+    except sqlite3.DatabaseError:
+        return {}
+
+
+def ensure_database(
+    db_path: Path = DEFAULT_DB_PATH,
+    mnet_path: Path = MNET_DATA_PATH,
+    ranks_path: Path = RANKS_PATH,
+) -> str:
+    """Rebuild the artifact only if its stored hash differs from the sources.
+
+    Returns the source hash of the artifact that is now in place.
+    """
+
+    expected = source_hash(mnet_path, ranks_path)
+    if read_build_info(db_path).get("source_hash") != expected:
+        build_database(db_path, mnet_path, ranks_path)
+    return expected
+
+
+def group_mosid_rows(rows: Iterable[tuple]) -> Iterator[tuple[str, dict]]:
+    """Fold joined MOSID rows into ``(mosid_code, profile)`` pairs.
+
+    ``rows`` must have the column layout of ``MOSID_PROFILE_SQL`` and be
+    ordered by MOSID, then mapping.
+    """
+
+    profile: dict | None = None
+    mapping_id = None
+    equivalency: dict | None = None
+    for mosid_code, mosid_title, row_mapping_id, noc_code, civilian_title, statement in rows:
+        if profile is None or profile["mosid"] != mosid_code:
+            if profile is not None:
+                yield profile["mosid"], profile
+            mapping_id = None
+            profile = {"mosid": mosid_code, "title": mosid_title, "equivalencies": []}
+        if row_mapping_id is None:
+            continue
+        if row_mapping_id != mapping_id:
+            mapping_id = row_mapping_id
+            equivalency = {"noc_code": noc_code, "civilian_title": civilian_title, "task_statements": []}
+            profile["equivalencies"].append(equivalency)
+        if statement is not None:
+            equivalency["task_statements"].append(statement)
+    if profile is not None:
+        yield profile["mosid"], profile
+
+
+def fetch_mosid_profile(conn: sqlite3.Connection, mosid_code: str) -> dict:
+    """Return the profile for ``mosid_code`` or ``{}`` when it is unknown."""
+
+    for _, profile in group_mosid_rows(conn.execute(MOSID_PROFILE_SQL, (mosid_code,))):
+        return profile
+    return {}
+
+
+def fetch_mosid_profiles(
+    conn: sqlite3.Connection, mosid_codes: Iterable[str]
+) -> tuple[dict[str, dict], list[str]]:
+    """Resolve many MOSID codes with one joined query per ``BATCH_IN_LIMIT`` codes.
+
+    Returns the profiles keyed by code in request order (duplicates
+    collapsed) and the list of requested codes that were not found.
+    """
+
+    requested = list(dict.fromkeys(mosid_codes))
+    found: dict[str, dict] = {}
+    for start in range(0, len(requested), BATCH_IN_LIMIT):
+        chunk = requested[start:start + BATCH_IN_LIMIT]
+        sql = MOSID_PROFILES_IN_SQL.format(placeholders=", ".join("?" * len(chunk)))
+        found.update(group_mosid_rows(conn.execute(sql, chunk)))
+    profiles = {code: found[code] for code in requested if code in found}
+    missing = [code for code in requested if code not in found]
+    return profiles, missing
+
+
+def iter_export_profiles(
+    conn: sqlite3.Connection,
+    after: str | None = None,
+    mosid_prefix: str | None = None,
+    noc_code: str | None = None,
+) -> Iterator[dict]:
+    """Stream MOSID profiles in code order straight off a SQLite cursor.
+
+    Rows are fetched and grouped lazily, so memory stays constant no matter
+    how many profiles are exported. ``after`` resumes strictly after the
+    given MOSID code; ``mosid_prefix`` and ``noc_code`` narrow the export.
+    """
+
+    filters = []
+    params: list[str] = [after or ""]
+    if mosid_prefix:
+        # A half-open range keeps the prefix filter on the MOSID index.
+        filters.append("m.mosid >= ? AND m.mosid < ?")
+        params += [mosid_prefix, mosid_prefix[:-1] + chr(ord(mosid_prefix[-1]) + 1)]
+    if noc_code:
+        filters.append("m.mosid IN (SELECT mosid FROM mosid_noc_mappings WHERE noc = ?)")
+        params.append(noc_code)
+    sql = EXPORT_PROFILES_SQL.format(filters="".join(f" AND {clause}" for clause in filters))
+    for _, profile in group_mosid_rows(conn.execute(sql, params)):
+        yield profile
+
+
+def fetch_rank(conn: sqlite3.Connection, rank_name: str) -> dict:
+    """Return the responsibilities for ``rank_name`` or ``{}`` when unknown."""
+
+    rows = conn.execute(RANK_RESPONSIBILITIES_SQL, (rank_name,)).fetchall()
+    if not rows:
+        return {}
+    responsibilities = [responsibility for (responsibility,) in rows if responsibility is not None]
+    return {"rank": rank_name, "responsibilities": responsibilities}
@@ -0,0 +1,373 @@
+"""FastAPI application serving the HTTP API and mounting the MCP server.
+
+``app`` is the ASGI callable deployments run (``uvicorn app.http_app:app``).
+The MCP SDK is only imported when the first request reaches ``/mcp``, so
+API-only processes start without it.
+"""
+
+import hmac
+import os
+import zlib
+from contextlib import closing
+
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
+from pydantic import BaseModel, Field
+
+from app.database import iter_export_profiles
+from app.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from app.response_cache import dump_json, etag_matches
+from app.search import SEARCH_KINDS
+from app.service import (
+    DB_PATH,
+    MAX_DOCUMENT_CHARS,
+    MAX_ENTRY_CHARS,
+    MAX_TRANSLATE_ENTRIES,
+    METRICS,
+    POOL,
+    RECOMMEND_MAX_LIMIT,
+    RECOMMEND_MAX_TEXT_CHARS,
+    RESPONSE_CACHE,
+    SEARCH_MAX_LIMIT,
+    cached_mosid,
+    cached_mosids,
+    connect_shared,
+    get_noc_mosids,
+    get_rank_data_async,
+    match_indicators,
+    recommend_nocs,
+    resume_jobs,
+    search,
+    similar_mosids,
+    translate,
+)
+
+CACHE_CONTROL = "public, max-age=300"
+
+# Upper bound for batch lookups from internal services; public callers keep
+# the smaller limit on ``BatchMosidRequest``.
+INTERNAL_BATCH_LIMIT = 1000
+
+# Shared secret internal services send as ``X-Internal-Token``. The
+# ``/internal`` routes refuse every request while it is unset.
+INTERNAL_TOKEN = os.environ.get("CAF_RESUME_INTERNAL_TOKEN", "")
+
+MAX_JOB_UPLOAD_BYTES = 256 * 1024 * 1024
+
+# Export responses are written in chunks of roughly this many bytes.
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+class BatchMosidRequest(BaseModel):
+    """Request payload for MOSID batch lookups."""
+
+    mosid_codes: list[str] = Field(..., min_length=1, max_length=25)
+
+
+class InternalBatchMosidRequest(BatchMosidRequest):
+    """Batch payload for trusted internal callers, which may send larger lists."""
+
+    mosid_codes: list[str] = Field(..., min_length=1, max_length=INTERNAL_BATCH_LIMIT)
+
+
+class IndicatorMatchRequest(BaseModel):
+    """Request payload for indicator scans over service-history text."""
+
+    text: str = Field(..., max_length=MAX_DOCUMENT_CHARS)
+    mosid_family: str | None = None
+
+
+class TranslationEntry(BaseModel):
+    """One service-history entry to translate into résumé bullets."""
+
+    id: str | None = None
+    indicators: list[str] = Field(default_factory=list)
+    text: str | None = Field(None, max_length=MAX_ENTRY_CHARS)
+    values: dict[str, str | int | float] = Field(default_factory=dict)
+    mosid_family: str | None = None
+
+
+class BatchTranslateRequest(BaseModel):
+    """Request payload for batch résumé bullet translation."""
+
+    entries: list[TranslationEntry] = Field(..., min_length=1, max_length=MAX_TRANSLATE_ENTRIES)
+    mosid_family: str | None = None
+
+
+class RecommendNocsRequest(BaseModel):
+    """Request payload for NOC recommendations from free text."""
+
+    text: str = Field(..., min_length=1, max_length=RECOMMEND_MAX_TEXT_CHARS)
+    limit: int = Field(10, ge=1, le=RECOMMEND_MAX_LIMIT)
+
+
+def require_internal_caller(x_internal_token: str | None = Header(None)) -> None:
+    """Admit only callers presenting the shared internal token."""
+
+    if not INTERNAL_TOKEN or not hmac.compare_digest((x_internal_token or "").encode(), INTERNAL_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="This route is reserved for internal services.")
+
+
+def _not_found(detail: str) -> HTTPException:
+    """Return a standardized 404 error."""
+
+    return HTTPException(status_code=404, detail=detail)
+
+
+class _LazyMCPApp:
+    """ASGI app that imports ``app.mcp_app`` on the first ``/mcp`` request."""
+
+    def __init__(self):
+        self._app = None
+
+    async def __call__(self, scope, receive, send):
+        if self._app is None:
+            from app.mcp_app import mcp
+
+            self._app = mcp.streamable_http_app()
+        await self._app(scope, receive, send)
+
+
+# ``app`` remains the public ASGI callable expected by deployment scripts.
+app = FastAPI(title="CAF Resume Helper API", version="1.0.0")
+app.add_middleware(METRICS.middleware)
+
+
+@app.get("/v1/ranks/{rank_name}")
+async def read_rank(rank_name: str):
+    """HTTP endpoint exposing rank responsibilities."""
+
+    data = await get_rank_data_async(rank_name)
+    if not data:
+        raise _not_found(
+            f"Rank {rank_name} is not present in the CAF Resume Helper dataset."
+        )
+    return data
+
+
+@app.get("/v1/mosids/{mosid_code}")
+async def read_mosid(mosid_code: str, request: Request):
+    """HTTP endpoint exposing MOSID equivalency data."""
+
+    entry = await cached_mosid(mosid_code)
+    if entry is None:
+        raise _not_found(
+            f"MOSID code {mosid_code} is not present in the CAF Resume Helper dataset."
+        )
+    headers = {"ETag": entry.etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+def _iter_export_chunks(after, mosid_prefix, noc_code, compress: bool):
+    """Yield NDJSON export chunks, optionally as one streaming gzip member.
+
+    ``StreamingResponse`` advances this generator on whichever threadpool
+    worker is free, so the connection must not be bound to one thread.
+    """
+
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if compress else None
+    buffer = bytearray()
+    with closing(connect_shared(DB_PATH)) as conn:
+        for profile in iter_export_profiles(conn, after, mosid_prefix, noc_code):
+            buffer += dump_json(profile) + b"\n"
+            if len(buffer) >= EXPORT_CHUNK_BYTES:
+                chunk = bytes(buffer)
+                buffer.clear()
+                if compressor is not None:
+                    # Sync-flush so clients can decode every chunk as it arrives.
+                    chunk = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+                yield chunk
+    if compressor is not None:
+        yield compressor.compress(bytes(buffer)) + compressor.flush()
+    elif buffer:
+        yield bytes(buffer)
+
+
+async def _batch_response(mosid_codes: list[str]) -> Response:
+    """Assemble a batch body from cached profiles, resolving misses in one query."""
+
+    entries, not_found = await cached_mosids(mosid_codes)
+    results = b",".join(dump_json(code) + b":" + entry.body for code, entry in entries.items())
+    body = b'{"results":{' + results + b'},"not_found":' + dump_json(not_found) + b"}"
+    return Response(content=body, media_type="application/json")
+
+
+@app.post("/v1/mosids:batchLookup")
+async def batch_mosid_lookup(request: BatchMosidRequest):
+    """HTTP endpoint for batch MOSID lookups."""
+
+    return await _batch_response(request.mosid_codes)
+
+
+@app.post(
+    "/internal/v1/mosids:batchLookup",
+    include_in_schema=False,
+    dependencies=[Depends(require_internal_caller)],
+)
+async def internal_batch_mosid_lookup(request: InternalBatchMosidRequest):
+    """Batch MOSID lookup with the higher limit reserved for internal callers."""
+
+    return await _batch_response(request.mosid_codes)
+
+
+@app.get("/v1/nocs/{noc_code}/mosids")
+def read_noc_mosids(noc_code: str):
+    """HTTP endpoint listing the MOSIDs that map to a NOC code or group prefix."""
+
+    data = get_noc_mosids(noc_code)
+    if not data:
+        raise _not_found(
+            f"NOC code {noc_code} has no MOSID mappings in the CAF Resume Helper dataset."
+        )
+    return data
+
+
+@app.get("/v1/mosids/{mosid_code}/similar")
+def read_similar_mosids(mosid_code: str, limit: int = Query(10, ge=1, le=RECOMMEND_MAX_LIMIT)):
+    """HTTP endpoint listing the MOSIDs with the most similar duties."""
+
+    data = similar_mosids(mosid_code, limit)
+    if not data:
+        raise _not_found(
+            f"MOSID code {mosid_code} is not present in the CAF Resume Helper dataset."
+        )
+    return data
+
+
+@app.get("/v1/mosids/{mosid_code}/recommendedNocs")
+def read_recommended_nocs(mosid_code: str, limit: int = Query(10, ge=1, le=RECOMMEND_MAX_LIMIT)):
+    """HTTP endpoint recommending NOCs a MOSID is not already mapped to."""
+
+    data = recommend_nocs(mosid_code=mosid_code, limit=limit)
+    if not data:
+        raise _not_found(
+            f"MOSID code {mosid_code} is not present in the CAF Resume Helper dataset."
+        )
+    return data
+
+
+@app.post("/v1/nocs:recommend")
+def recommend_nocs_for_text(request: RecommendNocsRequest):
+    """HTTP endpoint recommending NOCs for free text."""
+
+    return recommend_nocs(text=request.text, limit=request.limit)
+
+
+@app.get("/v1/search")
+async def read_search(
+    q: str = Query(..., min_length=1),
+    kind: str | None = Query(None, pattern=f"^({'|'.join(SEARCH_KINDS)})$"),
+    limit: int = Query(10, ge=1, le=SEARCH_MAX_LIMIT),
+    offset: int = Query(0, ge=0),
+):
+    """HTTP endpoint for ranked full-text search with result snippets."""
+
+    return await search(q, kind, limit, offset)
+
+
+@app.post("/v1/indicators:match")
+def match_indicator_text(request: IndicatorMatchRequest):
+    """HTTP endpoint scanning service-history text for catalogued indicators."""
+
+    return match_indicators(request.text, request.mosid_family)
+
+
+@app.post("/v1/translations:batchTranslate")
+def batch_translate(request: BatchTranslateRequest):
+    """HTTP endpoint rendering résumé bullets for a batch of entries."""
+
+    entries = [entry.model_dump(exclude_none=True) for entry in request.entries]
+    return translate(entries, request.mosid_family)
+
+
+@app.post("/v1/resumeJobs", status_code=202)
+async def create_resume_job(request: Request, response: Response):
+    """Start a batch résumé job over a JSONL upload of member records.
+
+    Poll ``GET /v1/resumeJobs/{job_id}`` for progress and fetch the résumés
+    from ``GET /v1/resumeJobs/{job_id}/results`` once it has succeeded.
+    """
+
+    job = resume_jobs().new_job()
+    size = 0
+    try:
+        with open(job.input_path, "wb") as upload:
+            async for chunk in request.stream():
+                size += len(chunk)
+                if size > MAX_JOB_UPLOAD_BYTES:
+                    raise HTTPException(status_code=413, detail="Upload exceeds the batch job size limit.")
+                upload.write(chunk)
+        if not size:
+            raise HTTPException(status_code=400, detail="Upload at least one member record.")
+    except BaseException:
+        # Rejected or interrupted uploads leave no job behind.
+        resume_jobs().discard(job)
+        raise
+    resume_jobs().start(job)
+    response.headers["Location"] = f"/v1/resumeJobs/{job.job_id}"
+    return {**job.as_dict(), "results_url": f"/v1/resumeJobs/{job.job_id}/results"}
+
+
+@app.get("/v1/resumeJobs/{job_id}")
+def read_resume_job(job_id: str):
+    """Return a batch job's status, progress and per-stage timings."""
+
+    job = resume_jobs().get(job_id)
+    if job is None:
+        raise _not_found("Job not found")
+    return job.as_dict()
+
+
+@app.get("/v1/resumeJobs/{job_id}/results")
+def read_resume_job_results(job_id: str):
+    """Download a finished job's résumés as newline-delimited JSON."""
+
+    job = resume_jobs().get(job_id)
+    if job is None:
+        raise _not_found("Job not found")
+    if job.status != "succeeded":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}.")
+    return FileResponse(job.output_path, media_type="application/x-ndjson")
+
+
+@app.get("/v1/mosids:export")
+def export_mosids(
+    request: Request,
+    noc_code: str | None = None,
+    mosid_prefix: str | None = None,
+    after: str | None = None,
+):
+    """Stream every MOSID profile as newline-delimited JSON.
+
+    Pass the last ``mosid`` received as ``after`` to resume an interrupted
+    export. The body is gzip-encoded when the client accepts it.
+    """
+
+    compress = "gzip" in request.headers.get("accept-encoding", "")
+    headers = {"Vary": "Accept-Encoding"}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        _iter_export_chunks(after, mosid_prefix, noc_code, compress),
+        media_type="application/x-ndjson",
+        headers=headers,
+    )
+
+
+@app.get("/metrics", include_in_schema=False)
+async def read_metrics():
+    """Prometheus text-format metrics for routes, MCP tools, SQLite and caches."""
+
+    return Response(METRICS.render(), media_type=METRICS_CONTENT_TYPE)
+
+
+@app.get("/internal/v1/stats", include_in_schema=False, dependencies=[Depends(require_internal_caller)])
+async def read_internal_stats():
+    """Connection pool queue-wait, response cache and job figures for capacity planning."""
+
+    return {"pool": POOL.stats(), "response_cache": RESPONSE_CACHE.stats(), "resume_jobs": resume_jobs().stats()}
+
+
+app.mount("/mcp", _LazyMCPApp())
@@ -0,0 +1,376 @@
+"""Memory-mapped binary image of the MOSID and rank datasets.
+
+The image is a single read-only file built from the SQLite artifact. Every
+uvicorn worker maps it with ``mmap``, so the operating system keeps one copy
+of the pages no matter how many workers are running, unlike the per-process
+dicts of the ``snapshot`` backend or the per-connection SQLite page caches.
+
+Layout (all integers little-endian ``uint32``)::
+
+    header    magic, source hash, then (offset, length) for each section
+    strings   offsets into the UTF-8 blob; string ``i`` is blob[o[i]:o[i+1]]
+    mosids    code and title string ids, sorted by the UTF-8 bytes of the
+              code, plus an equivalency offset array (length + 1)
+    nocs      NOC code, civilian title and task statement list string ids
+    noc index NOC code string ids of every equivalency sorted by the UTF-8
+              bytes of the NOC and then the MOSID code, with the matching
+              equivalency and MOSID positions, for reverse NOC lookups
+    ranks     rank name and responsibility list string ids, sorted by the
+              UTF-8 bytes of the name
+    blob      deduplicated UTF-8 text
+
+A statement or responsibility list is stored as one string with ``\0``
+before each item, so a whole list is decoded with one slice and one split,
+and identical lists are stored once. Lookups are binary searches over the
+sorted code index that decode only the strings they return; a NOC group
+prefix selects one contiguous run of the NOC index.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from contextlib import closing
+from pathlib import Path
+
+from app.database import (
+    ALL_MOSID_PROFILES_SQL,
+    ALL_RANK_RESPONSIBILITIES_SQL,
+    connect_readonly,
+    group_mosid_rows,
+    read_build_info,
+)
+from app.noc_index import PREFIX_LENGTHS
+
+MAGIC = b"CAFIMG02"
+SEPARATOR = "\0"
+
+# Order of the sections after the header; every one is a uint32 array
+# except ``blob``.
+SECTIONS = (
+    "string_offsets",
+    "mosid_codes",
+    "mosid_titles",
+    "mosid_nocs",
+    "noc_codes",
+    "noc_titles",
+    "noc_tasks",
+    "noc_index_codes",
+    "noc_index_nocs",
+    "noc_index_mosids",
+    "rank_names",
+    "rank_duties",
+    "blob",
+)
+HEADER = struct.Struct(f"<8s64s{2 * len(SECTIONS)}I")
+ALIGNMENT = 8
+
+
+def _uint32(values) -> array:
+    data = array("I", values)
+    if data.itemsize != 4:
+        raise RuntimeError("array('I') is not 32-bit on this platform.")
+    if sys.byteorder == "big":
+        data.byteswap()
+    return data
+
+
+def join_items(items) -> str:
+    """Encode a list of strings as one, with ``SEPARATOR`` before each item."""
+
+    return "".join(SEPARATOR + item for item in items)
+
+
+def image_path_for(db_path: Path) -> Path:
+    """Default image location next to the SQLite artifact."""
+
+    return Path(db_path).with_suffix(".img")
+
+
+def build_image(db_path: Path, image_path: Path) -> str:
+    """Write the image for the artifact at ``db_path`` and return its version.
+
+    Like ``build_database`` the file is written beside the target and moved
+    into place atomically, so workers never map a partial image.
+    """
+
+    strings: dict[str, int] = {}
+
+    def intern(text: str) -> int:
+        index = strings.get(text)
+        if index is None:
+            index = strings[text] = len(strings)
+        return index
+
+    with closing(connect_readonly(db_path)) as conn:
+        version = dict(conn.execute("SELECT key, value FROM build_info")).get("source_hash", "")
+        profiles = sorted(
+            group_mosid_rows(conn.execute(ALL_MOSID_PROFILES_SQL)), key=lambda item: item[0].encode()
+        )
+        ranks: dict[str, list[str]] = {}
+        for rank_name, responsibility in conn.execute(ALL_RANK_RESPONSIBILITIES_SQL):
+            responsibilities = ranks.setdefault(rank_name, [])
+            if responsibility is not None:
+                responsibilities.append(responsibility)
+
+    columns: dict[str, list[int]] = {name: [] for name in SECTIONS[1:-1]}
+    columns["mosid_nocs"].append(0)
+    for code, profile in profiles:
+        columns["mosid_codes"].append(intern(code))
+        columns["mosid_titles"].append(intern(profile["title"]))
+        for equivalency in profile["equivalencies"]:
+            columns["noc_codes"].append(intern(equivalency["noc_code"]))
+            columns["noc_titles"].append(intern(equivalency["civilian_title"]))
+            columns["noc_tasks"].append(intern(join_items(equivalency["task_statements"])))
+        columns["mosid_nocs"].append(len(columns["noc_codes"]))
+    reverse = sorted(
+        (equivalency["noc_code"].encode(), code.encode(), noc, position)
+        for position, (code, profile) in enumerate(profiles)
+        for noc, equivalency in enumerate(profile["equivalencies"], start=columns["mosid_nocs"][position])
+    )
+    for _, _, noc, position in reverse:
+        columns["noc_index_codes"].append(columns["noc_codes"][noc])
+        columns["noc_index_nocs"].append(noc)
+        columns["noc_index_mosids"].append(position)
+    for rank_name in sorted(ranks, key=str.encode):
+        columns["rank_names"].append(intern(rank_name))
+        columns["rank_duties"].append(intern(join_items(ranks[rank_name])))
+
+    blob = bytearray()
+    string_offsets = [0]
+    for text in strings:
+        blob += text.encode()
+        string_offsets.append(len(blob))
+    sections = {"string_offsets": _uint32(string_offsets)}
+    sections.update((name, _uint32(values)) for name, values in columns.items())
+
+    payload = bytearray()
+    layout = []
+    for name in SECTIONS:
+        data = bytes(blob) if name == "blob" else sections[name].tobytes()
+        payload += b"\0" * (-(HEADER.size + len(payload)) % ALIGNMENT)
+        layout += [HEADER.size + len(payload), len(data) if name == "blob" else len(sections[name])]
+        payload += data
+
+    image_path = Path(image_path)
+    image_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{image_path.name}.", suffix=".tmp", dir=image_path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, version.encode().ljust(64, b"\0"), *layout))
+            f.write(payload)
+        os.replace(tmp_name, image_path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return version
+
+
+def read_image_version(image_path: Path) -> str:
+    """Return the source hash stored in an image, or ``""`` if it is unusable."""
+
+    try:
+        with open(image_path, "rb") as f:
+            header = f.read(HEADER.size)
+    except OSError:
+        return ""
+    if len(header) < HEADER.size or header[:8] != MAGIC:
+        return ""
+    return HEADER.unpack(header)[1].rstrip(b"\0").decode()
+
+
+def ensure_image(db_path: Path, image_path: Path) -> str:
+    """Rebuild the image only if it was built from another artifact version."""
+
+    expected = read_build_info(db_path).get("source_hash", "")
+    if read_image_version(image_path) != expected:
+        build_image(db_path, image_path)
+    return expected
+
+
+class DataImage:
+    """Read-only view over a mapped image; same lookups as ``Snapshot``."""
+
+    def __init__(self, image_path: Path):
+        with open(image_path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        magic, version, *layout = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError(f"{image_path} is not a CAF Resume Helper data image.")
+        self.version = version.rstrip(b"\0").decode()
+        for name, offset, length in zip(SECTIONS, layout[::2], layout[1::2]):
+            if name == "blob":
+                self._blob_offset = offset
+                section = view[offset:offset + length]
+            elif sys.byteorder == "little":
+                section = view[offset:offset + 4 * length].cast("I")
+            else:
+                # Big-endian hosts get a private, byte-swapped copy.
+                section = array("I")
+                section.frombytes(view[offset:offset + 4 * length])
+                section.byteswap()
+            setattr(self, f"_{name}", section)
+
+    def __len__(self) -> int:
+        return len(self._mosid_codes)
+
+    def _text(self, index: int) -> str:
+        # Slicing the mmap copies straight into ``bytes``; slicing the
+        # memoryview first would cost an extra object per string.
+        offsets, base = self._string_offsets, self._blob_offset
+        return self._mmap[base + offsets[index]:base + offsets[index + 1]].decode()
+
+    def _items(self, index: int) -> list[str]:
+        return self._text(index).split(SEPARATOR)[1:]
+
+    def _bytes(self, index: int) -> bytes:
+        offsets, base = self._string_offsets, self._blob_offset
+        return self._mmap[base + offsets[index]:base + offsets[index + 1]]
+
+    def _lower_bound(self, keys, target: bytes) -> int:
+        """Return the first position in ``keys`` (string ids sorted by bytes)
+        whose string is not less than ``target``."""
+
+        data, offsets, base = self._mmap, self._string_offsets, self._blob_offset
+        lo, hi = 0, len(keys)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            index = keys[mid]
+            if data[base + offsets[index]:base + offsets[index + 1]] < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _find(self, keys, key: str) -> int:
+        """Binary search ``keys`` (string ids sorted by bytes) for ``key``."""
+
+        target = key.encode()
+        position = self._lower_bound(keys, target)
+        if position < len(keys) and self._bytes(keys[position]) == target:
+            return position
+        return -1
+
+    def mosid(self, mosid_code: str) -> dict:
+        position = self._find(self._mosid_codes, mosid_code)
+        if position < 0:
+            return {}
+        text = self._text
+        nocs = self._mosid_nocs
+        return {
+            "mosid": mosid_code,
+            "title": text(self._mosid_titles[position]),
+            "equivalencies": [
+                {
+                    "noc_code": text(self._noc_codes[noc]),
+                    "civilian_title": text(self._noc_titles[noc]),
+                    "task_statements": self._items(self._noc_tasks[noc]),
+                }
+                for noc in range(nocs[position], nocs[position + 1])
+            ],
+        }
+
+    def rank(self, rank_name: str) -> dict:
+        position = self._find(self._rank_names, rank_name)
+        if position < 0:
+            return {}
+        return {"rank": rank_name, "responsibilities": self._items(self._rank_duties[position])}
+
+    def noc_mosids(self, noc_code: str) -> dict:
+        """Same result as ``NocIndex.lookup``: the MOSIDs mapped to a NOC code
+        or, for a 2-, 3- or 4-digit key, to any NOC in that group."""
+
+        noc_code = noc_code.strip()
+        target = noc_code.encode()
+        matches = bytes.startswith if len(noc_code) in PREFIX_LENGTHS else bytes.__eq__
+        codes, text = self._noc_index_codes, self._text
+        mappings = []
+        position = self._lower_bound(codes, target)
+        while position < len(codes) and matches(self._bytes(codes[position]), target):
+            noc, mosid = self._noc_index_nocs[position], self._noc_index_mosids[position]
+            mappings.append({
+                "mosid": text(self._mosid_codes[mosid]),
+                "title": text(self._mosid_titles[mosid]),
+                "noc_code": text(self._noc_codes[noc]),
+                "civilian_title": text(self._noc_titles[noc]),
+            })
+            position += 1
+        if not mappings:
+            return {}
+        return {"noc_code": noc_code, "mosids": mappings}
+
+
+class ImageStore:
+    """Hold the mapped image and remap it when the file is replaced.
+
+    Mirrors ``SnapshotStore``: the file metadata is checked at most once per
+    ``check_interval`` seconds and in-flight requests keep the mapping they
+    started with; an old mapping is released once nothing references it.
+    """
+
+    def __init__(self, image_path: Path, check_interval: float = 5.0):
+        self.image_path = Path(image_path)
+        self.check_interval = check_interval
+        self._check_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._signature = self._file_signature()
+        self._image = DataImage(self.image_path)
+        self._checked_at = time.monotonic()
+
+    def _file_signature(self) -> tuple[int, int, int]:
+        stat = os.stat(self.image_path)
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    @property
+    def latest(self) -> DataImage:
+        """The mapping being served, without checking for a newer file."""
+
+        return self._image
+
+    def claim_check(self) -> bool:
+        """Return ``True`` to at most one caller per ``check_interval``."""
+
+        with self._check_lock:
+            now = time.monotonic()
+            if now - self._checked_at < self.check_interval:
+                return False
+            self._checked_at = now
+            return True
+
+    def load_if_changed(self) -> DataImage | None:
+        """Map the file if it was replaced since the last check, else ``None``."""
+
+        if not self._reload_lock.acquire(blocking=False):
+            return None
+        try:
+            signature = self._file_signature()
+            if signature == self._signature:
+                return None
+            image = DataImage(self.image_path)
+            # Only recorded once the mapping succeeded, so a failure is
+            # retried at the next check.
+            self._signature = signature
+            return image
+        finally:
+            self._reload_lock.release()
+
+    def swap(self, image: DataImage) -> None:
+        """Serve ``image`` from now on; in-flight readers keep the old one."""
+
+        self._image = image
+
+    def current(self) -> DataImage:
+        """Return the newest mapping, remapping first if the file changed."""
+
+        if self.claim_check():
+            image = self.load_if_changed()
+            if image is not None:
+                self.swap(image)
+        return self._image
@@ -0,0 +1,144 @@
+"""Single-pass indicator matcher compiled from ``indicator_catalog.yaml``.
+
+Every keyword in the catalog is folded into one regex shaped as a character
+trie, so shared prefixes are tested once per position instead of once per
+keyword, and greedy optional branches make the longest (most specific)
+phrase win where keywords overlap.
+Matching is case-insensitive and tolerant of any run of whitespace between
+words (line breaks in MPRR extracts included), and offsets refer to the
+original text.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Any, Mapping, NamedTuple
+
+import yaml
+
+INDICATOR_CATALOG_PATH = Path(__file__).resolve().parent / "data" / "indicator_catalog.yaml"
+
+
+class IndicatorSource(NamedTuple):
+    mosid_family: str
+    indicator: str
+    keyword: str
+
+
+class IndicatorHit(NamedTuple):
+    mosid_family: str
+    indicator: str
+    keyword: str
+    start: int
+    end: int
+    text: str
+
+    def as_dict(self) -> dict:
+        return self._asdict()
+
+
+def normalize_phrase(text: str) -> str:
+    """Lower-case ``text`` and collapse runs of whitespace to one space."""
+
+    return " ".join(text.casefold().split())
+
+
+def trie_pattern(phrases: list[str]) -> str:
+    """Return a regex body matching any of ``phrases`` via a prefix trie.
+
+    Spaces in a phrase match any run of whitespace.
+    """
+
+    root: dict = {}
+    for phrase in phrases:
+        node = root
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node: dict) -> str:
+        branches = [
+            (r"\s+" if char == " " else re.escape(char)) + emit(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if "" in node else body
+
+    return emit(root)
+
+
+class IndicatorMatcher:
+    """Compiled matcher for one version of the indicator catalog."""
+
+    def __init__(self, catalog: Mapping[str, Any]):
+        self.version = str(catalog.get("version", ""))
+        self._sources: dict[str, list[IndicatorSource]] = {}
+        for family in catalog.get("families", []):
+            for indicator in family.get("indicators", []):
+                for keyword in indicator.get("keywords", []):
+                    source = IndicatorSource(family["mosid_family"], indicator["name"], keyword)
+                    sources = self._sources.setdefault(normalize_phrase(keyword), [])
+                    if source not in sources:
+                        sources.append(source)
+        # Normalized keywords, and every (family, indicator, keyword) source.
+        self.keywords = tuple(self._sources)
+        self.sources = tuple(source for sources in self._sources.values() for source in sources)
+        self.families = tuple(dict.fromkeys(source.mosid_family for source in self.sources))
+        body = trie_pattern(list(self._sources))
+        self._pattern = re.compile(rf"(?<!\w)(?:{body})(?!\w)", re.IGNORECASE) if body else None
+        self._phrase_patterns: list[tuple[re.Pattern, list[IndicatorSource]]] | None = None
+
+    @classmethod
+    def from_path(cls, path: Path = INDICATOR_CATALOG_PATH) -> "IndicatorMatcher":
+        with open(path, "r") as f:
+            return cls(yaml.safe_load(f) or {})
+
+    def scan(self, text: str, mosid_family: str | None = None) -> list[IndicatorHit]:
+        """Return every indicator hit in ``text`` in document order."""
+
+        if self._pattern is None:
+            return []
+        hits = []
+        for match in self._pattern.finditer(text):
+            for source in self._sources_for(match.group()):
+                if mosid_family is None or source.mosid_family == mosid_family:
+                    hits.append(IndicatorHit(*source, match.start(), match.end(), match.group()))
+        return hits
+
+    def _sources_for(self, matched: str) -> list[IndicatorSource]:
+        """Return the sources of the keyword the pattern matched as ``matched``.
+
+        ``re.IGNORECASE`` folds a few characters differently from
+        ``str.casefold`` (``"İ"`` matches ``"i"`` but folds to ``"i"`` plus a
+        combining dot), so a miss on the normalized text falls back to matching
+        each keyword on its own.
+        """
+
+        sources = self._sources.get(normalize_phrase(matched))
+        if sources is not None:
+            return sources
+        if self._phrase_patterns is None:
+            self._phrase_patterns = [
+                (re.compile(r"\s+".join(map(re.escape, phrase.split(" "))), re.IGNORECASE), sources)
+                for phrase, sources in self._sources.items()
+            ]
+        return next((sources for pattern, sources in self._phrase_patterns if pattern.fullmatch(matched)), [])
+
+    def match(self, text: str, mosid_family: str | None = None) -> dict:
+        """Return hits plus per-indicator counts in the API response shape."""
+
+        hits = self.scan(text, mosid_family)
+        counts = Counter((hit.mosid_family, hit.indicator) for hit in hits)
+        return {
+            "catalog_version": self.version,
+            "hits": [hit.as_dict() for hit in hits],
+            "indicators": [
+                {"mosid_family": family, "indicator": indicator, "count": count}
+                for (family, indicator), count in counts.items()
+            ],
+        }
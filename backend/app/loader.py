@@ -0,0 +1,177 @@
+"""Bulk loader shared by the database build step and the population script.
+
+Rows follow the normalized model in ``db/schema.sql``: each MOSID and NOC
+is stored once, a NOC's task statements hang off the NOC rather than off
+every MOSID that maps to it, and mappings only carry a civilian title of
+their own when it differs from the NOC's. Row IDs are assigned in Python so
+that parent/child relationships can be resolved without a ``SELECT`` round
+trip per row. Each table is then written with a single ``executemany``
+inside one transaction, and indexes are created only once all rows are in
+place. The full-text ``search_index`` is filled from the same pass so it
+always matches the relational tables.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+# Insertion order respects foreign key dependencies (parents first).
+TABLE_COLUMNS: dict[str, tuple[str, ...]] = {
+    "mosids": ("mosid", "title"),
+    "nocs": ("noc", "title"),
+    "noc_task_statements": ("noc", "position", "statement"),
+    "mosid_noc_mappings": ("id", "mosid", "noc"),
+    "mosid_noc_titles": ("id", "mapping_id", "title"),
+    "ranks": ("id", "rank_name"),
+    "rank_responsibilities": ("id", "responsibility", "rank_id"),
+    "search_index": ("kind", "mosid_code", "noc_code", "rank_name", "title", "body"),
+}
+
+
+@dataclass
+class LoadStats:
+    """Row counts and wall-clock time for one bulk load."""
+
+    rows_by_table: dict[str, int] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    @property
+    def rows(self) -> int:
+        return sum(self.rows_by_table.values())
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else float("inf")
+
+    def summary(self) -> str:
+        return f"Loaded {self.rows:,} rows in {self.seconds:.3f}s ({self.rows_per_second:,.0f} rows/s)"
+
+
+def load_sources(mnet_path: Path, ranks_path: Path) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Read the MNET crosswalk and the rank responsibilities YAML.
+
+    ``mnet_path`` is either the crosswalk JSON or a directory of columnar
+    tables written by ``app.columnar``. PyYAML is imported here rather than
+    at module level because servers only need it when the artifact is rebuilt.
+    """
+
+    import yaml
+
+    if Path(mnet_path).is_dir():
+        from app.columnar import read_mnet_data
+
+        mnet_data = read_mnet_data(mnet_path)
+    else:
+        with open(mnet_path, "r") as f:
+            mnet_data = json.load(f)
+    with open(ranks_path, "r") as f:
+        rank_data = yaml.safe_load(f) or []
+    return mnet_data, rank_data
+
+
+def build_rows(
+    mnet_data: Mapping[str, Iterable[Mapping[str, Any]]],
+    rank_data: Iterable[Mapping[str, Any]],
+) -> dict[str, list[tuple]]:
+    """Flatten the sources into per-table row tuples with assigned IDs."""
+
+    rows: dict[str, list[tuple]] = {table: [] for table in TABLE_COLUMNS}
+    documents = rows["search_index"]
+
+    # A code listed under several titles keeps the alphabetically first one,
+    # which is the title profile lookups have always returned.
+    labels: dict[str, str] = {}
+    for mosid_string in mnet_data:
+        mosid_code, mosid_title = mosid_string.split(": ", 1)
+        if mosid_code not in labels or mosid_title < labels[mosid_code]:
+            labels[mosid_code] = mosid_title
+
+    noc_titles: dict[str, str] = {}
+    noc_statements: dict[str, list[str]] = {}
+    mapped: set[tuple[str, str]] = set()
+    for mosid_string, noc_data in mnet_data.items():
+        mosid_code, mosid_title = mosid_string.split(": ", 1)
+        if labels[mosid_code] != mosid_title:
+            continue
+        rows["mosids"].append((mosid_code, mosid_title))
+        documents.append(("mosid", mosid_code, None, None, mosid_title, ""))
+        for item in noc_data:
+            noc_code, civilian_title = item["noc_code"], item["civilian_title"]
+            if (mosid_code, noc_code) in mapped:
+                continue
+            mapped.add((mosid_code, noc_code))
+            if noc_code not in noc_titles:
+                noc_titles[noc_code] = civilian_title
+                noc_statements[noc_code] = []
+            # The NOC keeps the first list seen for it, plus any statement a
+            # later mapping lists more often than that list does.
+            statements = noc_statements[noc_code]
+            extra = Counter(item["task_statements"]) - Counter(statements)
+            for statement in item["task_statements"]:
+                if extra[statement] > 0:
+                    extra[statement] -= 1
+                    statements.append(statement)
+            mapping_id = len(rows["mosid_noc_mappings"]) + 1
+            rows["mosid_noc_mappings"].append((mapping_id, mosid_code, noc_code))
+            if civilian_title != noc_titles[noc_code]:
+                rows["mosid_noc_titles"].append((len(rows["mosid_noc_titles"]) + 1, mapping_id, civilian_title))
+            documents.append(("noc", mosid_code, noc_code, None, civilian_title, ""))
+            documents.extend(
+                ("task", mosid_code, noc_code, None, civilian_title, statement)
+                for statement in item["task_statements"]
+            )
+    rows["nocs"] = list(noc_titles.items())
+    rows["noc_task_statements"] = [
+        (noc_code, position, statement)
+        for noc_code, statements in noc_statements.items()
+        for position, statement in enumerate(statements, start=1)
+    ]
+
+    rank_ids: dict[str, int] = {}
+    for item in rank_data:
+        rank_name = item["rank"]
+        rank_id = rank_ids.get(rank_name)
+        if rank_id is None:
+            rank_id = rank_ids[rank_name] = len(rank_ids) + 1
+            rows["ranks"].append((rank_id, rank_name))
+        responsibilities = rows["rank_responsibilities"]
+        responsibilities.extend(
+            (responsibility_id, responsibility, rank_id)
+            for responsibility_id, responsibility in enumerate(item["responsibilities"], start=len(responsibilities) + 1)
+        )
+        documents.extend(
+            ("rank", None, None, rank_name, rank_name, responsibility) for responsibility in item["responsibilities"]
+        )
+
+    return rows
+
+
+def bulk_load(
+    conn: sqlite3.Connection,
+    mnet_data: Mapping[str, Iterable[Mapping[str, Any]]],
+    rank_data: Iterable[Mapping[str, Any]],
+    indexes: Iterable[str] = (),
+) -> LoadStats:
+    """Insert every row in one transaction, then create ``indexes``."""
+
+    started = time.perf_counter()
+    rows = build_rows(mnet_data, rank_data)
+    with conn:
+        for table, columns in TABLE_COLUMNS.items():
+            placeholders = ", ".join("?" for _ in columns)
+            conn.executemany(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})",
+                rows[table],
+            )
+        for statement in indexes:
+            conn.execute(statement)
+    return LoadStats(
+        rows_by_table={table: len(table_rows) for table, table_rows in rows.items()},
+        seconds=time.perf_counter() - started,
+    )
@@ -0,0 +1,61 @@
+"""MCP server exposing the ``app.service`` tools.
+
+Run ``python -m app.mcp_app`` for the stdio transport that MCP clients spawn
+per session; it imports the MCP SDK but not FastAPI. The streamable HTTP app
+is only built when the server is first mounted or called over ASGI.
+"""
+
+from mcp.server.fastmcp import FastMCP
+
+from app.service import (
+    METRICS,
+    get_mosid_data_async,
+    get_mosid_data_batch_async,
+    get_noc_mosids,
+    get_rank_data_async,
+    match_indicators,
+    recommend_nocs,
+    search,
+    similar_mosids,
+    translate,
+)
+
+
+class ASGIEnabledFastMCP(FastMCP):
+    """FastMCP variant that can act directly as an ASGI callable."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._asgi_app = None
+
+    async def __call__(self, scope, receive, send):
+        """Let the FastMCP instance behave like an ASGI app."""
+        await self.streamable_http_app()(scope, receive, send)
+
+    def streamable_http_app(self):
+        """Return the ASGI app, creating it on first use and caching it after."""
+        if self._asgi_app is None:
+            self._asgi_app = super().streamable_http_app()
+        return self._asgi_app
+
+
+mcp = ASGIEnabledFastMCP("CAF Resume Helper")
+
+# The MCP tools keep their public names but run on the async pool. Every
+# call is timed under the tool name.
+for _name, _fn in (
+    ("get_rank_data", get_rank_data_async),
+    ("get_mosid_data", get_mosid_data_async),
+    ("get_mosid_data_batch", get_mosid_data_batch_async),
+    ("get_noc_mosids", get_noc_mosids),
+    ("search", search),
+    ("match_indicators", match_indicators),
+    ("translate", translate),
+    ("similar_mosids", similar_mosids),
+    ("recommend_nocs", recommend_nocs),
+):
+    mcp.tool(name=_name)(METRICS.tool(_name)(_fn))
+
+
+if __name__ == "__main__":
+    mcp.run()
@@ -0,0 +1,427 @@
+"""In-process metrics and optional trace spans for the API and MCP tools.
+
+A small Prometheus-style registry (counters, gauges, fixed-bucket
+histograms) rendered in the text exposition format on ``/metrics``, plus:
+
+* an ASGI middleware that times every HTTP request, including the mounted
+  ``/mcp`` app, labelled by route template rather than raw path;
+* a decorator that times MCP tool calls;
+* connection and query wrappers that split time spent in ``sqlite3.connect``
+  from time spent running queries, and count statements per request.
+
+Per-request figures live in a ``ContextVar`` that the connection pool
+carries into its worker threads. When a trace file is configured, each
+sampled request is appended to it as one JSON line with its spans.
+
+Recording costs a few ``perf_counter`` calls, a bisect and a lock per
+observation, so the layer is meant to stay on in production.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Sequence, TypeVar
+
+T = TypeVar("T")
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, labels: tuple[str, ...] = ()) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, labels: tuple[str, ...] = ()) -> float:
+        return self._values.get(labels, 0.0)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}" for labels, value in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, labels: tuple[str, ...] = ()) -> None:
+        self.inc(-amount, labels)
+
+    def set(self, value: float, labels: tuple[str, ...] = ()) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(buckets)
+        # Per label set: [count per bucket (non-cumulative) + overflow, sum].
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, labels: tuple[str, ...] = ()) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, labels: tuple[str, ...] = ()) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._series.items())
+        lines = []
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class _Callback(_Metric):
+    """Gauge or counter whose value is read from ``fn`` at scrape time."""
+
+    def __init__(self, name: str, help_text: str, kind: str, fn: Callable[[], float]):
+        super().__init__(name, help_text)
+        self.kind = kind
+        self.fn = fn
+
+    def samples(self) -> list[str]:
+        return [f"{self.name} {_format_value(self.fn())}"]
+
+
+class Registry:
+    """Named metrics rendered together in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def _add(self, metric: _Metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered.")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._add(Gauge(name, help_text, labelnames))
+
+    def histogram(
+        self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._add(Histogram(name, help_text, labelnames, buckets))
+
+    def callback(self, name: str, help_text: str, fn: Callable[[], float], kind: str = "gauge") -> None:
+        self._add(_Callback(name, help_text, kind, fn))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+@dataclass(slots=True)
+class RequestStats:
+    """What one request spent; shared with pool threads through the context."""
+
+    started: float
+    queries: int = 0
+    db_seconds: float = 0.0
+    spans: list[dict] | None = None
+
+    def span(self, name: str, started: float, seconds: float, **attributes: Any) -> None:
+        if self.spans is not None:
+            self.spans.append(
+                {
+                    "name": name,
+                    "start_ms": round((started - self.started) * 1000, 3),
+                    "duration_ms": round(seconds * 1000, 3),
+                    **attributes,
+                }
+            )
+
+
+_CURRENT: ContextVar[RequestStats | None] = ContextVar("caf_request_stats", default=None)
+
+
+def current_request() -> RequestStats | None:
+    return _CURRENT.get()
+
+
+class TraceWriter:
+    """Appends one JSON line per traced request; thread-safe."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Line buffered, so a crash loses at most the line being written.
+        self._file = open(self.path, "a", encoding="utf-8", buffering=1)
+        self._lock = threading.Lock()
+
+    def write(self, record: dict) -> None:
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._file.write(line)
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+def _route_label(scope: dict) -> str:
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    return path if path is not None else "<unmatched>"
+
+
+class Instrumentation:
+    """The metric set recorded by the server, plus optional request tracing.
+
+    ``trace_path`` enables the trace file; ``trace_sample`` is the fraction
+    of requests written to it.
+    """
+
+    def __init__(self, trace_path: Path | None = None, trace_sample: float = 1.0):
+        self.registry = registry = Registry()
+        self.http_duration = registry.histogram(
+            "caf_http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route", "status")
+        )
+        self.http_in_flight = registry.gauge(
+            "caf_http_requests_in_flight", "HTTP requests being served, split into the API and the /mcp app.", ("app",)
+        )
+        self.http_queries = registry.histogram(
+            "caf_http_request_queries", "SQLite statements executed per HTTP request.", ("route",), COUNT_BUCKETS
+        )
+        self.tool_duration = registry.histogram(
+            "caf_mcp_tool_duration_seconds", "MCP tool call latency.", ("tool", "outcome")
+        )
+        self.tool_in_flight = registry.gauge("caf_mcp_tool_calls_in_flight", "MCP tool calls running.", ("tool",))
+        self.db_duration = registry.histogram(
+            "caf_db_duration_seconds", "Time spent opening SQLite connections and running queries.", ("operation",)
+        )
+        self.db_statements = registry.counter("caf_db_statements_total", "SQLite statements executed.")
+        self.trace_sample = trace_sample
+        self.tracer = TraceWriter(trace_path) if trace_path else None
+
+    def render(self) -> str:
+        return self.registry.render()
+
+    def close(self) -> None:
+        if self.tracer is not None:
+            self.tracer.close()
+
+    # -- HTTP -----------------------------------------------------------------
+
+    def middleware(self, app):
+        """Wrap an ASGI app so every HTTP request is timed and counted."""
+
+        instrumentation = self
+
+        async def metrics_middleware(scope, receive, send):
+            if scope["type"] != "http":
+                await app(scope, receive, send)
+                return
+            await instrumentation._serve(app, scope, receive, send)
+
+        return metrics_middleware
+
+    async def _serve(self, app, scope, receive, send) -> None:
+        started = time.perf_counter()
+        traced = self.tracer is not None and (self.trace_sample >= 1.0 or random.random() < self.trace_sample)
+        stats = RequestStats(started, spans=[] if traced else None)
+        token = _CURRENT.set(stats)
+        status = 500
+        surface = ("mcp",) if scope.get("path", "").startswith("/mcp") else ("api",)
+        self.http_in_flight.inc(labels=surface)
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await app(scope, receive, send_with_status)
+        finally:
+            seconds = time.perf_counter() - started
+            _CURRENT.reset(token)
+            self.http_in_flight.dec(labels=surface)
+            route = _route_label(scope)
+            self.http_duration.observe(seconds, (scope["method"], route, str(status)))
+            self.http_queries.observe(stats.queries, (route,))
+            if traced:
+                self.tracer.write(
+                    {
+                        "trace_id": uuid.uuid4().hex,
+                        "name": f"{scope['method']} {route}",
+                        "path": scope.get("path", ""),
+                        "status": status,
+                        "start": time.time() - seconds,
+                        "duration_ms": round(seconds * 1000, 3),
+                        "queries": stats.queries,
+                        "db_ms": round(stats.db_seconds * 1000, 3),
+                        "spans": stats.spans,
+                    }
+                )
+
+    # -- MCP tools ------------------------------------------------------------
+
+    def tool(self, name: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
+        """Decorator timing calls to the MCP tool ``name`` (sync or async)."""
+
+        def decorate(fn):
+            if inspect.iscoroutinefunction(fn):
+
+                @functools.wraps(fn)
+                async def timed_async(*args, **kwargs):
+                    started = self._tool_started(name)
+                    outcome = "error"
+                    try:
+                        result = await fn(*args, **kwargs)
+                        outcome = "ok"
+                        return result
+                    finally:
+                        self._tool_finished(name, started, outcome)
+
+                return timed_async
+
+            @functools.wraps(fn)
+            def timed(*args, **kwargs):
+                started = self._tool_started(name)
+                outcome = "error"
+                try:
+                    result = fn(*args, **kwargs)
+                    outcome = "ok"
+                    return result
+                finally:
+                    self._tool_finished(name, started, outcome)
+
+            return timed
+
+        return decorate
+
+    def _tool_started(self, name: str) -> float:
+        self.tool_in_flight.inc(labels=(name,))
+        return time.perf_counter()
+
+    def _tool_finished(self, name: str, started: float, outcome: str) -> None:
+        seconds = time.perf_counter() - started
+        self.tool_in_flight.dec(labels=(name,))
+        self.tool_duration.observe(seconds, (name, outcome))
+        stats = _CURRENT.get()
+        if stats is not None:
+            stats.span(f"tool {name}", started, seconds, outcome=outcome)
+
+    # -- SQLite ---------------------------------------------------------------
+
+    def _db(self, operation: str, started: float) -> None:
+        seconds = time.perf_counter() - started
+        self.db_duration.observe(seconds, (operation,))
+        stats = _CURRENT.get()
+        if stats is not None:
+            stats.db_seconds += seconds
+            stats.span(f"db.{operation}", started, seconds)
+
+    def _on_statement(self, _statement: str) -> None:
+        self.db_statements.inc()
+        stats = _CURRENT.get()
+        if stats is not None:
+            stats.queries += 1
+
+    def connect(self, connect: Callable[..., T]) -> Callable[..., T]:
+        """Wrap a connection factory: time it and count the statements each
+        connection executes."""
+
+        @functools.wraps(connect)
+        def instrumented_connect(*args, **kwargs):
+            started = time.perf_counter()
+            conn = connect(*args, **kwargs)
+            conn.set_trace_callback(self._on_statement)
+            self._db("connect", started)
+            return conn
+
+        return instrumented_connect
+
+    def timed_query(self, conn, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(conn, *args)`` and record it as one query."""
+
+        started = time.perf_counter()
+        try:
+            return fn(conn, *args)
+        finally:
+            self._db("query", started)
+
@@ -0,0 +1,78 @@
+"""Precomputed reverse index from NOC codes to the MOSIDs that map to them.
+
+Every mapping is filed under its full NOC code and under the code's 2-, 3-
+and 4-digit prefixes (NOC major, sub-major and minor groups), so a counsellor
+can start from a specific occupation or a whole occupational group. Lookups
+are a single dict read against the precomputed index.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import sys
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Iterable, Mapping, NamedTuple
+
+from app.database import NOC_MAPPINGS_SQL
+
+PREFIX_LENGTHS = (2, 3, 4)
+
+
+class NocMapping(NamedTuple):
+    mosid: str
+    title: str
+    noc_code: str
+    civilian_title: str
+
+    def as_dict(self) -> dict:
+        return self._asdict()
+
+
+def index_keys(noc_code: str) -> list[str]:
+    """Return the full code plus each shorter group prefix it belongs to."""
+
+    keys = [noc_code]
+    keys.extend(noc_code[:length] for length in PREFIX_LENGTHS if length < len(noc_code))
+    return keys
+
+
+@dataclass(frozen=True, slots=True)
+class NocIndex:
+    """Immutable mapping of NOC codes and prefixes to MOSID mappings."""
+
+    version: str
+    entries: Mapping[str, tuple[NocMapping, ...]]
+
+    def lookup(self, noc_code: str) -> dict:
+        """Return the MOSIDs mapped to ``noc_code`` (or prefix), or ``{}``."""
+
+        mappings = self.entries.get(noc_code.strip())
+        if not mappings:
+            return {}
+        return {"noc_code": noc_code.strip(), "mosids": [mapping.as_dict() for mapping in mappings]}
+
+
+def build_noc_index(rows: Iterable[tuple[str, str, str, str]], version: str = "") -> NocIndex:
+    """Build the index from ``(noc_code, civilian_title, mosid, title)`` rows.
+
+    Mappings under each key keep the row order, which ``NOC_MAPPINGS_SQL``
+    sorts by NOC code and then MOSID code.
+    """
+
+    intern = sys.intern
+    entries: dict[str, list[NocMapping]] = {}
+    for noc_code, civilian_title, mosid, title in rows:
+        mapping = NocMapping(intern(mosid), intern(title), intern(noc_code), intern(civilian_title))
+        for key in index_keys(noc_code):
+            entries.setdefault(intern(key), []).append(mapping)
+    return NocIndex(
+        version=version,
+        entries=MappingProxyType({key: tuple(dict.fromkeys(mappings)) for key, mappings in entries.items()}),
+    )
+
+
+def load_noc_index(conn: sqlite3.Connection, version: str = "") -> NocIndex:
+    """Read every MOSID↔NOC mapping from ``conn`` into a ``NocIndex``."""
+
+    return build_noc_index(conn.execute(NOC_MAPPINGS_SQL), version)
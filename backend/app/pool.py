@@ -0,0 +1,175 @@
+"""Fixed-size pool of reusable read-only SQLite connections for async callers.
+
+Queries run on the default executor so the event loop never blocks on SQLite
+I/O, while the pool caps how many run at once. Waiters are plain futures
+resolved thread-safely, so one pool can serve callers on any event loop
+(uvicorn's loop, the MCP session loop, or a fresh loop per test client).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import sqlite3
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+def connect_pooled(db_path: Path) -> sqlite3.Connection:
+    """Open a connection suited to sharing across executor threads.
+
+    The artifact is never written in place (rebuilds are atomic renames to a
+    new file), so it is opened with ``immutable=1``: SQLite then skips file
+    locking and change detection entirely, which serves the same purpose WAL
+    would for concurrent readers without leaving ``-wal``/``-shm`` files next
+    to a read-only artifact. Open connections keep reading the file they
+    opened until the pool is recycled.
+    """
+
+    uri = f"{Path(db_path).resolve().as_uri()}?mode=ro&immutable=1"
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False, cached_statements=256)
+    conn.execute("PRAGMA query_only = ON")
+    return conn
+
+
+class AsyncConnectionPool:
+    """Bounded pool that runs ``fn(conn, *args)`` calls off the event loop.
+
+    ``connect`` opens each pooled connection; it defaults to
+    ``connect_pooled`` and may be wrapped, for example to instrument it.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        size: int = 4,
+        connect: Callable[[Path], sqlite3.Connection] = connect_pooled,
+    ):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1.")
+        self.db_path = Path(db_path)
+        self.size = size
+        self._connect = connect
+        self._lock = threading.Lock()
+        self._idle: deque[sqlite3.Connection] = deque()
+        self._waiters: deque[asyncio.Future] = deque()
+        self._created = 0
+        self._in_use = 0
+        self.acquisitions = 0
+        self.waits = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    async def acquire(self) -> sqlite3.Connection:
+        started = time.perf_counter()
+        conn = waiter = None
+        with self._lock:
+            if self._idle:
+                conn = self._idle.pop()
+                self._in_use += 1
+            elif self._created < self.size:
+                self._created += 1
+                self._in_use += 1
+            else:
+                waiter = asyncio.get_running_loop().create_future()
+                self._waiters.append(waiter)
+        if waiter is not None:
+            # ``release`` hands its connection (and in-use slot) straight over.
+            try:
+                conn = await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self.release(waiter.result())
+                raise
+        elif conn is None:
+            try:
+                conn = self._connect(self.db_path)
+            except BaseException:
+                with self._lock:
+                    self._created -= 1
+                    self._in_use -= 1
+                raise
+        waited = time.perf_counter() - started
+        with self._lock:
+            self.acquisitions += 1
+            if waiter is not None:
+                self.waits += 1
+            self.total_wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                if waiter.done():
+                    continue
+                try:
+                    waiter.get_loop().call_soon_threadsafe(self._hand_off, waiter, conn)
+                except RuntimeError:
+                    # The waiter's event loop has already been closed.
+                    continue
+                return
+            self._in_use -= 1
+            self._idle.append(conn)
+
+    def _hand_off(self, waiter: asyncio.Future, conn: sqlite3.Connection) -> None:
+        if waiter.cancelled():
+            self.release(conn)
+        else:
+            waiter.set_result(conn)
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(conn, *args)`` on a pooled connection in a worker thread.
+
+        The caller's context variables are visible to ``fn``, as with
+        ``asyncio.to_thread``.
+        """
+
+        conn = await self.acquire()
+        context = contextvars.copy_context()
+        future = asyncio.get_running_loop().run_in_executor(None, functools.partial(context.run, fn, conn, *args))
+        try:
+            result = await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # The worker thread may still be using the connection.
+            if future.done():
+                self.release(conn)
+            else:
+                future.add_done_callback(lambda _: self.release(conn))
+            raise
+        except BaseException:
+            self.release(conn)
+            raise
+        self.release(conn)
+        return result
+
+    def stats(self) -> dict[str, float]:
+        """Return queue-wait and occupancy figures for sizing the pool."""
+
+        with self._lock:
+            return {
+                "size": self.size,
+                "open": self._created,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "waiting": sum(not waiter.done() for waiter in self._waiters),
+                "acquisitions": self.acquisitions,
+                "waits": self.waits,
+                "total_wait_seconds": self.total_wait_seconds,
+                "max_wait_seconds": self.max_wait_seconds,
+            }
+
+    def close(self) -> None:
+        """Close idle connections so the next acquisition reopens the artifact."""
+
+        with self._lock:
+            while self._idle:
+                self._idle.pop().close()
+                self._created -= 1
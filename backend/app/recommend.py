@@ -0,0 +1,364 @@
+"""Similar-trade and NOC recommendations from TF-IDF vectors over the crosswalk.
+
+Every MOSID is described by its title, the civilian titles it maps to and
+their task statements; every NOC by its title and task statements. Both are
+weighted over one vocabulary (sublinear term counts, smoothed IDF, rows
+scaled to unit length), so the dot product of two rows is their cosine
+similarity.
+
+``build_recommender`` scores every MOSID against every MOSID and every NOC
+once, in blocked matrix products, and keeps only the top ``k`` of each row.
+Lookups for a MOSID are then a dict read. Free text is vectorized and scored
+against the NOC rows in a single product.
+
+SciPy is optional (``poetry install -E recommend``) and only imported when an
+index is built; rows are then held as a sparse CSR matrix, so memory grows
+with the number of weighted terms rather than vocabulary × rows. Without it
+the same scores come from a sparse inverted index in pure Python, which is
+fast enough for the crosswalk's few hundred rows.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import sqlite3
+import sys
+from collections import Counter
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Iterable, Mapping, Sequence
+
+from app.database import ALL_MOSID_PROFILES_SQL, NOC_STATEMENTS_SQL, group_mosid_rows
+
+# Neighbours kept per MOSID; requests may ask for at most this many.
+TOP_K = 25
+
+# Rows scored per matrix product, which bounds the size of the score block.
+BLOCK_ROWS = 512
+
+# Scores are rounded before ranking so both backends order ties by code.
+SCORE_DIGITS = 6
+
+TOKEN = re.compile(r"[a-z0-9]+")
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has in into is it its of on or other "
+    "such than that the their them these this to was were which while with".split()
+)
+
+SparseRow = dict[int, float]
+Picks = tuple[tuple[int, float], ...]
+
+
+def stem(token: str) -> str:
+    """Fold plural forms onto the singular ("duties" → "duty", "fires" → "fire")."""
+
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> list[str]:
+    """Lower-cased, singular words of ``text`` without stop words or single
+    characters."""
+
+    return [stem(token) for token in TOKEN.findall(text.lower()) if len(token) > 1 and token not in STOP_WORDS]
+
+
+def scipy_available() -> bool:
+    try:
+        import scipy.sparse  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+@dataclass(frozen=True, slots=True)
+class Vectorizer:
+    """Maps token lists to unit-length TF-IDF rows over a fixed vocabulary."""
+
+    vocabulary: Mapping[str, int]
+    idf: tuple[float, ...]
+
+    @classmethod
+    def fit(cls, documents: Sequence[Sequence[str]]) -> "Vectorizer":
+        df: Counter[str] = Counter()
+        for tokens in documents:
+            df.update(set(tokens))
+        terms = sorted(df)
+        n = len(documents)
+        return cls(
+            vocabulary=MappingProxyType({term: column for column, term in enumerate(terms)}),
+            idf=tuple(math.log((1 + n) / (1 + df[term])) + 1 for term in terms),
+        )
+
+    def transform(self, tokens: Iterable[str]) -> SparseRow:
+        """Weight ``tokens`` as one row; terms outside the vocabulary are dropped."""
+
+        row: SparseRow = {}
+        for term, count in Counter(tokens).items():
+            column = self.vocabulary.get(term)
+            if column is not None:
+                row[column] = (1 + math.log(count)) * self.idf[column]
+        norm = math.sqrt(sum(weight * weight for weight in row.values()))
+        return {column: weight / norm for column, weight in row.items()} if norm else {}
+
+
+def _select(pairs: Iterable[tuple[int, float]], k: int) -> Picks:
+    """Top ``k`` positive ``(row, score)`` pairs, best first, ties by row."""
+
+    ranked = sorted(
+        ((row, round(score, SCORE_DIGITS)) for row, score in pairs if score > 0),
+        key=lambda pair: (-pair[1], pair[0]),
+    )
+    return tuple(ranked[:k])
+
+
+class SparseRows:
+    """Rows held as an inverted index; a query only visits the rows that
+    share a term with it."""
+
+    def __init__(self, rows: Sequence[SparseRow]):
+        self.size = len(rows)
+        postings: dict[int, list[tuple[int, float]]] = {}
+        for index, row in enumerate(rows):
+            for column, weight in row.items():
+                postings.setdefault(column, []).append((index, weight))
+        self._postings = postings
+
+    def top_k(self, queries: Sequence[SparseRow], k: int, exclude: Sequence[Iterable[int]] = ()) -> list[Picks]:
+        results = []
+        for position, query in enumerate(queries):
+            scores: dict[int, float] = {}
+            for column, weight in query.items():
+                for index, row_weight in self._postings.get(column, ()):
+                    scores[index] = scores.get(index, 0.0) + weight * row_weight
+            for index in exclude[position] if exclude else ():
+                scores.pop(index, None)
+            results.append(_select(scores.items(), k))
+        return results
+
+
+class CsrRows:
+    """Rows held as one SciPy CSR matrix; queries are scored ``BLOCK_ROWS`` at
+    a time with a single sparse product per block.
+
+    The matrix is stored term-major, so a block only multiplies the terms its
+    queries use: a short free-text query touches a few rows of it rather
+    than the whole vocabulary. Scores stay sparse too, so a block only holds
+    the rows that share a term with its queries.
+    """
+
+    def __init__(self, rows: Sequence[SparseRow], columns: int):
+        import numpy as np
+        from scipy import sparse
+
+        self._np = np
+        self._sparse = sparse
+        self.size = len(rows)
+        entries = [(column, index, weight) for index, row in enumerate(rows) for column, weight in row.items()]
+        terms, indices, weights = zip(*entries) if entries else ((), (), ())
+        self._terms = sparse.csr_matrix(
+            (np.array(weights, dtype=np.float64), (np.array(terms, dtype=np.int64), np.array(indices, dtype=np.int64))),
+            shape=(columns, len(rows)),
+        )
+
+    def top_k(self, queries: Sequence[SparseRow], k: int, exclude: Sequence[Iterable[int]] = ()) -> list[Picks]:
+        if len(queries) == 1:
+            # A lone free-text query skips the sparse product's fixed setup
+            # cost and sums the postings of its terms straight off the matrix.
+            return [self._pick(*self._score_one(queries[0]), k, exclude[0] if exclude else ())]
+        np, sparse = self._np, self._sparse
+        results = []
+        for start in range(0, len(queries), BLOCK_ROWS):
+            block = queries[start:start + BLOCK_ROWS]
+            used = sorted(set().union(*block))
+            position = {column: offset for offset, column in enumerate(used)}
+            weights = sparse.csr_matrix(
+                (
+                    np.array([weight for query in block for weight in query.values()], dtype=np.float64),
+                    np.array([position[column] for query in block for column in query], dtype=np.int64),
+                    np.cumsum([0] + [len(query) for query in block]),
+                ),
+                shape=(len(block), len(used)),
+            )
+            scores = (weights @ self._terms[used]).tocsr()
+            for offset in range(len(block)):
+                lo, hi = scores.indptr[offset], scores.indptr[offset + 1]
+                results.append(
+                    self._pick(scores.indices[lo:hi], scores.data[lo:hi], k, exclude[start + offset] if exclude else ())
+                )
+        return results
+
+    def _score_one(self, query: SparseRow):
+        np, terms = self._np, self._terms
+        if not query:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        indptr, indices, data = terms.indptr, terms.indices, terms.data
+        spans = [(indptr[column], indptr[column + 1], weight) for column, weight in query.items()]
+        rows = np.concatenate([indices[lo:hi] for lo, hi, _ in spans])
+        weights = np.concatenate([data[lo:hi] * weight for lo, hi, weight in spans])
+        scores = np.bincount(rows, weights=weights, minlength=self.size)
+        candidates = np.flatnonzero(scores)
+        return candidates, scores[candidates]
+
+    def _pick(self, candidates, values, k: int, exclude: Iterable[int]) -> Picks:
+        np = self._np
+        keep = values > 0
+        exclude = list(exclude)
+        if exclude:
+            keep &= ~np.isin(candidates, exclude)
+        candidates, values = candidates[keep], values[keep]
+        if len(candidates) > k:
+            # Keep everything tied with the k-th score so the final order
+            # matches the pure-Python backend.
+            cutoff = np.partition(values, -k)[-k]
+            keep = values >= cutoff - 10 ** -SCORE_DIGITS
+            candidates, values = candidates[keep], values[keep]
+        return _select(zip(candidates.tolist(), values.tolist()), k)
+
+
+@dataclass(frozen=True, slots=True)
+class Recommender:
+    """Precomputed MOSID neighbours and NOC picks plus the NOC rows for
+    free-text queries."""
+
+    version: str
+    backend: str
+    vectorizer: Vectorizer
+    mosids: tuple[tuple[str, str], ...]
+    nocs: tuple[tuple[str, str], ...]
+    noc_rows: SparseRows | CsrRows
+    positions: Mapping[str, int]
+    similar: tuple[Picks, ...]
+    recommended: tuple[Picks, ...]
+
+    def similar_mosids(self, mosid_code: str, limit: int = 10) -> dict:
+        """MOSIDs whose duties are closest to ``mosid_code``, or ``{}``."""
+
+        position = self.positions.get(mosid_code.strip())
+        if position is None:
+            return {}
+        code, title = self.mosids[position]
+        return {
+            "mosid": code,
+            "title": title,
+            "similar": [
+                {"mosid": self.mosids[index][0], "title": self.mosids[index][1], "score": score}
+                for index, score in self.similar[position][:limit]
+            ],
+        }
+
+    def recommend_for_mosid(self, mosid_code: str, limit: int = 10) -> dict:
+        """NOCs a MOSID is not mapped to whose duties are closest to it, or ``{}``."""
+
+        position = self.positions.get(mosid_code.strip())
+        if position is None:
+            return {}
+        code, title = self.mosids[position]
+        return {"mosid": code, "title": title, "nocs": self._nocs(self.recommended[position][:limit])}
+
+    def recommend_for_text(self, text: str, limit: int = 10) -> dict:
+        """NOCs whose duties are closest to free ``text``."""
+
+        (picks,) = self.noc_rows.top_k([self.vectorizer.transform(tokenize(text))], min(limit, TOP_K))
+        return {"text": text, "nocs": self._nocs(picks)}
+
+    def _nocs(self, picks: Picks) -> list[dict]:
+        return [
+            {"noc_code": self.nocs[index][0], "civilian_title": self.nocs[index][1], "score": score}
+            for index, score in picks
+        ]
+
+
+def build_recommender(
+    profiles: Iterable[tuple[str, Mapping[str, Any]]],
+    nocs: Iterable[tuple[str, str, Sequence[str]]],
+    version: str = "",
+    top_k: int = TOP_K,
+    backend: str | None = None,
+) -> Recommender:
+    """Vectorize the crosswalk and precompute the top ``top_k`` lists.
+
+    ``profiles`` are ``(mosid, profile)`` pairs as returned by
+    ``group_mosid_rows`` and ``nocs`` are ``(noc, title, statements)``.
+    ``backend`` is ``"scipy"`` or ``"python"``; by default SciPy is used when
+    it is installed.
+    """
+
+    if backend is None:
+        backend = "scipy" if scipy_available() else "python"
+    if backend not in ("scipy", "python"):
+        raise ValueError("backend must be 'scipy' or 'python'.")
+
+    intern = sys.intern
+    profiles = sorted(profiles, key=lambda item: item[0])
+    nocs = sorted(nocs, key=lambda item: item[0])
+    # Shared NOCs repeat the same statements under many MOSIDs; each distinct
+    # string is tokenized once.
+    tokenized: dict[str, list[str]] = {}
+
+    def words(text: str | None) -> list[str]:
+        tokens = tokenized.get(text or "")
+        if tokens is None:
+            tokens = tokenized[text or ""] = tokenize(text or "")
+        return tokens
+
+    mosid_documents = []
+    for _, profile in profiles:
+        tokens = list(words(profile["title"]))
+        for equivalency in profile["equivalencies"]:
+            tokens += words(equivalency["civilian_title"])
+            for statement in equivalency["task_statements"]:
+                tokens += words(statement)
+        mosid_documents.append(tokens)
+    noc_documents = [
+        [token for text in (title, *statements) for token in words(text)] for _, title, statements in nocs
+    ]
+
+    vectorizer = Vectorizer.fit(mosid_documents + noc_documents)
+    mosid_vectors = [vectorizer.transform(tokens) for tokens in mosid_documents]
+    noc_vectors = [vectorizer.transform(tokens) for tokens in noc_documents]
+    if backend == "scipy":
+        columns = len(vectorizer.vocabulary)
+        mosid_rows, noc_rows = CsrRows(mosid_vectors, columns), CsrRows(noc_vectors, columns)
+    else:
+        mosid_rows, noc_rows = SparseRows(mosid_vectors), SparseRows(noc_vectors)
+
+    noc_positions = {noc: index for index, (noc, _, _) in enumerate(nocs)}
+    mapped = [
+        {noc_positions[item["noc_code"]] for item in profile["equivalencies"] if item["noc_code"] in noc_positions}
+        for _, profile in profiles
+    ]
+    return Recommender(
+        version=version,
+        backend=backend,
+        vectorizer=vectorizer,
+        mosids=tuple((intern(code), intern(profile["title"] or "")) for code, profile in profiles),
+        nocs=tuple((intern(noc), intern(title)) for noc, title, _ in nocs),
+        noc_rows=noc_rows,
+        positions=MappingProxyType({code: index for index, (code, _) in enumerate(profiles)}),
+        similar=tuple(mosid_rows.top_k(mosid_vectors, top_k, [{index} for index in range(len(profiles))])),
+        recommended=tuple(noc_rows.top_k(mosid_vectors, top_k, mapped)),
+    )
+
+
+def read_noc_statements(conn: sqlite3.Connection) -> list[tuple[str, str, list[str]]]:
+    """Every NOC as ``(noc, title, statements)`` in code order."""
+
+    nocs: list[tuple[str, str, list[str]]] = []
+    for noc, title, statement in conn.execute(NOC_STATEMENTS_SQL):
+        if not nocs or nocs[-1][0] != noc:
+            nocs.append((noc, title or "", []))
+        if statement is not None:
+            nocs[-1][2].append(statement)
+    return nocs
+
+
+def load_recommender(conn: sqlite3.Connection, version: str = "", backend: str | None = None) -> Recommender:
+    """Read the crosswalk from ``conn`` and build a ``Recommender``."""
+
+    profiles = list(group_mosid_rows(conn.execute(ALL_MOSID_PROFILES_SQL)))
+    return build_recommender(profiles, read_noc_statements(conn), version, backend=backend)
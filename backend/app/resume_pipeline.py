@@ -0,0 +1,514 @@
+"""Batch résumé generation for cohorts of anonymized MPRR extracts.
+
+Member records arrive as JSONL, one extract per line. Each record goes
+through the same stages: rank responsibilities, MOSID/NOC equivalencies,
+indicator matching and template bullets, then assembly into a résumé object
+shaped after ``docs/target_resume_schema.yaml``.
+
+Records are read lazily and handed to a process pool in small chunks, with
+at most ``max_in_flight`` chunks outstanding, so memory stays bounded by the
+chunk window rather than the cohort size. Results are written in input
+order. Each worker opens its own read-only connection to the artifact and
+compiles the indicator matcher and template engine once.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Mapping
+
+from app.database import connect_readonly, fetch_mosid_profile, fetch_rank
+from app.indicators import IndicatorMatcher
+from app.translation import TranslationEngine
+
+RESUME_SCHEMA_VERSION = "0.1.0"
+STAGES = ("parse", "rank", "mosid", "indicators", "translate", "assemble")
+
+SUMMARY_BULLETS_MIN = 3
+SUMMARY_BULLETS_MAX = 5
+TECHNICAL_SKILLS_MAX = 10
+
+
+@dataclass
+class JobProgress:
+    """Running totals for one batch job."""
+
+    records_read: int = 0
+    records_done: int = 0
+    records_failed: int = 0
+    seconds: float = 0.0
+    stage_seconds: dict[str, float] = field(default_factory=lambda: dict.fromkeys(STAGES, 0.0))
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records_done / self.seconds if self.seconds else 0.0
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "records_per_second": self.records_per_second}
+
+    def summary(self) -> str:
+        stages = ", ".join(f"{stage} {seconds:.3f}s" for stage, seconds in self.stage_seconds.items())
+        return (
+            f"Processed {self.records_done:,} records ({self.records_failed:,} failed) in "
+            f"{self.seconds:.3f}s ({self.records_per_second:,.0f} records/s); {stages}"
+        )
+
+
+class PipelineContext:
+    """Per-process resources shared by every record a worker handles."""
+
+    def __init__(self, db_path: Path, as_of: date | None = None):
+        self.conn: sqlite3.Connection = connect_readonly(db_path)
+        self.matcher = IndicatorMatcher.from_path()
+        self.engine = TranslationEngine.from_path()
+        self.as_of = as_of or date.today()
+        # Cohorts share a handful of ranks and trades, so lookups are memoized.
+        self._ranks: dict[str, dict] = {}
+        self._mosids: dict[str, dict] = {}
+
+    def rank(self, rank_name: str) -> dict:
+        if rank_name not in self._ranks:
+            self._ranks[rank_name] = fetch_rank(self.conn, rank_name)
+        return self._ranks[rank_name]
+
+    def mosid(self, mosid_code: str) -> dict:
+        if mosid_code not in self._mosids:
+            self._mosids[mosid_code] = fetch_mosid_profile(self.conn, mosid_code)
+        return self._mosids[mosid_code]
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def _parse_date(value: Any) -> date | None:
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except (TypeError, ValueError):
+        return None
+
+
+def _text(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, Iterable) and not isinstance(value, Mapping):
+        return "\n".join(str(item) for item in value)
+    return ""
+
+
+def _years_of_service(record: Mapping[str, Any], as_of: date) -> int | None:
+    start = _parse_date(record.get("enrolment_date"))
+    if start is None:
+        return None
+    end = _parse_date(record.get("release_date")) or as_of
+    return max(0, end.year - start.year - ((end.month, end.day) < (start.month, start.day)))
+
+
+def _duty_statements(profile: Mapping[str, Any]) -> list[str]:
+    """Task statements of every equivalency, minus the NOC lead-in lines."""
+
+    statements = []
+    for equivalency in profile.get("equivalencies", []):
+        statements.extend(s for s in equivalency.get("task_statements", []) if not s.rstrip().endswith(":"))
+    return statements
+
+
+def _award(award: Mapping[str, Any]) -> dict:
+    item = {"name": award["name"]}
+    awarded = _parse_date(award.get("date"))
+    if awarded is not None:
+        item["year"] = awarded.year
+    return item
+
+
+def build_resume(ctx: PipelineContext, record: Mapping[str, Any], timings: dict[str, float]) -> dict:
+    """Assemble one résumé object, adding each stage's time to ``timings``."""
+
+    clock = time.perf_counter
+    started = clock()
+    rank = ctx.rank(record["rank_current"]) if record.get("rank_current") else {}
+    timings["rank"] += clock() - started
+
+    started = clock()
+    profile = ctx.mosid(str(record["mosid"])) if record.get("mosid") else {}
+    timings["mosid"] += clock() - started
+
+    started = clock()
+    values = record.get("template_values")
+    positions = record.get("positions") or []
+    position_hits = [ctx.matcher.scan(_text(p.get("duties")) + "\n" + _text(p.get("description"))) for p in positions]
+    record_text = "\n".join(
+        [_text(record.get("operational_impacts"))] + [_text(d.get("role")) for d in record.get("deployments") or []]
+    )
+    record_hits = ctx.matcher.scan(record_text)
+    timings["indicators"] += clock() - started
+
+    started = clock()
+    position_bullets = [
+        [bullet["text"] for bullet in ctx.engine.translate_entry((hit.indicator for hit in hits), values)["bullets"]]
+        for hits in position_hits
+    ]
+    all_indicators = [hit.indicator for hits in [*position_hits, record_hits] for hit in hits]
+    summary_bullets = [bullet["text"] for bullet in ctx.engine.translate_entry(all_indicators, values)["bullets"]]
+    summary_bullets = summary_bullets[:SUMMARY_BULLETS_MAX]
+    for statement in _duty_statements(profile):
+        if len(summary_bullets) >= SUMMARY_BULLETS_MIN:
+            break
+        if statement not in summary_bullets:
+            summary_bullets.append(statement)
+    timings["translate"] += clock() - started
+
+    started = clock()
+    warnings = []
+    if record.get("rank_current") and not rank:
+        warnings.append(f"Unknown rank: {record['rank_current']}")
+    if record.get("mosid") and not profile:
+        warnings.append(f"Unknown MOSID: {record['mosid']}")
+
+    summary = {
+        key: record[key]
+        for key in ("full_name", "preferred_name", "contact_email", "contact_phone", "location", "linkedin_url")
+        if record.get(key)
+    }
+    if record.get("security_clearance_level"):
+        summary["security_clearance"] = f"Active {record['security_clearance_level']} Clearance"
+    for required in ("full_name", "contact_email"):
+        if required not in summary:
+            warnings.append(f"Missing summary.{required}")
+
+    civilian_titles = [e["civilian_title"] for e in profile.get("equivalencies", [])]
+    years = _years_of_service(record, ctx.as_of)
+    headline = [civilian_titles[0] if civilian_titles else None, profile.get("title") or record.get("mosid_description")]
+    if years:
+        headline.append(f"{years} years of experience")
+
+    experience = []
+    for position, bullets in zip(positions, position_bullets):
+        item = {
+            "position_title": position.get("title", ""),
+            "organization": position.get("unit", ""),
+            "start_date": position.get("start_date", ""),
+            "end_date": position.get("end_date") or "Present",
+            "achievements": bullets,
+        }
+        if position.get("location"):
+            item["location"] = position["location"]
+        experience.append(item)
+
+    technical = [course.get("name", "") for course in record.get("courses_completed") or [] if course.get("name")]
+    technical.extend(title for title in civilian_titles if title not in technical)
+    resume = {
+        "summary": summary,
+        "professional_profile": {
+            "headline": " | ".join(part for part in headline if part),
+            "summary_bullets": summary_bullets,
+        },
+        "experience": experience,
+        "education": [
+            {key: item[key] for key in ("institution", "credential", "graduation_date") if item.get(key)}
+            for item in record.get("education") or []
+        ],
+        "certifications": [
+            {key: item[key] for key in ("name", "issuer", "issued_date", "expiry_date") if item.get(key)}
+            for item in record.get("certifications_active") or []
+        ],
+        "skills": {
+            "technical": technical[:TECHNICAL_SKILLS_MAX],
+            "leadership": rank.get("responsibilities", []),
+            "languages": [str(language) for language in record.get("languages") or []],
+        },
+        "deployments": [
+            {
+                "mission": item.get("mission", ""),
+                "role": item.get("role", ""),
+                "location": item.get("theatre", ""),
+                "start_date": item.get("start_date", ""),
+                **({"end_date": item["end_date"]} if item.get("end_date") else {}),
+            }
+            for item in record.get("deployments") or []
+        ],
+        "awards": [_award(award) for award in record.get("awards") or [] if award.get("name")],
+    }
+    timings["assemble"] += clock() - started
+    return {"schema_version": RESUME_SCHEMA_VERSION, "resume": resume, "warnings": warnings}
+
+
+def process_lines(ctx: PipelineContext, lines: Iterable[tuple[int, str]]) -> tuple[list[str], dict[str, float], int]:
+    """Turn numbered JSONL lines into serialized output lines.
+
+    A record that fails to parse or assemble yields an ``error`` line rather
+    than failing the batch. Returns the output lines, per-stage seconds and
+    the number of failed records.
+    """
+
+    timings = dict.fromkeys(STAGES, 0.0)
+    output = []
+    failed = 0
+    for line_number, line in lines:
+        started = time.perf_counter()
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("Record must be a JSON object.")
+        except ValueError as exc:
+            timings["parse"] += time.perf_counter() - started
+            output.append(json.dumps({"line": line_number, "error": str(exc)}))
+            failed += 1
+            continue
+        timings["parse"] += time.perf_counter() - started
+        record_id = record.get("record_id", record.get("member_id", str(line_number)))
+        try:
+            result = {"record_id": record_id, "line": line_number, **build_resume(ctx, record, timings)}
+        except Exception as exc:  # noqa: BLE001 - one bad record must not sink the cohort
+            result = {"record_id": record_id, "line": line_number, "error": f"{type(exc).__name__}: {exc}"}
+            failed += 1
+        output.append(json.dumps(result, ensure_ascii=False))
+    return output, timings, failed
+
+
+_WORKER: PipelineContext | None = None
+
+
+def _init_worker(db_path: Path, as_of: date | None) -> None:
+    global _WORKER
+    _WORKER = PipelineContext(db_path, as_of)
+
+
+def _process_chunk(lines: list[tuple[int, str]]) -> tuple[list[str], dict[str, float], int]:
+    assert _WORKER is not None, "worker not initialized"
+    return process_lines(_WORKER, lines)
+
+
+class _InlineExecutor(Executor):
+    """Runs chunks in the calling process (``workers=0``).
+
+    Every submission is a ``_process_chunk`` call, so it is served from a
+    local context instead of the worker global.
+    """
+
+    def __init__(self, db_path: Path, as_of: date | None):
+        self._ctx = PipelineContext(db_path, as_of)
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(process_lines(self._ctx, *args))
+        except BaseException as exc:
+            future.set_exception(exc)
+        return future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        self._ctx.close()
+
+
+def iter_chunks(lines: Iterable[str], chunk_size: int) -> Iterator[list[tuple[int, str]]]:
+    """Group non-blank lines into numbered chunks (line numbers start at 1)."""
+
+    chunk = []
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        chunk.append((line_number, line))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_batch(
+    input_path: Path,
+    output_path: Path,
+    db_path: Path,
+    workers: int | None = None,
+    chunk_size: int = 25,
+    max_in_flight: int | None = None,
+    as_of: date | None = None,
+    progress: Callable[[JobProgress], None] | None = None,
+) -> JobProgress:
+    """Generate résumés for every record in ``input_path``.
+
+    ``workers=0`` runs in-process; ``None`` uses one worker per CPU.
+    ``max_in_flight`` (default twice the worker count) caps submitted but
+    unwritten chunks. The output is written to a temporary file and renamed
+    into place once every record has been processed.
+    """
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    max_in_flight = max_in_flight or max(2, 2 * workers)
+    if workers > 0:
+        executor: Executor = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(Path(db_path), as_of))
+    else:
+        executor = _InlineExecutor(Path(db_path), as_of)
+
+    state = JobProgress()
+    started = time.perf_counter()
+    output_path = Path(output_path)
+    tmp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+    pending: deque[tuple[Future, int]] = deque()
+
+    def drain_one(out) -> None:
+        future, size = pending.popleft()
+        lines, timings, failed = future.result()
+        out.write("".join(f"{line}\n" for line in lines))
+        state.records_done += size
+        state.records_failed += failed
+        for stage, seconds in timings.items():
+            state.stage_seconds[stage] += seconds
+        state.seconds = time.perf_counter() - started
+        if progress is not None:
+            progress(state)
+
+    try:
+        with open(input_path, "r", encoding="utf-8") as source, open(tmp_path, "w", encoding="utf-8") as out:
+            for chunk in iter_chunks(source, chunk_size):
+                state.records_read += len(chunk)
+                pending.append((executor.submit(_process_chunk, chunk), len(chunk)))
+                while len(pending) >= max_in_flight:
+                    drain_one(out)
+            while pending:
+                drain_one(out)
+        os.replace(tmp_path, output_path)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        tmp_path.unlink(missing_ok=True)
+    state.seconds = time.perf_counter() - started
+    return state
+
+
+@dataclass
+class ResumeJob:
+    job_id: str
+    input_path: Path
+    output_path: Path
+    status: str = "queued"
+    error: str | None = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+    progress: JobProgress = field(default_factory=JobProgress)
+
+    def as_dict(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "progress": self.progress.as_dict(),
+        }
+
+
+class ResumeJobManager:
+    """Runs batch jobs on background threads and tracks their progress.
+
+    Jobs run one at a time (each already fans out over a process pool);
+    later submissions queue behind it. Finished jobs are forgotten, and their
+    results deleted, ``retention_seconds`` after they finish or once more
+    than ``max_finished`` have piled up, oldest first.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        workdir: Path,
+        workers: int | None = None,
+        chunk_size: int = 25,
+        retention_seconds: float = 24 * 3600,
+        max_finished: int = 100,
+    ):
+        self.db_path = Path(db_path)
+        self.workdir = Path(workdir)
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.retention_seconds = retention_seconds
+        self.max_finished = max_finished
+        self._jobs: dict[str, ResumeJob] = {}
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+
+    def new_job(self) -> ResumeJob:
+        self.workdir.mkdir(parents=True, exist_ok=True)
+        job_id = uuid.uuid4().hex
+        job = ResumeJob(job_id, self.workdir / f"{job_id}.input.jsonl", self.workdir / f"{job_id}.resumes.jsonl")
+        self.prune()
+        with self._lock:
+            self._jobs[job_id] = job
+        return job
+
+    def discard(self, job: ResumeJob) -> None:
+        """Forget a job that was never started and delete its files."""
+
+        with self._lock:
+            self._jobs.pop(job.job_id, None)
+        job.input_path.unlink(missing_ok=True)
+        job.output_path.unlink(missing_ok=True)
+
+    def get(self, job_id: str) -> ResumeJob | None:
+        self.prune()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def prune(self) -> list[str]:
+        """Drop expired or surplus finished jobs and delete their results.
+
+        Returns the ids of the jobs dropped.
+        """
+
+        cutoff = time.time() - self.retention_seconds
+        with self._lock:
+            finished = sorted(
+                (job for job in self._jobs.values() if job.finished_at is not None),
+                key=lambda job: job.finished_at,
+            )
+            surplus = len(finished) - self.max_finished
+            expired = [
+                job for position, job in enumerate(finished) if position < surplus or job.finished_at < cutoff
+            ]
+            for job in expired:
+                del self._jobs[job.job_id]
+        for job in expired:
+            job.output_path.unlink(missing_ok=True)
+        return [job.job_id for job in expired]
+
+    def start(self, job: ResumeJob) -> threading.Thread:
+        thread = threading.Thread(target=self._run, args=(job,), name=f"resume-job-{job.job_id}", daemon=True)
+        thread.start()
+        return thread
+
+    def _run(self, job: ResumeJob) -> None:
+        with self._run_lock:
+            job.status = "running"
+
+            def report(state: JobProgress) -> None:
+                job.progress = JobProgress(**{**asdict(state), "stage_seconds": dict(state.stage_seconds)})
+
+            try:
+                job.progress = run_batch(
+                    job.input_path,
+                    job.output_path,
+                    self.db_path,
+                    workers=self.workers,
+                    chunk_size=self.chunk_size,
+                    progress=report,
+                )
+                job.status = "succeeded"
+            except Exception as exc:  # noqa: BLE001 - surfaced through the status endpoint
+                job.status = "failed"
+                job.error = f"{type(exc).__name__}: {exc}"
+            finally:
+                job.finished_at = time.time()
+                job.input_path.unlink(missing_ok=True)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(Counter(job.status for job in self._jobs.values()))
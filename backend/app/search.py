@@ -0,0 +1,70 @@
+"""Ranked full-text search over the FTS5 ``search_index`` table.
+
+Free text is turned into an FTS5 query that requires every term, results
+are ranked with BM25 (civilian and MOSID titles weigh more than statement
+text) and each hit carries a highlighted snippet.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+
+SEARCH_KINDS = ("mosid", "noc", "task", "rank")
+
+# Column weights follow the table layout: kind, mosid_code, noc_code and
+# rank_name are UNINDEXED, then title and body.
+SEARCH_SQL = """
+    SELECT kind, mosid_code, noc_code, rank_name, title,
+           snippet(search_index, -1, '[', ']', '…', 16),
+           bm25(search_index, 0, 0, 0, 0, 2.0, 1.0) AS score
+    FROM search_index
+    WHERE search_index MATCH ?{kind_filter}
+    ORDER BY score
+    LIMIT ? OFFSET ?
+"""
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+def to_match_query(text: str) -> str:
+    """Quote each word of ``text`` so user input never hits FTS5 syntax."""
+
+    return " ".join(f'"{term}"' for term in _TERM.findall(text))
+
+
+def search(
+    conn: sqlite3.Connection,
+    query: str,
+    kind: str | None = None,
+    limit: int = 10,
+    offset: int = 0,
+) -> dict:
+    """Return one page of ranked matches for ``query``.
+
+    ``next_offset`` is set when another page is available.
+    """
+
+    match = to_match_query(query)
+    if not match:
+        return {"query": query, "results": [], "next_offset": None}
+    params: list = [match]
+    kind_filter = ""
+    if kind:
+        kind_filter = " AND kind = ?"
+        params.append(kind)
+    # Fetch one extra row to learn whether a further page exists.
+    params += [limit + 1, offset]
+    rows = conn.execute(SEARCH_SQL.format(kind_filter=kind_filter), params).fetchall()
+    results = []
+    for row_kind, mosid_code, noc_code, rank_name, title, snippet, score in rows[:limit]:
+        hit = {"kind": row_kind, "title": title, "snippet": snippet, "score": round(-score, 4)}
+        if mosid_code is not None:
+            hit["mosid"] = mosid_code
+        if noc_code is not None:
+            hit["noc_code"] = noc_code
+        if rank_name is not None:
+            hit["rank"] = rank_name
+        results.append(hit)
+    next_offset = offset + limit if len(rows) > limit else None
+    return {"query": query, "results": results, "next_offset": next_offset}
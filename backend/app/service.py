@@ -0,0 +1,365 @@
+"""Data access and tool implementations shared by the HTTP and MCP surfaces.
+
+This module opens the prebuilt artifact and holds the state both front
+ends use: the connection pool, snapshot store, response cache and metrics.
+It imports neither FastAPI nor the MCP SDK, so each entry point loads only
+its own framework (see ``app.http_app`` and ``app.mcp_app``). Components
+only some calls need are built on first use: the indicator matcher,
+translation engine, recommendation index and résumé job manager.
+"""
+
+import asyncio
+import logging
+import os
+import tempfile
+from contextlib import closing
+from functools import cache
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from app.database import (
+    DEFAULT_DB_PATH,
+    MNET_DATA_PATH,
+    RANKS_PATH,
+    connect_readonly,
+    ensure_database,
+    fetch_mosid_profile,
+    fetch_mosid_profiles,
+    fetch_rank,
+)
+from app.image import ImageStore, ensure_image, image_path_for
+from app.metrics import Instrumentation
+from app.noc_index import NocIndex, load_noc_index
+from app.pool import AsyncConnectionPool, connect_pooled
+from app.response_cache import ResponseCache, dump_json
+from app.search import SEARCH_KINDS, search as search_index
+from app.snapshot import SnapshotStore
+
+if TYPE_CHECKING:
+    from app.indicators import IndicatorMatcher
+    from app.recommend import Recommender
+    from app.resume_pipeline import ResumeJobManager
+    from app.translation import TranslationEngine
+
+logger = logging.getLogger(__name__)
+
+DB_PATH = Path(os.environ.get("CAF_RESUME_DB_PATH", DEFAULT_DB_PATH))
+MNET_DATA = Path(os.environ.get("CAF_RESUME_MNET_DATA", MNET_DATA_PATH))
+
+# Open the prebuilt artifact; it is only rebuilt when the sources changed.
+DATA_VERSION = ensure_database(DB_PATH, MNET_DATA, RANKS_PATH)
+
+# ``snapshot`` serves lookups from an in-memory copy of the artifact instead
+# of opening a SQLite connection per call. ``image`` serves them from a
+# binary image mapped read-only, so every worker shares one copy of the pages.
+DATA_BACKEND = os.environ.get("CAF_RESUME_DATA_BACKEND", "sqlite")
+IMAGE_PATH = Path(os.environ.get("CAF_RESUME_IMAGE_PATH", image_path_for(DB_PATH)))
+SNAPSHOTS: SnapshotStore | ImageStore | None = None
+if DATA_BACKEND == "snapshot":
+    SNAPSHOTS = SnapshotStore(DB_PATH)
+elif DATA_BACKEND == "image":
+    ensure_image(DB_PATH, IMAGE_PATH)
+    SNAPSHOTS = ImageStore(IMAGE_PATH)
+
+# Route, tool and SQLite timings served on ``/metrics``. Set
+# ``CAF_RESUME_TRACE_FILE`` to also append per-request spans as JSON lines,
+# and ``CAF_RESUME_TRACE_SAMPLE`` to trace only a fraction of requests.
+METRICS = Instrumentation(
+    trace_path=os.environ.get("CAF_RESUME_TRACE_FILE") or None,
+    trace_sample=float(os.environ.get("CAF_RESUME_TRACE_SAMPLE", 1.0)),
+)
+connect_db = METRICS.connect(connect_readonly)
+# Connections that may be used from more than one thread, such as those
+# behind the pool or a streamed response advanced by threadpool workers.
+connect_shared = METRICS.connect(connect_pooled)
+
+# Bounded set of reusable read-only connections behind the async handlers.
+POOL = AsyncConnectionPool(
+    DB_PATH,
+    size=int(os.environ.get("CAF_RESUME_POOL_SIZE", 4)),
+    connect=connect_shared,
+)
+
+# Pre-serialized MOSID profiles keyed by ``(mosid_code, data_version)``.
+RESPONSE_CACHE = ResponseCache(int(os.environ.get("CAF_RESUME_RESPONSE_CACHE_BYTES", 16 * 1024 * 1024)))
+
+METRICS.registry.callback(
+    "caf_response_cache_hits_total", "MOSID response cache hits.", lambda: RESPONSE_CACHE.hits, kind="counter"
+)
+METRICS.registry.callback(
+    "caf_response_cache_misses_total", "MOSID response cache misses.", lambda: RESPONSE_CACHE.misses, kind="counter"
+)
+METRICS.registry.callback(
+    "caf_response_cache_hit_ratio",
+    "Share of MOSID response cache lookups that hit.",
+    lambda: RESPONSE_CACHE.hits / ((RESPONSE_CACHE.hits + RESPONSE_CACHE.misses) or 1),
+)
+METRICS.registry.callback("caf_pool_connections_in_use", "Pooled connections checked out.", lambda: POOL.stats()["in_use"])
+METRICS.registry.callback(
+    "caf_pool_wait_seconds_total", "Time spent waiting for a pooled connection.", lambda: POOL.total_wait_seconds, kind="counter"
+)
+
+# Upper bound on service-history text accepted per indicator scan.
+MAX_DOCUMENT_CHARS = 2_000_000
+
+# Bounds for batch translation requests.
+MAX_TRANSLATE_ENTRIES = 5000
+MAX_ENTRY_CHARS = 20_000
+
+# Page size bounds for full-text search.
+SEARCH_MAX_LIMIT = 50
+
+# Bounds for recommendation requests; lists are precomputed to ``TOP_K``.
+RECOMMEND_MAX_LIMIT = 25
+RECOMMEND_MAX_TEXT_CHARS = 20_000
+
+
+@cache
+def indicator_matcher() -> "IndicatorMatcher":
+    """Indicator keywords compiled once into a single-pass matcher."""
+    from app.indicators import IndicatorMatcher
+
+    return IndicatorMatcher.from_path()
+
+
+@cache
+def translation_engine() -> "TranslationEngine":
+    """Translation templates indexed by source indicator, with default
+    renderings computed once."""
+    from app.translation import TranslationEngine
+
+    return TranslationEngine.from_path()
+
+
+@cache
+def resume_jobs() -> "ResumeJobManager":
+    """Batch résumé jobs run in the background over a process pool; uploads
+    and results are kept under ``CAF_RESUME_JOB_DIR``."""
+    from app.resume_pipeline import ResumeJobManager
+
+    return ResumeJobManager(
+        DB_PATH,
+        Path(os.environ.get("CAF_RESUME_JOB_DIR", Path(tempfile.gettempdir()) / "caf_resume_jobs")),
+        workers=int(os.environ["CAF_RESUME_JOB_WORKERS"]) if "CAF_RESUME_JOB_WORKERS" in os.environ else None,
+        retention_seconds=float(os.environ.get("CAF_RESUME_JOB_RETENTION_SECONDS", 24 * 3600)),
+        max_finished=int(os.environ.get("CAF_RESUME_JOB_MAX_FINISHED", 100)),
+    )
+
+
+def get_rank_data(rank_name: str) -> dict:
+    """Return responsibilities for a given rank."""
+    if SNAPSHOTS is not None:
+        return SNAPSHOTS.current().rank(rank_name)
+    with closing(connect_db(DB_PATH)) as conn:
+        return fetch_rank(conn, rank_name)
+
+def get_mosid_data(mosid_code: str) -> dict:
+    """Return NOC equivalencies and task statements for a given MOSID."""
+    if SNAPSHOTS is not None:
+        return SNAPSHOTS.current().mosid(mosid_code)
+    with closing(connect_db(DB_PATH)) as conn:
+        return fetch_mosid_profile(conn, mosid_code)
+
+def data_version() -> str:
+    """Return the version of the dataset currently being served."""
+    if SNAPSHOTS is not None:
+        return SNAPSHOTS.latest.version
+    return DATA_VERSION
+
+def _resolve_from(data, mosid_codes: list[str]) -> tuple[dict[str, dict], list[str]]:
+    requested = list(dict.fromkeys(mosid_codes))
+    profiles = {code: profile for code in requested if (profile := data.mosid(code))}
+    return profiles, [code for code in requested if code not in profiles]
+
+def resolve_mosids(mosid_codes: list[str]) -> tuple[dict[str, dict], list[str]]:
+    """Resolve many MOSIDs at once, returning profiles in request order and misses."""
+    if SNAPSHOTS is not None:
+        return _resolve_from(SNAPSHOTS.current(), mosid_codes)
+    with closing(connect_db(DB_PATH)) as conn:
+        return fetch_mosid_profiles(conn, mosid_codes)
+
+def get_mosid_data_batch(mosid_codes: list[str]) -> dict:
+    """Return NOC equivalencies and task statements for a given list of MOSIDs."""
+    profiles, _ = resolve_mosids(mosid_codes)
+    return {mosid_code: profiles.get(mosid_code, {}) for mosid_code in mosid_codes}
+
+_NOC_INDEX: NocIndex | None = None
+
+def noc_index() -> NocIndex:
+    """Return the reverse NOC index for the data version being served."""
+    global _NOC_INDEX
+    version = data_version()
+    index = _NOC_INDEX
+    if index is None or index.version != version:
+        with closing(connect_db(DB_PATH)) as conn:
+            index = _NOC_INDEX = load_noc_index(conn, version)
+    return index
+
+def get_noc_mosids(noc_code: str) -> dict:
+    """Return the MOSIDs that map to a NOC code or to a 2-, 3- or 4-digit NOC group prefix."""
+    if isinstance(SNAPSHOTS, ImageStore):
+        return SNAPSHOTS.current().noc_mosids(noc_code)
+    return noc_index().lookup(noc_code)
+
+# Build the reverse index up front so the first lookup is already a dict read.
+# The image carries its own sorted NOC index, shared by every worker.
+if not isinstance(SNAPSHOTS, ImageStore):
+    noc_index()
+
+_RECOMMENDER: "Recommender | None" = None
+
+def recommender() -> "Recommender":
+    """Return the recommendation index for the data version being served.
+
+    It is built on first use rather than at import, so start-up does not pay
+    for vectorizing the crosswalk.
+    """
+    global _RECOMMENDER
+    from app.recommend import load_recommender
+
+    version = data_version()
+    index = _RECOMMENDER
+    if index is None or index.version != version:
+        with closing(connect_db(DB_PATH)) as conn:
+            index = _RECOMMENDER = load_recommender(conn, version)
+    return index
+
+def similar_mosids(mosid_code: str, limit: int = 10) -> dict:
+    """Return the MOSIDs whose titles, civilian titles and task statements are
+    most similar to a given MOSID, with cosine similarity scores."""
+    return recommender().similar_mosids(mosid_code, max(1, min(limit, RECOMMEND_MAX_LIMIT)))
+
+def recommend_nocs(text: str | None = None, mosid_code: str | None = None, limit: int = 10) -> dict:
+    """Recommend NOC occupations for free ``text`` (duties, a course or a
+    résumé line) or for a MOSID.
+
+    Pass exactly one of ``text`` or ``mosid_code``. For a MOSID, NOCs it is
+    already mapped to are left out, so the list answers "what else am I
+    qualified for?".
+    """
+    if (text is None) == (mosid_code is None):
+        raise ValueError("Pass exactly one of text or mosid_code.")
+    limit = max(1, min(limit, RECOMMEND_MAX_LIMIT))
+    if mosid_code is not None:
+        return recommender().recommend_for_mosid(mosid_code, limit)
+    if len(text) > RECOMMEND_MAX_TEXT_CHARS:
+        raise ValueError(f"text is limited to {RECOMMEND_MAX_TEXT_CHARS} characters.")
+    return recommender().recommend_for_text(text, limit)
+
+async def run_query(fn, *args):
+    """Run ``fn(conn, *args)`` on the pool, timed as one query."""
+    return await POOL.run(METRICS.timed_query, fn, *args)
+
+def current_data():
+    """Return the snapshot or image being served without blocking the event loop.
+
+    When a staleness check is due it runs, with any reload, on the default
+    executor and the new data is swapped in on the loop once it is ready;
+    until then callers keep reading the data already being served.
+    """
+    store = SNAPSHOTS
+    if store.claim_check():
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(None, _reload_in_background, store, loop)
+        future.add_done_callback(_report_reload_failure)
+    return store.latest
+
+def _reload_in_background(store: SnapshotStore | ImageStore, loop: asyncio.AbstractEventLoop) -> None:
+    data = store.load_if_changed()
+    if data is None:
+        return
+    try:
+        loop.call_soon_threadsafe(store.swap, data)
+    except RuntimeError:
+        # The loop closed while the data was loading.
+        store.swap(data)
+
+def _report_reload_failure(future: asyncio.Future) -> None:
+    if not future.cancelled() and (error := future.exception()) is not None:
+        logger.error("Reloading the served data failed; the previous data stays in use.", exc_info=error)
+
+async def get_rank_data_async(rank_name: str) -> dict:
+    """Return responsibilities for a given rank."""
+    if SNAPSHOTS is not None:
+        return current_data().rank(rank_name)
+    return await run_query(fetch_rank, rank_name)
+
+async def get_mosid_data_async(mosid_code: str) -> dict:
+    """Return NOC equivalencies and task statements for a given MOSID."""
+    if SNAPSHOTS is not None:
+        return current_data().mosid(mosid_code)
+    return await run_query(fetch_mosid_profile, mosid_code)
+
+async def resolve_mosids_async(mosid_codes: list[str]) -> tuple[dict[str, dict], list[str]]:
+    """Async counterpart of ``resolve_mosids`` backed by the connection pool."""
+    if SNAPSHOTS is not None:
+        return _resolve_from(current_data(), mosid_codes)
+    return await run_query(fetch_mosid_profiles, mosid_codes)
+
+async def get_mosid_data_batch_async(mosid_codes: list[str]) -> dict:
+    """Return NOC equivalencies and task statements for a given list of MOSIDs."""
+    profiles, _ = await resolve_mosids_async(mosid_codes)
+    return {mosid_code: profiles.get(mosid_code, {}) for mosid_code in mosid_codes}
+
+async def search(query: str, kind: str | None = None, limit: int = 10, offset: int = 0) -> dict:
+    """Full-text search over MOSID titles, civilian titles, task statements and rank responsibilities.
+
+    Results are ranked by BM25 with highlighted snippets. ``kind`` narrows the
+    search to one of "mosid", "noc", "task" or "rank". Use ``next_offset`` to
+    fetch the following page.
+    """
+    if kind is not None and kind not in SEARCH_KINDS:
+        raise ValueError(f"kind must be one of {', '.join(SEARCH_KINDS)}.")
+    limit = max(1, min(limit, SEARCH_MAX_LIMIT))
+    return await run_query(search_index, query, kind, limit, max(0, offset))
+
+def match_indicators(text: str, mosid_family: str | None = None) -> dict:
+    """Scan service-history text for catalogued indicators in a single pass.
+
+    Returns each hit with its indicator, MOSID family, matched keyword and
+    character offsets, plus per-indicator counts. ``mosid_family`` (for
+    example "00300 - Infantry Officer") restricts hits to one family.
+    """
+    return indicator_matcher().match(text, mosid_family)
+
+def translate(entries: list[dict], mosid_family: str | None = None) -> dict:
+    """Render civilian résumé bullets for a batch of service-history entries.
+
+    Each entry may carry ``indicators`` (names from the indicator catalog),
+    free ``text`` to scan for indicators, optional placeholder ``values``
+    overriding the template defaults, and an ``id`` echoed in the result.
+    Results keep the request order.
+    """
+    if len(entries) > MAX_TRANSLATE_ENTRIES:
+        raise ValueError(f"At most {MAX_TRANSLATE_ENTRIES} entries can be translated per call.")
+    return translation_engine().translate(entries, indicator_matcher(), mosid_family)
+
+async def cached_mosid(mosid_code: str):
+    """Return the pre-serialized profile for ``mosid_code`` or ``None``.
+
+    The cache key carries the version of the data the profile is read from,
+    so a snapshot swapped in meanwhile never files new bytes under an old
+    version (or an ETag under the wrong data).
+    """
+
+    entries, _ = await cached_mosids([mosid_code])
+    return entries.get(mosid_code)
+
+async def cached_mosids(mosid_codes: list[str]) -> tuple[dict, list[str]]:
+    """Pre-serialized profiles by code, resolving every cache miss in one
+    lookup, plus the codes that were not found."""
+
+    data = current_data() if SNAPSHOTS is not None else None
+    version = data.version if data is not None else DATA_VERSION
+    requested = list(dict.fromkeys(mosid_codes))
+    entries = {code: entry for code in requested if (entry := RESPONSE_CACHE.get((code, version)))}
+    misses = [code for code in requested if code not in entries]
+    if not misses:
+        return entries, []
+    if data is not None:
+        profiles, not_found = _resolve_from(data, misses)
+    else:
+        profiles, not_found = await run_query(fetch_mosid_profiles, misses)
+    for code, profile in profiles.items():
+        entries[code] = RESPONSE_CACHE.put((code, version), dump_json(profile))
+    return {code: entries[code] for code in requested if code in entries}, not_found
@@ -0,0 +1,187 @@
+"""Immutable in-memory snapshot of the MOSID and rank datasets.
+
+The whole crosswalk is small enough to hold in memory, so in snapshot mode
+lookups are a dict read instead of a SQLite round trip. A snapshot is never
+mutated; when the database artifact is rebuilt a new snapshot is loaded on the
+side and swapped in with a single reference assignment, so in-flight requests
+keep reading the snapshot they started with.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping, NamedTuple
+
+from app.database import (
+    ALL_MOSID_PROFILES_SQL,
+    ALL_RANK_RESPONSIBILITIES_SQL,
+    connect_readonly,
+    group_mosid_rows,
+    read_build_info,
+)
+
+_intern = sys.intern
+
+
+class Equivalency(NamedTuple):
+    noc_code: str
+    civilian_title: str
+    task_statements: tuple[str, ...]
+
+
+class MosidProfile(NamedTuple):
+    mosid: str
+    title: str
+    equivalencies: tuple[Equivalency, ...]
+
+    def as_dict(self) -> dict:
+        """Return the JSON shape used by the MCP tools and HTTP API."""
+
+        return {
+            "mosid": self.mosid,
+            "title": self.title,
+            "equivalencies": [
+                {
+                    "noc_code": equivalency.noc_code,
+                    "civilian_title": equivalency.civilian_title,
+                    "task_statements": list(equivalency.task_statements),
+                }
+                for equivalency in self.equivalencies
+            ],
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class Snapshot:
+    """Read-only view of one data version."""
+
+    version: str
+    mosids: Mapping[str, MosidProfile]
+    ranks: Mapping[str, tuple[str, ...]]
+
+    def mosid(self, mosid_code: str) -> dict:
+        profile = self.mosids.get(mosid_code)
+        return profile.as_dict() if profile is not None else {}
+
+    def rank(self, rank_name: str) -> dict:
+        responsibilities = self.ranks.get(rank_name)
+        if responsibilities is None:
+            return {}
+        return {"rank": rank_name, "responsibilities": list(responsibilities)}
+
+
+def load_snapshot(db_path: Path) -> Snapshot:
+    """Read every MOSID profile and rank from the artifact at ``db_path``."""
+
+    with closing(connect_readonly(db_path)) as conn:
+        # Read the version on the same connection so it matches the rows.
+        version = dict(conn.execute("SELECT key, value FROM build_info")).get("source_hash", "")
+        mosids = {
+            _intern(code): MosidProfile(
+                _intern(code),
+                _intern(profile["title"]),
+                tuple(
+                    Equivalency(
+                        _intern(item["noc_code"]),
+                        _intern(item["civilian_title"]),
+                        tuple(_intern(statement) for statement in item["task_statements"]),
+                    )
+                    for item in profile["equivalencies"]
+                ),
+            )
+            for code, profile in group_mosid_rows(conn.execute(ALL_MOSID_PROFILES_SQL))
+        }
+        ranks: dict[str, list[str]] = {}
+        for rank_name, responsibility in conn.execute(ALL_RANK_RESPONSIBILITIES_SQL):
+            responsibilities = ranks.setdefault(_intern(rank_name), [])
+            if responsibility is not None:
+                responsibilities.append(_intern(responsibility))
+    return Snapshot(
+        version=version,
+        mosids=MappingProxyType(mosids),
+        ranks=MappingProxyType({name: tuple(items) for name, items in ranks.items()}),
+    )
+
+
+class SnapshotStore:
+    """Hold the current snapshot and swap it when the artifact changes.
+
+    Staleness is detected from the artifact's file metadata, checked at most
+    once per ``check_interval`` seconds. Only one thread reloads at a time;
+    other callers keep using the current snapshot instead of waiting.
+    Async callers split ``current`` into its steps so the check and reload
+    run off the event loop (see ``app.service.current_data``).
+    """
+
+    def __init__(self, db_path: Path, check_interval: float = 5.0):
+        self.db_path = Path(db_path)
+        self.check_interval = check_interval
+        self._check_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._signature = self._file_signature()
+        self._snapshot = load_snapshot(self.db_path)
+        self._checked_at = time.monotonic()
+
+    def _file_signature(self) -> tuple[int, int, int]:
+        stat = os.stat(self.db_path)
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    @property
+    def latest(self) -> Snapshot:
+        """The snapshot being served, without checking for a newer artifact."""
+
+        return self._snapshot
+
+    def claim_check(self) -> bool:
+        """Return ``True`` to at most one caller per ``check_interval``."""
+
+        with self._check_lock:
+            now = time.monotonic()
+            if now - self._checked_at < self.check_interval:
+                return False
+            self._checked_at = now
+            return True
+
+    def load_if_changed(self) -> Snapshot | None:
+        """Load the artifact if it changed since the last check, else ``None``.
+
+        The new snapshot is returned, not served; pass it to ``swap``.
+        """
+
+        if not self._reload_lock.acquire(blocking=False):
+            return None
+        try:
+            signature = self._file_signature()
+            if signature == self._signature:
+                return None
+            if read_build_info(self.db_path).get("source_hash") == self._snapshot.version:
+                snapshot = None
+            else:
+                snapshot = load_snapshot(self.db_path)
+            # Only recorded once the load succeeded, so a failure is retried
+            # at the next check.
+            self._signature = signature
+            return snapshot
+        finally:
+            self._reload_lock.release()
+
+    def swap(self, snapshot: Snapshot) -> None:
+        """Serve ``snapshot`` from now on; in-flight readers keep the old one."""
+
+        self._snapshot = snapshot
+
+    def current(self) -> Snapshot:
+        """Return the newest snapshot, reloading it first if it is stale."""
+
+        if self.claim_check():
+            snapshot = self.load_if_changed()
+            if snapshot is not None:
+                self.swap(snapshot)
+        return self._snapshot
@@ -0,0 +1,160 @@
+"""Render civilian résumé bullets from ``translation_templates.yaml``.
+
+Templates are loaded once into a trigger index keyed by source indicator.
+Each ``civilian_translation`` format string is parsed up front into literal
+and placeholder pieces, and the rendering filled with ``default_values`` is
+computed at load time, so the common case (no caller overrides) is a dict
+read per matched template.
+"""
+
+from __future__ import annotations
+
+import string
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Mapping, NamedTuple
+
+import yaml
+
+from app.indicators import normalize_phrase
+
+if TYPE_CHECKING:
+    from app.indicators import IndicatorMatcher
+
+TRANSLATION_TEMPLATES_PATH = Path(__file__).resolve().parent / "data" / "translation_templates.yaml"
+
+_FORMATTER = string.Formatter()
+
+
+class Piece(NamedTuple):
+    literal: str
+    field: str | None
+    spec: str
+
+
+class Template(NamedTuple):
+    mosid_family: str
+    trigger: str
+    source_indicators: tuple[str, ...]
+    pieces: tuple[Piece, ...]
+    fields: frozenset[str]
+    defaults: Mapping[str, Any]
+    default_text: str
+
+    def render(self, values: Mapping[str, Any] | None = None) -> str:
+        """Fill the placeholders, preferring ``values`` over the defaults.
+
+        Placeholders without a value are left in place as ``{name}``.
+        """
+
+        if not values or self.fields.isdisjoint(values):
+            return self.default_text
+        return _render(self.pieces, {**self.defaults, **values})
+
+
+def parse_format(text: str) -> tuple[Piece, ...]:
+    """Split a ``str.format`` string into literal/placeholder pieces."""
+
+    return tuple(Piece(literal, field or None, spec or "") for literal, field, spec, _ in _FORMATTER.parse(text))
+
+
+def _render(pieces: Iterable[Piece], values: Mapping[str, Any]) -> str:
+    parts = []
+    for piece in pieces:
+        parts.append(piece.literal)
+        if piece.field is None:
+            continue
+        if piece.field in values:
+            parts.append(format(values[piece.field], piece.spec))
+        else:
+            parts.append(f"{{{piece.field}}}")
+    return "".join(parts)
+
+
+class TranslationEngine:
+    """Trigger index over one version of the translation templates."""
+
+    def __init__(self, catalog: Mapping[str, Any]):
+        self.version = str(catalog.get("version", ""))
+        self._by_indicator: dict[str, list[Template]] = {}
+        for family in catalog.get("families", []):
+            for entry in family.get("templates", []):
+                pieces = parse_format(" ".join(entry["civilian_translation"].split()))
+                defaults = dict(entry.get("default_values") or {})
+                template = Template(
+                    mosid_family=family["mosid_family"],
+                    trigger=entry["trigger"],
+                    source_indicators=tuple(entry.get("source_indicators", [])),
+                    pieces=pieces,
+                    fields=frozenset(piece.field for piece in pieces if piece.field),
+                    defaults=defaults,
+                    default_text=_render(pieces, defaults),
+                )
+                for indicator in template.source_indicators:
+                    self._by_indicator.setdefault(normalize_phrase(indicator), []).append(template)
+
+    @classmethod
+    def from_path(cls, path: Path = TRANSLATION_TEMPLATES_PATH) -> "TranslationEngine":
+        with open(path, "r") as f:
+            return cls(yaml.safe_load(f) or {})
+
+    def templates_for(self, indicator: str) -> list[Template]:
+        return self._by_indicator.get(normalize_phrase(indicator), [])
+
+    def translate_entry(
+        self,
+        indicators: Iterable[str],
+        values: Mapping[str, Any] | None = None,
+        mosid_family: str | None = None,
+    ) -> dict:
+        """Render one bullet per template triggered by ``indicators``.
+
+        A template triggered by several indicators renders once and lists
+        each of them. ``mosid_family`` restricts bullets to one family.
+        """
+
+        bullets: dict[tuple[str, str], dict] = {}
+        unmatched = []
+        for indicator in dict.fromkeys(normalize_phrase(indicator) for indicator in indicators):
+            templates = [
+                template
+                for template in self._by_indicator.get(indicator, ())
+                if mosid_family is None or template.mosid_family == mosid_family
+            ]
+            if not templates:
+                unmatched.append(indicator)
+            for template in templates:
+                key = (template.mosid_family, template.trigger)
+                bullet = bullets.get(key)
+                if bullet is None:
+                    bullets[key] = {
+                        "mosid_family": template.mosid_family,
+                        "trigger": template.trigger,
+                        "text": template.render(values),
+                        "indicators": [indicator],
+                    }
+                else:
+                    bullet["indicators"].append(indicator)
+        return {"bullets": list(bullets.values()), "unmatched_indicators": unmatched}
+
+    def translate(
+        self,
+        entries: Iterable[Mapping[str, Any]],
+        matcher: "IndicatorMatcher | None" = None,
+        mosid_family: str | None = None,
+    ) -> dict:
+        """Translate a batch of service-history entries.
+
+        Each entry carries ``indicators``, free ``text`` (scanned with
+        ``matcher``), or both, plus optional placeholder ``values`` and
+        ``mosid_family``. Results keep the request order and echo any ``id``.
+        """
+
+        results = []
+        for position, entry in enumerate(entries):
+            family = entry.get("mosid_family") or mosid_family
+            indicators = list(entry.get("indicators") or ())
+            if entry.get("text") and matcher is not None:
+                indicators.extend(hit.indicator for hit in matcher.scan(entry["text"], family))
+            entry_id = entry.get("id") if entry.get("id") is not None else str(position)
+            results.append({"id": entry_id, **self.translate_entry(indicators, entry.get("values"), family)})
+        return {"templates_version": self.version, "results": results}
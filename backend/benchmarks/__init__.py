@@ -0,0 +1,5 @@
+"""Benchmarks for the CAF Resume Helper backend.
+
+Each module is runnable with ``python -m benchmarks.<name>`` from the
+``backend`` directory and prints its measurements to stdout.
+"""
@@ -0,0 +1,300 @@
+"""Latency and throughput of the HTTP API and MCP tools under concurrent load.
+
+Each dataset is the real ``mnet_data.json`` scaled up by ``--factors``
+(see ``benchmarks.datasets``). For every dataset a fresh interpreter imports
+``app.mcp_server`` against it, so the server's start-up path (artifact build,
+NOC index, pool) runs exactly as in production. Requests then go through the
+real ``app`` ASGI callable over ``httpx.ASGITransport`` and through the MCP
+tool manager, which validates arguments the way an MCP client call does.
+``--concurrency`` clients issue ``--requests`` requests per scenario.
+
+Results are written as JSON with p50/p95/p99 latency and requests/sec per
+dataset and scenario. ``compare`` flags scenarios whose latency or
+throughput regressed beyond ``--threshold`` against a saved baseline and
+exits non-zero when any did.
+
+Usage::
+
+    python -m benchmarks.api run --factors 10 100 --concurrency 16 --output bench.json
+    python -m benchmarks.api compare baseline.json bench.json --threshold 0.15
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+import yaml
+
+from app.database import RANKS_PATH
+from benchmarks.datasets import load_mnet_data, scale_mnet_data
+from benchmarks.stats import percentile
+
+BATCH_SIZE = 25
+
+# ``http:`` scenarios go through the ASGI app, ``mcp:`` ones through the
+# tool manager; the request each one sends is built in ``scenarios``.
+SCENARIO_NAMES = (
+    "http:ranks",
+    "http:mosids",
+    "http:batchLookup",
+    "http:nocs",
+    "mcp:get_rank_data",
+    "mcp:get_mosid_data",
+    "mcp:get_mosid_data_batch",
+    "mcp:get_noc_mosids",
+)
+
+# Metrics checked by ``compare``; True when a larger value is better.
+COMPARED_METRICS = {"p50_ms": False, "p95_ms": False, "p99_ms": False, "rps": True}
+
+
+def summarize(latencies: list[float], errors: int, seconds: float) -> dict[str, float]:
+    """Reduce per-request latencies (seconds) to the figures stored in results."""
+
+    samples = [latency * 1000 for latency in latencies]
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "p50_ms": statistics.median(samples),
+        "p95_ms": percentile(samples, 0.95),
+        "p99_ms": percentile(samples, 0.99),
+        "rps": len(samples) / seconds if seconds else 0.0,
+    }
+
+
+async def drive(
+    call: Callable[[random.Random], Awaitable[bool]],
+    requests: int,
+    concurrency: int,
+    seed: int = 0,
+) -> dict[str, float]:
+    """Issue ``requests`` calls from ``concurrency`` clients; ``call`` returns success."""
+
+    latencies: list[float] = []
+    errors = 0
+    remaining = requests
+
+    async def client(index: int) -> None:
+        nonlocal errors, remaining
+        rng = random.Random(seed * 1000 + index)
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            ok = await call(rng)
+            latencies.append(time.perf_counter() - started)
+            errors += not ok
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(index) for index in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+def scenarios(server, client, mosid_codes: list[str], noc_codes: list[str], ranks: list[str]) -> dict[str, Callable]:
+    """Map scenario names to one-request callables against ``server``."""
+
+    tools = server.mcp._tool_manager
+
+    # Every request names a rank, MOSID or NOC taken from the loaded data, so
+    # anything but a 200 (a 404 included) counts as an error.
+    async def http_get(path: str) -> bool:
+        response = await client.get(path)
+        return response.status_code == 200
+
+    async def tool(name: str, **arguments) -> bool:
+        try:
+            await tools.call_tool(name, arguments)
+        except Exception:
+            return False
+        return True
+
+    async def batch_lookup(rng: random.Random) -> bool:
+        response = await client.post("/v1/mosids:batchLookup", json={"mosid_codes": rng.sample(mosid_codes, BATCH_SIZE)})
+        return response.status_code == 200
+
+    return {
+        "http:ranks": lambda rng: http_get(f"/v1/ranks/{rng.choice(ranks)}"),
+        "http:mosids": lambda rng: http_get(f"/v1/mosids/{rng.choice(mosid_codes)}"),
+        "http:batchLookup": batch_lookup,
+        "http:nocs": lambda rng: http_get(f"/v1/nocs/{rng.choice(noc_codes)}/mosids"),
+        "mcp:get_rank_data": lambda rng: tool("get_rank_data", rank_name=rng.choice(ranks)),
+        "mcp:get_mosid_data": lambda rng: tool("get_mosid_data", mosid_code=rng.choice(mosid_codes)),
+        "mcp:get_mosid_data_batch": lambda rng: tool(
+            "get_mosid_data_batch", mosid_codes=rng.sample(mosid_codes, BATCH_SIZE)
+        ),
+        "mcp:get_noc_mosids": lambda rng: tool("get_noc_mosids", noc_code=rng.choice(noc_codes)),
+    }
+
+
+async def measure(
+    mnet_path: Path, requests: int, concurrency: int, warmup: int, selected: list[str]
+) -> tuple[dict[str, Any], dict[str, dict]]:
+    """Import the server against ``mnet_path`` (set in the environment) and load it."""
+
+    import httpx
+
+    started = time.perf_counter()
+    from app import mcp_server
+
+    startup_s = time.perf_counter() - started
+    with open(mnet_path, "r") as f:
+        mnet_data = json.load(f)
+    mosid_codes = [label.split(": ", 1)[0] for label in mnet_data]
+    noc_codes = sorted({item["noc_code"] for noc_data in mnet_data.values() for item in noc_data})
+    del mnet_data
+    with open(RANKS_PATH, "r") as f:
+        ranks = [item["rank"] for item in yaml.safe_load(f) or []]
+
+    results = {}
+    transport = httpx.ASGITransport(app=mcp_server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        calls = scenarios(mcp_server, client, mosid_codes, noc_codes, ranks)
+        for name in selected:
+            await drive(calls[name], warmup, concurrency, seed=1)
+            results[name] = await drive(calls[name], requests, concurrency)
+    dataset = {"mosids": len(mosid_codes), "nocs": len(noc_codes), "startup_s": startup_s}
+    return dataset, results
+
+
+def run(args: argparse.Namespace) -> dict:
+    """Build each scaled dataset and measure it in a fresh interpreter."""
+
+    output = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "data_backend": os.environ.get("CAF_RESUME_DATA_BACKEND", "sqlite"),
+        },
+        "datasets": {},
+        "results": {},
+    }
+    source = load_mnet_data()
+    with tempfile.TemporaryDirectory() as workdir:
+        for factor in args.factors:
+            mnet_path = Path(workdir) / f"mnet_data_x{factor}.json"
+            with open(mnet_path, "w") as f:
+                json.dump(scale_mnet_data(source, factor), f)
+            env = {
+                **os.environ,
+                "CAF_RESUME_MNET_DATA": str(mnet_path),
+                "CAF_RESUME_DB_PATH": str(Path(workdir) / f"mnet_x{factor}.db"),
+            }
+            command = [
+                sys.executable, "-m", "benchmarks.api", "_measure", str(mnet_path),
+                "--requests", str(args.requests), "--concurrency", str(args.concurrency),
+                "--warmup", str(args.warmup), "--scenarios", *args.scenarios,
+            ]
+            completed = subprocess.run(command, check=True, capture_output=True, text=True, env=env)
+            measured = json.loads(completed.stdout.strip().splitlines()[-1])
+            key = f"x{factor}"
+            output["datasets"][key] = measured["dataset"]
+            output["results"][key] = measured["results"]
+            print_results(key, measured["results"])
+    return output
+
+
+def print_results(dataset: str, results: dict[str, dict]) -> None:
+    print(f"{dataset}: {'scenario':<26} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>9} {'errors':>6}")
+    for name, row in results.items():
+        print(
+            f"{'':>{len(dataset) + 2}}{name:<26} {row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} "
+            f"{row['p99_ms']:>8.2f} {row['rps']:>9,.0f} {row['errors']:>6}"
+        )
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[dict]:
+    """Return one entry per metric that regressed by more than ``threshold``.
+
+    Latencies regress when they grow and throughput when it shrinks, both
+    relative to the baseline. Scenarios missing from either side are skipped.
+    """
+
+    regressions = []
+    for dataset, scenarios_ in current.get("results", {}).items():
+        for name, row in scenarios_.items():
+            base = baseline.get("results", {}).get(dataset, {}).get(name)
+            if base is None:
+                continue
+            for metric, higher_is_better in COMPARED_METRICS.items():
+                before, after = base[metric], row[metric]
+                if not before:
+                    continue
+                change = (after - before) / before
+                if (-change if higher_is_better else change) > threshold:
+                    regressions.append(
+                        {"dataset": dataset, "scenario": name, "metric": metric, "baseline": before, "current": after, "change": change}
+                    )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Measure every scenario and write JSON results")
+    run_parser.add_argument("--factors", type=int, nargs="+", default=[10, 100], help="Dataset scale factors")
+    run_parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients")
+    run_parser.add_argument("--requests", type=int, default=2000, help="Measured requests per scenario")
+    run_parser.add_argument("--warmup", type=int, default=100, help="Unmeasured requests per scenario")
+    run_parser.add_argument("--scenarios", nargs="+", choices=SCENARIO_NAMES, default=list(SCENARIO_NAMES))
+    run_parser.add_argument("--output", type=Path, help="Write results JSON here")
+
+    compare_parser = commands.add_parser("compare", help="Flag regressions against a saved baseline")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="Tolerated relative change")
+
+    measure_parser = commands.add_parser("_measure")
+    measure_parser.add_argument("mnet_path", type=Path)
+    measure_parser.add_argument("--concurrency", type=int, required=True)
+    measure_parser.add_argument("--requests", type=int, required=True)
+    measure_parser.add_argument("--warmup", type=int, required=True)
+    measure_parser.add_argument("--scenarios", nargs="+", required=True)
+
+    args = parser.parse_args(argv)
+    if args.command == "_measure":
+        dataset, results = asyncio.run(
+            measure(args.mnet_path, args.requests, args.concurrency, args.warmup, args.scenarios)
+        )
+        print(json.dumps({"dataset": dataset, "results": results}))
+        return 0
+    if args.command == "run":
+        output = run(args)
+        if args.output:
+            args.output.write_text(json.dumps(output, indent=2) + "\n")
+            print(f"Wrote {args.output}")
+        return 0
+
+    with open(args.baseline, "r") as f:
+        baseline = json.load(f)
+    with open(args.current, "r") as f:
+        current = json.load(f)
+    regressions = compare(baseline, current, args.threshold)
+    for entry in regressions:
+        print(
+            f"REGRESSION {entry['dataset']} {entry['scenario']} {entry['metric']}: "
+            f"{entry['baseline']:.2f} -> {entry['current']:.2f} ({entry['change']:+.0%})"
+        )
+    if not regressions:
+        print(f"No regressions beyond {args.threshold:.0%}.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
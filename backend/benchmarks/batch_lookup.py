@@ -0,0 +1,68 @@
+"""Compare per-code lookups with the set-based batch engine.
+
+Usage::
+
+    python -m benchmarks.batch_lookup --factor 10 --repeat 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from contextlib import closing
+from pathlib import Path
+
+from app.database import connect_readonly, fetch_mosid_profile, fetch_mosid_profiles
+from benchmarks.datasets import build_scaled_database
+
+BATCH_SIZES = (1, 5, 25, 100, 250, 500, 1000)
+
+
+def _median_ms(samples: list[float]) -> float:
+    return statistics.median(samples) * 1000
+
+
+def run(factor: int, repeat: int) -> list[dict[str, float]]:
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        db_path, codes = build_scaled_database(Path(workdir), factor)
+        rng = random.Random(0)
+        for size in BATCH_SIZES:
+            if size > len(codes):
+                break
+            looped, batched = [], []
+            for _ in range(repeat):
+                batch = rng.sample(codes, size)
+                started = time.perf_counter()
+                for code in batch:
+                    with closing(connect_readonly(db_path)) as conn:
+                        fetch_mosid_profile(conn, code)
+                looped.append(time.perf_counter() - started)
+
+                started = time.perf_counter()
+                with closing(connect_readonly(db_path)) as conn:
+                    fetch_mosid_profiles(conn, batch)
+                batched.append(time.perf_counter() - started)
+            results.append(
+                {"batch_size": size, "per_code_ms": _median_ms(looped), "set_based_ms": _median_ms(batched)}
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--factor", type=int, default=10, help="Dataset scale relative to mnet_data.json")
+    parser.add_argument("--repeat", type=int, default=20, help="Samples per batch size")
+    args = parser.parse_args()
+
+    print(f"{'batch':>6} {'per-code ms':>12} {'set-based ms':>13} {'speedup':>8}")
+    for row in run(args.factor, args.repeat):
+        speedup = row["per_code_ms"] / row["set_based_ms"]
+        print(f"{row['batch_size']:>6} {row['per_code_ms']:>12.2f} {row['set_based_ms']:>13.2f} {speedup:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
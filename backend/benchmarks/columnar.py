@@ -0,0 +1,101 @@
+"""Start-up and scan cost of the crosswalk as JSON versus memory-mapped Arrow.
+
+For each scale factor the real ``mnet_data.json`` is repeated under
+synthetic MOSID codes, written both as JSON and as Arrow tables, and then:
+
+* ``open``: ``json.load`` of the whole document versus memory-mapping the
+  three tables;
+* ``scan``: counting task statements per NOC code, a typical analytical
+  pass, over the parsed document versus over the mapped columns.
+
+Needs pyarrow. Usage::
+
+    python -m benchmarks.columnar --factors 1 10 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+from app.columnar import read_mnet_tables, require_pyarrow, write_mnet_tables
+from benchmarks.datasets import load_mnet_data, scale_mnet_data
+
+
+def json_open(path: Path) -> dict:
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def json_scan(data: dict) -> Counter:
+    counts: Counter = Counter()
+    for noc_data in data.values():
+        for item in noc_data:
+            counts[item["noc_code"]] += len(item["task_statements"])
+    return counts
+
+
+def arrow_scan(tables: dict) -> dict:
+    # Statements are stored once per NOC, so a NOC's total is its statement
+    # count times the number of MOSIDs mapped to it.
+    statements = tables["noc_task_statements"].group_by("noc").aggregate([("position", "count")])
+    mappings = tables["mosid_noc_mappings"].group_by("noc").aggregate([("id", "count")])
+    joined = mappings.join(statements, keys="noc", join_type="inner")
+    return {
+        noc: statement_count * mapping_count
+        for noc, statement_count, mapping_count in zip(
+            joined.column("noc").to_pylist(),
+            joined.column("position_count").to_pylist(),
+            joined.column("id_count").to_pylist(),
+        )
+    }
+
+
+def best_of(fn, repeat: int) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--factors", type=int, nargs="+", default=[1, 10, 100], help="Dataset scale factors")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    require_pyarrow()
+    source = load_mnet_data()
+    print(f"{'factor':>6} {'JSON MB':>8} {'Arrow MB':>9} {'JSON open':>10} {'mmap open':>10} {'JSON scan':>10} {'Arrow scan':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for factor in args.factors:
+            data = scale_mnet_data(source, factor)
+            json_path = Path(tmp) / f"mnet_data_x{factor}.json"
+            with open(json_path, "w") as f:
+                json.dump(data, f, indent=4)
+            arrow_dir = Path(tmp) / f"columnar_x{factor}"
+            write_mnet_tables(data, arrow_dir)
+            del data
+
+            json_open_s, parsed = best_of(lambda: json_open(json_path), args.repeat)
+            arrow_open_s, tables = best_of(lambda: read_mnet_tables(arrow_dir), args.repeat)
+            json_scan_s, expected = best_of(lambda: json_scan(parsed), args.repeat)
+            arrow_scan_s, counts = best_of(lambda: arrow_scan(tables), args.repeat)
+            assert counts == {code: count for code, count in expected.items() if count}
+
+            json_mb = json_path.stat().st_size / 1_000_000
+            arrow_mb = sum(path.stat().st_size for path in arrow_dir.iterdir()) / 1_000_000
+            print(
+                f"{factor:>6} {json_mb:>8.1f} {arrow_mb:>9.1f} {json_open_s * 1000:>8.1f}ms "
+                f"{arrow_open_s * 1000:>8.2f}ms {json_scan_s * 1000:>8.1f}ms {arrow_scan_s * 1000:>9.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
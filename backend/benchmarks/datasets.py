@@ -0,0 +1,47 @@
+"""Synthetic datasets scaled up from the real MNET crosswalk."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+from app.database import RANKS_PATH, build_database
+
+PROCESSED_MNET_PATH = Path(__file__).resolve().parents[2] / "data" / "processed" / "mnet_data.json"
+
+
+def load_mnet_data(path: Path = PROCESSED_MNET_PATH) -> dict[str, Any]:
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def scale_mnet_data(data: dict[str, Any], factor: int) -> dict[str, Any]:
+    """Return ``data`` repeated ``factor`` times under synthetic MOSID codes.
+
+    Copy ``n`` of MOSID ``00005`` becomes ``n00005`` (copy 0 keeps the real
+    code), so lookups against the original codes still succeed.
+    """
+
+    scaled: dict[str, Any] = {}
+    for copy in range(factor):
+        prefix = str(copy) if copy else ""
+        for mosid_string, noc_data in data.items():
+            mosid_code, mosid_title = mosid_string.split(": ", 1)
+            scaled[f"{prefix}{mosid_code}: {mosid_title}"] = noc_data
+    return scaled
+
+
+def build_scaled_database(workdir: Path, factor: int, source: Path = PROCESSED_MNET_PATH) -> tuple[Path, list[str]]:
+    """Build an artifact ``factor`` times the size of ``source`` under ``workdir``.
+
+    Returns the database path and every MOSID code it contains.
+    """
+
+    data = scale_mnet_data(load_mnet_data(source), factor)
+    mnet_path = workdir / f"mnet_data_x{factor}.json"
+    with open(mnet_path, "w") as f:
+        json.dump(data, f)
+    db_path = workdir / f"mnet_x{factor}.db"
+    build_database(db_path, mnet_path, RANKS_PATH)
+    return db_path, [mosid_string.split(": ", 1)[0] for mosid_string in data]
@@ -0,0 +1,143 @@
+"""Per-worker memory and lookup latency of the sqlite, snapshot and image backends.
+
+A scaled artifact and its binary image are built once. For each backend
+and worker count, that many interpreters start together, as uvicorn
+workers would. Each one opens the backend, looks up every MOSID so all of
+its data is resident, and reports how much its proportional set size
+(PSS) and unique set size (USS) grew. The workers stay alive until every
+one has loaded before measuring, so pages mapped by several processes are
+split between them in PSS. The first worker also times single-MOSID lookups.
+
+Linux only, as the figures come from ``/proc/self/smaps_rollup``. Usage::
+
+    python -m benchmarks.image --factor 100 --workers 1 2 4 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from app.database import connect_readonly, fetch_mosid_profile
+from app.image import ImageStore, build_image
+from app.snapshot import SnapshotStore
+from benchmarks.datasets import build_scaled_database
+from benchmarks.stats import percentile
+
+BACKENDS = ("sqlite", "snapshot", "image")
+
+
+def memory_kb() -> dict[str, int]:
+    """Return PSS and USS (private clean + private dirty) in kB."""
+
+    fields = {}
+    with open("/proc/self/smaps_rollup", "r") as f:
+        for line in f:
+            name, _, value = line.partition(":")
+            if value.strip().endswith("kB"):
+                fields[name] = int(value.split()[0])
+    return {"pss": fields["Pss"], "uss": fields["Private_Clean"] + fields["Private_Dirty"]}
+
+
+def worker(backend: str, db_path: Path, image_path: Path, codes: list[str], timed: bool) -> None:
+    """Load ``backend``, report readiness, then report memory once released."""
+
+    before = memory_kb()
+    if backend == "sqlite":
+        conn = connect_readonly(db_path)
+        lookup = lambda code: fetch_mosid_profile(conn, code)  # noqa: E731
+    else:
+        store = SnapshotStore(db_path) if backend == "snapshot" else ImageStore(image_path)
+        lookup = lambda code: store.current().mosid(code)  # noqa: E731
+    for code in codes:
+        lookup(code)
+    result = {}
+    if timed:
+        samples = []
+        for code in codes[:5000]:
+            started = time.perf_counter()
+            lookup(code)
+            samples.append((time.perf_counter() - started) * 1_000_000)
+        result["p50_us"] = statistics.median(samples)
+        result["p99_us"] = percentile(samples, 0.99)
+    print("ready", flush=True)
+    # Measure only after every worker has loaded, so shared pages are split.
+    sys.stdin.readline()
+    after = memory_kb()
+    result.update(pss_kb=after["pss"] - before["pss"], uss_kb=after["uss"] - before["uss"])
+    print(json.dumps(result), flush=True)
+
+
+def run_workers(backend: str, count: int, db_path: Path, image_path: Path, codes_path: Path) -> list[dict]:
+    processes = [
+        subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.image", "_worker", backend, str(db_path), str(image_path), str(codes_path)]
+            + (["--timed"] if index == 0 else []),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        for index in range(count)
+    ]
+    for process in processes:
+        process.stdout.readline()
+    results = []
+    for process in processes:
+        process.stdin.write("measure\n")
+        process.stdin.flush()
+    for process in processes:
+        results.append(json.loads(process.stdout.readline()))
+        process.stdin.close()
+        process.wait()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command")
+    worker_parser = commands.add_parser("_worker")
+    worker_parser.add_argument("backend", choices=BACKENDS)
+    worker_parser.add_argument("db_path", type=Path)
+    worker_parser.add_argument("image_path", type=Path)
+    worker_parser.add_argument("codes_path", type=Path)
+    worker_parser.add_argument("--timed", action="store_true")
+    parser.add_argument("--factor", type=int, default=100, help="Dataset scale factor")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="Worker counts")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    args = parser.parse_args()
+
+    if args.command == "_worker":
+        worker(args.backend, args.db_path, args.image_path, json.loads(args.codes_path.read_text()), args.timed)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        db_path, codes = build_scaled_database(workdir, args.factor)
+        image_path = workdir / "mnet.img"
+        build_image(db_path, image_path)
+        codes_path = workdir / "codes.json"
+        codes_path.write_text(json.dumps(codes))
+        print(
+            f"x{args.factor}: {len(codes):,} MOSIDs, database {db_path.stat().st_size / 1e6:.1f} MB, "
+            f"image {image_path.stat().st_size / 1e6:.1f} MB"
+        )
+        print(f"{'backend':<9} {'workers':>7} {'PSS MB/worker':>14} {'USS MB/worker':>14} {'p50 us':>8} {'p99 us':>8}")
+        for backend in args.backends:
+            for count in args.workers:
+                results = run_workers(backend, count, db_path, image_path, codes_path)
+                pss = statistics.mean(result["pss_kb"] for result in results) / 1024
+                uss = statistics.mean(result["uss_kb"] for result in results) / 1024
+                print(
+                    f"{backend:<9} {count:>7} {pss:>14.1f} {uss:>14.1f} "
+                    f"{results[0]['p50_us']:>8.1f} {results[0]['p99_us']:>8.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
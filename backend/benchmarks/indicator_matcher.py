@@ -0,0 +1,77 @@
+"""Throughput of the compiled indicator matcher on synthetic MPRR extracts.
+
+Compares the single-pass matcher against scanning the text once per keyword
+with the same word-boundary and whitespace rules.
+
+Usage::
+
+    python -m benchmarks.indicator_matcher --megabytes 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import time
+
+from app.indicators import IndicatorMatcher, trie_pattern
+
+FILLER = (
+    "posted to", "duties included", "supervised", "the unit", "during exercise",
+    "annual review", "qualified on", "deployed with", "responsible for", "garrison",
+    "maintained", "personnel", "operations", "course", "completed", "section",
+)
+
+
+def synthetic_extract(matcher: IndicatorMatcher, size_bytes: int, seed: int = 0) -> str:
+    """Generate MPRR-like text with roughly one catalogued keyword per line."""
+
+    rng = random.Random(seed)
+    keywords = [source.keyword for source in matcher.sources]
+    lines, size = [], 0
+    while size < size_bytes:
+        words = rng.choices(FILLER, k=rng.randint(6, 14))
+        words.insert(rng.randrange(len(words)), rng.choice(keywords).upper() if rng.random() < 0.2 else rng.choice(keywords))
+        line = " ".join(words) + "."
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+
+def per_keyword_patterns(matcher: IndicatorMatcher) -> list[re.Pattern]:
+    return [
+        re.compile(rf"(?<!\w){trie_pattern([keyword])}(?!\w)", re.IGNORECASE)
+        for keyword in matcher.keywords
+    ]
+
+
+def naive_scan(patterns: list[re.Pattern], text: str) -> int:
+    return sum(1 for pattern in patterns for _ in pattern.finditer(text))
+
+
+def throughput(fn, text: str, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(text)
+    elapsed = time.perf_counter() - started
+    return len(text.encode()) * repeat / elapsed / 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--megabytes", type=float, default=4.0, help="Size of the synthetic extract")
+    parser.add_argument("--repeat", type=int, default=3, help="Scans per measurement")
+    args = parser.parse_args()
+
+    matcher = IndicatorMatcher.from_path()
+    text = synthetic_extract(matcher, int(args.megabytes * 1_000_000))
+    hits = len(matcher.scan(text))
+    print(f"extract: {len(text.encode()) / 1_000_000:.1f} MB, {hits:,} hits, {len(matcher.keywords)} keywords")
+    print(f"compiled matcher: {throughput(matcher.scan, text, args.repeat):8.1f} MB/s")
+    patterns = per_keyword_patterns(matcher)
+    print(f"per-keyword loop: {throughput(lambda t: naive_scan(patterns, t), text, args.repeat):8.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Throughput and peak memory of the MOSID↔NOC ingest on generated tables.
+
+Generates ``--rows`` raw rows spread over ``--files`` CSV/TSV tables (about
+one row in ten repeats an earlier key, as overlapping bulletins do), then
+runs each ingest mode in a fresh interpreter so peak RSS is measured per
+mode.
+
+Usage::
+
+    python -m benchmarks.ingest --rows 1000000 --files 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / "scripts"
+MODES = ("in-memory", "streaming")
+
+HEADER = ("MOSID", "CAF Trade Title", "NOC 2021", "Civilian Occupation Title", "Role Description")
+
+
+def generate_raw_tables(raw_dir: Path, rows: int, files: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    per_file = -(-rows // files)
+    written = 0
+    for index in range(files):
+        delimiter = "\t" if index % 2 else ","
+        path = raw_dir / f"bulletin_{index:03d}_2024{index % 12 + 1:02d}01.{'tsv' if index % 2 else 'csv'}"
+        with path.open("w", encoding="utf-8") as handle:
+            handle.write(delimiter.join(HEADER) + "\n")
+            for _ in range(min(per_file, rows - written)):
+                key = rng.randrange(written) if written and rng.random() < 0.1 else written
+                handle.write(
+                    delimiter.join(
+                        (
+                            f"{key % 100_000:05d}",
+                            f"Trade {key % 100_000}",
+                            f"{key // 100_000:05d}",
+                            f"Civilian occupation {key % 977}",
+                            f"Role description for mapping {key}",
+                        )
+                    )
+                    + "\n"
+                )
+                written += 1
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is reported in KiB on Linux.
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(own, children) / 1024
+
+
+def run_mode(mode: str, raw_dir: Path, output_dir: Path, workers: int | None) -> dict:
+    """Run one ingest mode in this process and report its figures."""
+
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    import ingest_mosid_noc
+
+    started = time.perf_counter()
+    if mode == "streaming":
+        report = ingest_mosid_noc.ingest_streaming(raw_dir, output_dir, workers=workers)
+        rows, records = report.rows_parsed, report.records_written
+    else:
+        normalized = ingest_mosid_noc.ingest(raw_dir, output_dir)
+        rows, records = None, len(normalized)
+    seconds = time.perf_counter() - started
+    return {"mode": mode, "records": records, "rows": rows, "seconds": seconds, "peak_rss_mb": peak_rss_mb()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Raw rows to generate")
+    parser.add_argument("--files", type=int, default=8, help="Raw tables to spread them over")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes for streaming mode")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES), help="Modes to compare")
+    parser.add_argument("--run-mode", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--raw-dir", type=Path, help=argparse.SUPPRESS)
+    parser.add_argument("--output-dir", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_mode:
+        print(json.dumps(run_mode(args.run_mode, args.raw_dir, args.output_dir, args.workers)))
+        return
+
+    with tempfile.TemporaryDirectory() as workdir:
+        raw_dir = Path(workdir) / "raw"
+        raw_dir.mkdir()
+        generate_raw_tables(raw_dir, args.rows, args.files)
+        print(f"{args.rows:,} rows in {args.files} tables")
+        print(f"{'mode':<10} {'records':>10} {'seconds':>8} {'rows/s':>10} {'peak RSS MB':>12}")
+        for mode in args.modes:
+            command = [
+                sys.executable, "-m", "benchmarks.ingest", "--run-mode", mode,
+                "--raw-dir", str(raw_dir), "--output-dir", str(Path(workdir) / mode),
+            ]
+            if args.workers is not None:
+                command += ["--workers", str(args.workers)]
+            result = json.loads(subprocess.run(command, check=True, capture_output=True, text=True).stdout)
+            print(
+                f"{mode:<10} {result['records']:>10,} {result['seconds']:>8.2f} "
+                f"{args.rows / result['seconds']:>10,.0f} {result['peak_rss_mb']:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
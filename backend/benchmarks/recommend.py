@@ -0,0 +1,65 @@
+"""Build time and lookup latency of the similar-trade and NOC recommendation index.
+
+The index is built from an artifact holding ``data/processed/mnet_data.json``
+(scaled by ``--factors``) with each available backend. Lookups are timed on
+the built index: precomputed MOSID neighbours and NOC picks, and free-text
+NOC recommendations for task statements drawn from the crosswalk.
+
+Usage::
+
+    python -m benchmarks.recommend --factors 1 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from contextlib import closing
+from pathlib import Path
+
+from app.database import connect_readonly
+from app.recommend import load_recommender, scipy_available
+from benchmarks.datasets import build_scaled_database, load_mnet_data
+from benchmarks.schema import time_calls
+
+QUERIES = 500
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--factors", type=int, nargs="+", default=[1], help="Dataset scale factors")
+    args = parser.parse_args()
+
+    backends = ["scipy", "python"] if scipy_available() else ["python"]
+    rng = random.Random(0)
+    statements = sorted(
+        {statement for noc_data in load_mnet_data().values() for item in noc_data for statement in item["task_statements"]}
+    )
+    texts = rng.sample(statements, min(QUERIES, len(statements)))
+    print(
+        f"{'factor':>6} {'backend':>7} {'MOSIDs':>7} {'NOCs':>5} {'terms':>6} {'build s':>8} "
+        f"{'similar p50 us':>15} {'for MOSID p50 us':>17} {'text p50 us':>12} {'text p99 us':>12}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for factor in args.factors:
+            db_path, codes = build_scaled_database(Path(tmp), factor)
+            sample = rng.sample(codes, min(QUERIES, len(codes)))
+            for backend in backends:
+                with closing(connect_readonly(db_path)) as conn:
+                    started = time.perf_counter()
+                    index = load_recommender(conn, backend=backend)
+                    build_s = time.perf_counter() - started
+                similar_p50, _ = time_calls(index.similar_mosids, sample)
+                mosid_p50, _ = time_calls(index.recommend_for_mosid, sample)
+                text_p50, text_p99 = time_calls(index.recommend_for_text, texts)
+                print(
+                    f"{factor:>6} {backend:>7} {len(index.mosids):>7} {len(index.nocs):>5} "
+                    f"{len(index.vectorizer.vocabulary):>6} {build_s:>8.2f} {similar_p50:>15.1f} "
+                    f"{mosid_p50:>17.1f} {text_p50:>12.1f} {text_p99:>12.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
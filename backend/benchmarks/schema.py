@@ -0,0 +1,96 @@
+"""Size, page-cache footprint and lookup latency of the SQLite artifact.
+
+The artifact is built from ``data/processed/mnet_data.json`` (scaled by
+``--factors``) and then measured in three ways:
+
+* file size, and how much of it is the full-text index;
+* lookup working set: the pages of the relational tables and their indexes,
+  including SQLite's automatic ``sqlite_autoindex_*`` indexes (everything
+  but the full-text index, the build metadata and the ``sqlite_schema`` /
+  ``sqlite_sequence`` bookkeeping), which is what the page cache has to hold
+  to serve every MOSID without disk reads;
+* single-MOSID and 25-code batch lookup latency on a warm connection.
+
+The 1x row is the real crosswalk and is the headline figure. Larger factors
+repeat every MOSID under synthetic codes without adding NOCs, so they
+exaggerate how well the normalized tables share NOC data.
+
+Usage::
+
+    python -m benchmarks.schema --factors 1 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from contextlib import closing
+from pathlib import Path
+
+from app.database import connect_readonly, fetch_mosid_profile, fetch_mosid_profiles
+from benchmarks.datasets import build_scaled_database
+from benchmarks.stats import percentile
+
+BATCH_SIZE = 25
+
+# B-trees that are not part of the lookup working set. ``sqlite_autoindex_*``
+# indexes back UNIQUE and PRIMARY KEY constraints and are counted.
+OVERHEAD_BTREES = frozenset({"sqlite_schema", "sqlite_sequence", "build_info", "sqlite_autoindex_build_info_1"})
+
+
+def btree_pages(db_path: Path) -> dict[str, int]:
+    """Bytes per b-tree from the ``dbstat`` virtual table."""
+
+    with closing(sqlite3.connect(db_path)) as conn:
+        return dict(conn.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name"))
+
+
+def time_calls(fn, arguments: list, repeat: int = 3) -> tuple[float, float]:
+    """p50 and p99 in microseconds over ``repeat`` passes of ``arguments``."""
+
+    samples = []
+    for _ in range(repeat):
+        for argument in arguments:
+            started = time.perf_counter()
+            fn(argument)
+            samples.append((time.perf_counter() - started) * 1_000_000)
+    return statistics.median(samples), percentile(samples, 0.99)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--factors", type=int, nargs="+", default=[1, 10], help="Dataset scale factors")
+    args = parser.parse_args()
+
+    print(
+        f"{'factor':>6} {'file MB':>8} {'FTS MB':>7} {'working set MB':>15} "
+        f"{'get p50 us':>11} {'get p99 us':>11} {'batch p50 us':>13}"
+    )
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        for factor in args.factors:
+            db_path, codes = build_scaled_database(Path(tmp), factor)
+            pages = btree_pages(db_path)
+            fts = sum(size for name, size in pages.items() if name.startswith("search_index"))
+            relational = sum(
+                size for name, size in pages.items()
+                if not name.startswith("search_index") and name not in OVERHEAD_BTREES
+            )
+            batches = [rng.sample(codes, min(BATCH_SIZE, len(codes))) for _ in range(200)]
+            with closing(connect_readonly(db_path)) as conn:
+                for code in codes:
+                    fetch_mosid_profile(conn, code)
+                get_p50, get_p99 = time_calls(lambda code: fetch_mosid_profile(conn, code), codes[:2000])
+                batch_p50, _ = time_calls(lambda batch: fetch_mosid_profiles(conn, batch), batches)
+            print(
+                f"{factor:>6} {db_path.stat().st_size / 1e6:>8.2f} {fts / 1e6:>7.2f} "
+                f"{relational / 1e6:>15.2f} {get_p50:>11.1f} {get_p99:>11.1f} {batch_p50:>13.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Latency of FTS5 search against the full processed crosswalk.
+
+Usage::
+
+    python -m benchmarks.search --repeat 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from contextlib import closing
+from pathlib import Path
+
+from app.database import RANKS_PATH, build_database, connect_readonly
+from app.search import search
+from benchmarks.datasets import PROCESSED_MNET_PATH
+from benchmarks.stats import percentile
+
+QUERIES = (
+    "air traffic",
+    "network security",
+    "data entry",
+    "supervise maintenance",
+    "emergency medical care",
+    "logistics",
+    "inventory control",
+    "train personnel",
+)
+
+
+def run(repeat: int, limit: int) -> dict[str, dict[str, float]]:
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        db_path = Path(workdir) / "mnet.db"
+        build_database(db_path, PROCESSED_MNET_PATH, RANKS_PATH)
+        with closing(connect_readonly(db_path)) as conn:
+            for query in QUERIES:
+                samples = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    page = search(conn, query, limit=limit)
+                    samples.append((time.perf_counter() - started) * 1000)
+                results[query] = {
+                    "hits": len(page["results"]),
+                    "p50_ms": statistics.median(samples),
+                    "p99_ms": percentile(samples, 0.99),
+                }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200, help="Samples per query")
+    parser.add_argument("--limit", type=int, default=10, help="Page size")
+    args = parser.parse_args()
+
+    print(f"{'query':<24} {'hits':>5} {'p50 ms':>8} {'p99 ms':>8}")
+    for query, row in run(args.repeat, args.limit).items():
+        print(f"{query:<24} {row['hits']:>5} {row['p50_ms']:>8.3f} {row['p99_ms']:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
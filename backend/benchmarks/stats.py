@@ -0,0 +1,10 @@
+"""Summary statistics shared by the benchmarks."""
+
+from __future__ import annotations
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """Nearest-rank ``fraction`` percentile of ``samples`` (e.g. 0.99 for p99)."""
+
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
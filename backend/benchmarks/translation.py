@@ -0,0 +1,74 @@
+"""Latency of batch résumé bullet translation.
+
+Each batch mixes entries that name their indicators with entries whose free
+text is scanned for them first, and a share of entries override template
+placeholders so both the cached default renderings and the slow path count.
+
+Usage::
+
+    python -m benchmarks.translation --entries 1000 5000 --repeat 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+
+from app.indicators import IndicatorMatcher
+from app.translation import TranslationEngine
+from benchmarks.stats import percentile
+
+FILLER = "Posted to the unit for the annual training cycle and deployed on exercise."
+
+
+def synthetic_entries(matcher: IndicatorMatcher, count: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    sources = list(matcher.sources)
+    entries = []
+    for position in range(count):
+        picked = rng.sample(sources, k=rng.randint(1, 3))
+        entry: dict = {"id": f"entry-{position}"}
+        if position % 2:
+            entry["text"] = " ".join([FILLER, *(f"{source.keyword}." for source in picked)])
+        else:
+            entry["indicators"] = [source.indicator for source in picked]
+        if position % 10 == 0:
+            entry["values"] = {"team_size": rng.randint(4, 120)}
+        entries.append(entry)
+    return entries
+
+
+def run(sizes: list[int], repeat: int) -> dict[int, dict[str, float]]:
+    matcher = IndicatorMatcher.from_path()
+    engine = TranslationEngine.from_path()
+    results = {}
+    for size in sizes:
+        entries = synthetic_entries(matcher, size)
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            response = engine.translate(entries, matcher)
+            samples.append((time.perf_counter() - started) * 1000)
+        results[size] = {
+            "bullets": sum(len(result["bullets"]) for result in response["results"]),
+            "p50_ms": statistics.median(samples),
+            "p99_ms": percentile(samples, 0.99),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, nargs="+", default=[100, 1000, 5000], help="Batch sizes")
+    parser.add_argument("--repeat", type=int, default=50, help="Samples per batch size")
+    args = parser.parse_args()
+
+    print(f"{'entries':>8} {'bullets':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for size, row in run(args.entries, args.repeat).items():
+        print(f"{size:>8} {row['bullets']:>8} {row['p50_ms']:>8.3f} {row['p99_ms']:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,36 @@
 PRAGMA foreign_keys = ON;
 
+CREATE TABLE IF NOT EXISTS build_info (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+-- ``mosids`` keeps its rowid: the profile queries order on it after the
+-- code, which SQLite cannot do without a sort for a WITHOUT ROWID table.
 CREATE TABLE IF NOT EXISTS mosids (
     mosid TEXT PRIMARY KEY,
     title TEXT
 );
 
+-- Tables only reached by key equality are WITHOUT ROWID, so each row lives
+-- in its primary key b-tree. ``title`` is the civilian title first seen for
+-- the NOC.
 CREATE TABLE IF NOT EXISTS nocs (
     noc TEXT PRIMARY KEY,
     title TEXT
-);
+) WITHOUT ROWID;
 
+-- Task statements describe the NOC, so each is stored once no matter how
+-- many MOSIDs map to it. ``position`` keeps the source order.
+CREATE TABLE IF NOT EXISTS noc_task_statements (
+    noc TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    statement TEXT NOT NULL,
+    PRIMARY KEY (noc, position),
+    FOREIGN KEY (noc) REFERENCES nocs (noc) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+-- ``id`` follows the source order of each MOSID's equivalencies.
 CREATE TABLE IF NOT EXISTS mosid_noc_mappings (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     mosid TEXT NOT NULL,
@@ -19,6 +40,7 @@ CREATE TABLE IF NOT EXISTS mosid_noc_mappings (
     FOREIGN KEY (noc) REFERENCES nocs (noc) ON DELETE CASCADE
 );
 
+-- Civilian title of a mapping, stored only when it differs from the NOC's.
 CREATE TABLE IF NOT EXISTS mosid_noc_titles (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     mapping_id INTEGER NOT NULL,
@@ -42,3 +64,28 @@ CREATE TABLE IF NOT EXISTS mosid_noc_employment_contexts (
     UNIQUE (mapping_id, context),
     FOREIGN KEY (mapping_id) REFERENCES mosid_noc_mappings (id) ON DELETE CASCADE
 );
+
+CREATE TABLE IF NOT EXISTS ranks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    rank_name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS rank_responsibilities (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    responsibility TEXT NOT NULL,
+    rank_id INTEGER NOT NULL,
+    FOREIGN KEY (rank_id) REFERENCES ranks (id)
+);
+
+-- Full-text index over MOSID titles, civilian titles, task statements and
+-- rank responsibilities. ``kind`` says which of those a row came from. Task
+-- rows stay per mapping so every hit names the MOSID it belongs to.
+CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5 (
+    kind UNINDEXED,
+    mosid_code UNINDEXED,
+    noc_code UNINDEXED,
+    rank_name UNINDEXED,
+    title,
+    body,
+    tokenize = 'porter unicode61'
+);
@@ -0,0 +1,73 @@
+"""Build the read-only SQLite artifact served by ``app.service``.
+
+Run this once per data refresh (for example in the container image build) so
+that server processes can open the prebuilt database instead of seeding it on
+import.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.columnar import write_mnet_tables  # noqa: E402
+from app.database import (  # noqa: E402
+    DEFAULT_DB_PATH,
+    MNET_DATA_PATH,
+    RANKS_PATH,
+    build_database,
+    read_build_info,
+    source_hash,
+)
+from app.image import ensure_image, image_path_for  # noqa: E402
+from app.loader import load_sources  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the CAF Resume Helper SQLite artifact.")
+    parser.add_argument("--db-path", type=Path, default=DEFAULT_DB_PATH, help="Output database file")
+    parser.add_argument("--mnet-data", type=Path, default=MNET_DATA_PATH, help="MNET crosswalk JSON")
+    parser.add_argument("--ranks", type=Path, default=RANKS_PATH, help="Rank responsibilities YAML")
+    parser.add_argument(
+        "--arrow-dir",
+        type=Path,
+        help="Also write the crosswalk as memory-mappable Arrow tables here (needs pyarrow)",
+    )
+    parser.add_argument(
+        "--image",
+        type=Path,
+        nargs="?",
+        const=True,
+        help="Also write the memory-mapped binary image (default: next to the database)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild even if the stored source hash is current",
+    )
+    args = parser.parse_args()
+
+    if args.arrow_dir:
+        mnet_data, _ = load_sources(args.mnet_data, args.ranks)
+        counts = write_mnet_tables(mnet_data, args.arrow_dir)
+        print(f"Wrote {sum(counts.values()):,} rows to {args.arrow_dir}.")
+
+    expected = source_hash(args.mnet_data, args.ranks)
+    if not args.force and read_build_info(args.db_path).get("source_hash") == expected:
+        print(f"{args.db_path} is up to date ({expected[:12]}).")
+    else:
+        digest, stats = build_database(args.db_path, args.mnet_data, args.ranks)
+        print(stats.summary())
+        print(f"Built {args.db_path} ({digest[:12]}).")
+
+    if args.image:
+        image_path = image_path_for(args.db_path) if args.image is True else args.image
+        ensure_image(args.db_path, image_path)
+        print(f"Wrote {image_path} ({image_path.stat().st_size:,} bytes).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Generate résumés for a cohort of member records.
+
+Reads anonymized MPRR extracts as JSONL (one member per line) and writes one
+résumé object per line, following ``docs/target_resume_schema.yaml``.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.database import DEFAULT_DB_PATH, MNET_DATA_PATH, RANKS_PATH, ensure_database  # noqa: E402
+from app.resume_pipeline import JobProgress, run_batch  # noqa: E402
+
+
+def print_progress(state: JobProgress) -> None:
+    print(
+        f"\r{state.records_done:,}/{state.records_read:,} records "
+        f"({state.records_failed:,} failed, {state.records_per_second:,.0f}/s)",
+        end="",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate résumés for a JSONL cohort of member records.")
+    parser.add_argument("input", type=Path, help="JSONL file of member records")
+    parser.add_argument("output", type=Path, help="JSONL file to write résumés to")
+    parser.add_argument("--db-path", type=Path, default=DEFAULT_DB_PATH, help="SQLite artifact to read")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (0 runs in-process)")
+    parser.add_argument("--chunk-size", type=int, default=25, help="Records per worker task")
+    parser.add_argument("--max-in-flight", type=int, default=None, help="Chunks outstanding at once")
+    args = parser.parse_args()
+
+    ensure_database(args.db_path, MNET_DATA_PATH, RANKS_PATH)
+    state = run_batch(
+        args.input,
+        args.output,
+        args.db_path,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        max_in_flight=args.max_in_flight,
+        progress=print_progress,
+    )
+    print(file=sys.stderr)
+    print(state.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -3,17 +3,39 @@
 This loader ingests raw tables placed under ``data/raw`` and outputs
 normalized CSV and JSON files in ``data/processed`` for downstream
 pipelines.
+
+With ``--incremental`` a manifest of per-file content hashes is kept next to
+the outputs. Unchanged files are skipped, only records from changed files
+are merged into the existing outputs, and records whose content did not
+change keep their original ``transcription_date``. The outputs are only
+rewritten when a record actually changed.
+
+``--arrow`` also writes ``mosid_noc.arrow``, an Arrow IPC copy that
+analytics code can memory-map with ``app.columnar.read_table`` (needs
+pyarrow).
 """
 from __future__ import annotations
 
 import argparse
 import csv
+import hashlib
+import heapq
+import itertools
 import json
-from dataclasses import dataclass, asdict
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 from typing import Iterable, Iterator, Mapping
 
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
 # Canonical field names and the set of column headers that map to each
 FIELD_ALIASES: Mapping[str, tuple[str, ...]] = {
     "mosid": ("mosid", "mos id", "mosid code"),
@@ -27,6 +49,10 @@ FIELD_ALIASES: Mapping[str, tuple[str, ...]] = {
     "role_description": ("role description", "summary"),
 }
 
+MANIFEST_NAME = "mosid_noc.manifest.json"
+ARROW_NAME = "mosid_noc.arrow"
+MANIFEST_VERSION = 1
+
 OUTPUT_FIELDS: tuple[str, ...] = (
     "mosid",
     "caf_title",
@@ -39,7 +65,7 @@ OUTPUT_FIELDS: tuple[str, ...] = (
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class MosidNocRecord:
     """Normalized representation of a MOSID↔NOC mapping."""
 
@@ -55,6 +81,18 @@ class MosidNocRecord:
     def to_row(self) -> dict[str, str | None]:
         return {field: getattr(self, field) for field in OUTPUT_FIELDS}
 
+    @property
+    def key(self) -> tuple[str, str]:
+        return (self.mosid, self.noc_code)
+
+    def same_content(self, other: "MosidNocRecord") -> bool:
+        """Compare every field except ``transcription_date``."""
+        return all(
+            getattr(self, name) == getattr(other, name)
+            for name in OUTPUT_FIELDS
+            if name != "transcription_date"
+        )
+
 
 def extract_value(row: Mapping[str, str], aliases: Iterable[str]) -> str | None:
     for alias in aliases:
@@ -74,20 +112,39 @@ def sanitize_noc_code(raw: str | None) -> str:
     return cleaned or raw.strip()
 
 
+def ingest_order(rel: str) -> PurePosixPath:
+    """Sort key for a raw file's relative path; later files win duplicate keys.
+
+    Paths compare part by part, so ``a/x.csv`` sorts before ``a-b.csv`` even
+    though the plain strings sort the other way.
+    """
+    return PurePosixPath(rel)
+
+
+def raw_files(raw_path: Path) -> list[Path]:
+    return sorted(
+        (file_path for file_path in raw_path.glob("**/*") if file_path.suffix.lower() in {".csv", ".tsv"}),
+        key=lambda file_path: ingest_order(file_path.relative_to(raw_path).as_posix()),
+    )
+
+
+def iter_file_rows(file_path: Path) -> Iterator[dict[str, str]]:
+    with file_path.open(newline="", encoding="utf-8-sig") as handle:
+        sample = handle.read(2048)
+        handle.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",\t;")
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.DictReader(handle, dialect=dialect)
+        for row in reader:
+            yield normalize_headers(row)
+
+
 def iter_raw_rows(raw_path: Path) -> Iterator[tuple[str, dict[str, str]]]:
-    for file_path in sorted(raw_path.glob("**/*")):
-        if file_path.suffix.lower() not in {".csv", ".tsv"}:
-            continue
-        with file_path.open(newline="", encoding="utf-8-sig") as handle:
-            sample = handle.read(2048)
-            handle.seek(0)
-            try:
-                dialect = csv.Sniffer().sniff(sample, delimiters=",\t;")
-            except csv.Error:
-                dialect = csv.excel
-            reader = csv.DictReader(handle, dialect=dialect)
-            for row in reader:
-                yield (file_path.name, normalize_headers(row))
+    for file_path in raw_files(raw_path):
+        for row in iter_file_rows(file_path):
+            yield (file_path.name, row)
 
 
 def derive_metadata(filename: str) -> tuple[str | None, str | None]:
@@ -105,7 +162,12 @@ def derive_metadata(filename: str) -> tuple[str | None, str | None]:
     return publication, transcription
 
 
-def build_record(filename: str, row: Mapping[str, str]) -> MosidNocRecord | None:
+def build_record(
+    filename: str,
+    row: Mapping[str, str],
+    metadata: tuple[str | None, str | None] | None = None,
+) -> MosidNocRecord | None:
+    """Map one raw row to a record; pass ``metadata`` to reuse a per-file lookup."""
     values = {}
     for field, aliases in FIELD_ALIASES.items():
         value = extract_value(row, aliases)
@@ -120,7 +182,7 @@ def build_record(filename: str, row: Mapping[str, str]) -> MosidNocRecord | None
     caf_title = values.get("caf_title", "").strip()
     civilian_title = values.get("civilian_title", "").strip()
     role_description = values.get("role_description", "").strip()
-    publication, transcription = derive_metadata(filename)
+    publication, transcription = metadata or derive_metadata(filename)
     return MosidNocRecord(
         mosid=mosid,
         caf_title=caf_title,
@@ -149,25 +211,345 @@ def write_csv(records: Iterable[MosidNocRecord], path: Path) -> None:
             writer.writerow(record.to_row())
 
 
+class JsonArrayWriter:
+    """Writes records as an indented JSON array, one record at a time.
+
+    The bytes match ``json.dump(list, indent=2)`` without holding the list.
+    """
+
+    def __init__(self, handle):
+        self.handle = handle
+        self.count = 0
+
+    _encode = json.JSONEncoder(ensure_ascii=False).encode
+    _prefixes = tuple(f"    {json.dumps(name)}: " for name in OUTPUT_FIELDS)
+
+    def write(self, record: MosidNocRecord) -> None:
+        # Values are encoded one at a time with the C encoder; ``indent``
+        # would force the much slower pure-Python path.
+        encode = self._encode
+        body = ",\n".join(
+            prefix + encode(getattr(record, name)) for prefix, name in zip(self._prefixes, OUTPUT_FIELDS)
+        )
+        self.handle.write(("[\n  {\n" if not self.count else ",\n  {\n") + body + "\n  }")
+        self.count += 1
+
+    def close(self) -> None:
+        self.handle.write("\n]\n" if self.count else "[]\n")
+
+
 def write_json(records: Iterable[MosidNocRecord], path: Path) -> None:
-    serializable = [asdict(record) for record in records]
     with path.open("w", encoding="utf-8") as handle:
-        json.dump(serializable, handle, indent=2, ensure_ascii=False)
+        writer = JsonArrayWriter(handle)
+        for record in records:
+            writer.write(record)
+        writer.close()
+
+
+def arrow_writer(path: Path):
+    """Batched Arrow writer for ``mosid_noc.arrow``; needs pyarrow."""
+    from app.columnar import TableWriter
+
+    return TableWriter(path, tuple((name, "string") for name in OUTPUT_FIELDS))
+
+
+def write_arrow(records: Iterable[MosidNocRecord], path: Path) -> None:
+    with arrow_writer(path) as writer:
+        for record in records:
+            writer.write(tuple(record.to_row().values()))
+
+
+def write_outputs(
+    records: Iterable[MosidNocRecord],
+    csv_path: Path,
+    json_path: Path,
+    arrow_path: Path | None = None,
+) -> int:
+    """Stream ``records`` into every output format in one pass."""
+    with csv_path.open("w", newline="", encoding="utf-8") as csv_handle, json_path.open(
+        "w", encoding="utf-8"
+    ) as json_handle, (arrow_writer(arrow_path) if arrow_path else nullcontext()) as arrow_table:
+        csv_writer = csv.DictWriter(csv_handle, fieldnames=OUTPUT_FIELDS)
+        csv_writer.writeheader()
+        json_writer = JsonArrayWriter(json_handle)
+        for record in records:
+            row = record.to_row()
+            csv_writer.writerow(row)
+            json_writer.write(record)
+            if arrow_table is not None:
+                arrow_table.write(tuple(row.values()))
+        json_writer.close()
+    return json_writer.count
+
+
+def read_json_records(path: Path) -> list[MosidNocRecord]:
+    try:
+        with path.open(encoding="utf-8") as handle:
+            return [MosidNocRecord(**item) for item in json.load(handle)]
+    except FileNotFoundError:
+        return []
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def parse_file(file_path: Path) -> list[MosidNocRecord]:
+    """Records of one raw table; a later row for the same key wins."""
+    metadata = derive_metadata(file_path.name)
+    records = (build_record(file_path.name, row, metadata) for row in iter_file_rows(file_path))
+    return dedupe_records(record for record in records if record is not None)
+
+
+def load_manifest(path: Path) -> dict[str, dict]:
+    try:
+        with path.open(encoding="utf-8") as handle:
+            manifest = json.load(handle)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest.get("files", {})
+
+
+def write_manifest(files: Mapping[str, dict], path: Path) -> None:
+    with path.open("w", encoding="utf-8") as handle:
+        json.dump({"version": MANIFEST_VERSION, "files": dict(sorted(files.items()))}, handle, indent=2)
         handle.write("\n")
 
 
+def manifest_key(key: tuple[str, str]) -> str:
+    return f"{key[0]}:{key[1]}"
+
+
+def winners(files: Mapping[str, dict]) -> dict[tuple[str, str], str]:
+    """Map each record key to the last file (in ingest order) that lists it."""
+    owner: dict[tuple[str, str], str] = {}
+    for rel in sorted(files, key=ingest_order):
+        for key in files[rel]["keys"]:
+            # NOC codes are alphanumeric, so the last colon separates them.
+            mosid, _, noc_code = key.rpartition(":")
+            owner[(mosid, noc_code)] = rel
+    return owner
+
+
+@dataclass
+class IngestReport:
+    """What an ingest run read, skipped and changed."""
+
+    records: list[MosidNocRecord] = field(default_factory=list)
+    files_read: list[str] = field(default_factory=list)
+    files_skipped: list[str] = field(default_factory=list)
+    files_removed: list[str] = field(default_factory=list)
+    added: int = 0
+    updated: int = 0
+    removed: int = 0
+    written: bool = False
+
+    def summary(self) -> str:
+        return (
+            f"Read {len(self.files_read)} files, skipped {len(self.files_skipped)} unchanged, "
+            f"dropped {len(self.files_removed)} removed; records: {self.added} added, "
+            f"{self.updated} updated, {self.removed} removed"
+            + ("" if self.written else " (outputs unchanged)")
+        )
+
+
+def is_stale(path: Path, source: Path) -> bool:
+    """Whether ``path`` is missing or was last written before ``source``."""
+    return not path.exists() or path.stat().st_mtime_ns < source.stat().st_mtime_ns
+
+
+def ingest_incremental(
+    raw_dir: Path, output_dir: Path, incremental: bool = True, arrow: bool = False
+) -> IngestReport:
+    """Merge changed raw tables into the existing outputs.
+
+    Every file is hashed, but only files whose hash differs from the
+    manifest are parsed. With
+    ``incremental=False`` every file is read and every record restamped, as
+    a full rebuild. ``arrow`` adds ``mosid_noc.arrow`` to the outputs, and
+    rewrites it when it is missing or older than ``mosid_noc.json`` (an
+    earlier run changed the records without ``arrow``).
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / MANIFEST_NAME
+    json_path = output_dir / "mosid_noc.json"
+    previous = load_manifest(manifest_path) if incremental else {}
+    existing = {record.key: record for record in read_json_records(json_path)} if incremental else {}
+
+    report = IngestReport()
+    files: dict[str, dict] = {}
+    paths: dict[str, Path] = {}
+    parsed: dict[str, list[MosidNocRecord]] = {}
+    for file_path in raw_files(raw_dir):
+        rel = file_path.relative_to(raw_dir).as_posix()
+        paths[rel] = file_path
+        digest = file_digest(file_path)
+        entry = previous.get(rel)
+        if entry and entry["sha256"] == digest:
+            files[rel] = entry
+            continue
+        parsed[rel] = parse_file(file_path)
+        files[rel] = {"sha256": digest, "keys": [manifest_key(record.key) for record in parsed[rel]]}
+    report.files_removed = sorted(previous.keys() - files.keys())
+
+    owner = winners(files)
+    previous_owner = winners(previous)
+    # An unchanged file must be re-read when it now supplies a record that a
+    # changed or removed file used to shadow (or the outputs lost it).
+    for key, rel in owner.items():
+        if rel not in parsed and (previous_owner.get(key) != rel or key not in existing):
+            parsed[rel] = parse_file(paths[rel])
+    report.files_read = sorted(parsed)
+    report.files_skipped = sorted(files.keys() - parsed.keys())
+
+    by_file = {rel: {record.key: record for record in records} for rel, records in parsed.items()}
+    merged: dict[tuple[str, str], MosidNocRecord] = {}
+    for key, rel in owner.items():
+        old = existing.get(key)
+        if rel not in by_file:
+            merged[key] = old
+            continue
+        record = by_file[rel][key]
+        if old is None:
+            report.added += 1
+        elif record.same_content(old):
+            record.transcription_date = old.transcription_date
+        else:
+            report.updated += 1
+        merged[key] = record
+    report.removed = len(existing.keys() - merged.keys())
+
+    report.records = sorted(merged.values(), key=lambda rec: (rec.mosid, rec.noc_code))
+    current = [record.to_row() for record in sorted(existing.values(), key=lambda rec: (rec.mosid, rec.noc_code))]
+    arrow_path = output_dir / ARROW_NAME if arrow else None
+    if not incremental or current != [record.to_row() for record in report.records]:
+        write_outputs(report.records, output_dir / "mosid_noc.csv", json_path, arrow_path)
+        report.written = True
+    elif arrow_path is not None and is_stale(arrow_path, json_path):
+        write_arrow(report.records, arrow_path)
+    if files != previous:
+        write_manifest(files, manifest_path)
+    return report
+
+
 def ingest(raw_dir: Path, output_dir: Path) -> list[MosidNocRecord]:
+    """Full rebuild: read every raw table and rewrite both outputs."""
+    return ingest_incremental(raw_dir, output_dir, incremental=False).records
+
+
+# Records are spilled to sorted runs of this many rows before merging.
+DEFAULT_RUN_SIZE = 100_000
+
+
+def _write_run(rows: list[list], run_dir: Path, name: str) -> Path:
+    rows.sort(key=lambda row: row[:4])
+    path = run_dir / name
+    with path.open("w", encoding="utf-8") as handle:
+        for row in rows:
+            handle.write(json.dumps(row, ensure_ascii=False) + "\n")
+    return path
+
+
+def spill_sorted_runs(file_index: int, file_path: Path, run_dir: Path, run_size: int) -> tuple[list[Path], int]:
+    """Parse one raw table into sorted run files of at most ``run_size`` rows.
+
+    Each run row is ``[mosid, noc_code, file_index, row_index, *fields]`` so
+    the merge can apply the later-file, later-row-wins precedence of
+    ``dedupe_records``. Runs in a worker process.
+    """
+    runs: list[Path] = []
+    rows: list[list] = []
+    count = 0
+    metadata = derive_metadata(file_path.name)
+    for row_index, row in enumerate(iter_file_rows(file_path)):
+        record = build_record(file_path.name, row, metadata)
+        if record is None:
+            continue
+        rows.append([record.mosid, record.noc_code, file_index, row_index, *(getattr(record, name) for name in OUTPUT_FIELDS)])
+        count += 1
+        if len(rows) >= run_size:
+            runs.append(_write_run(rows, run_dir, f"{file_index:05d}-{len(runs):05d}.jsonl"))
+            rows = []
+    if rows:
+        runs.append(_write_run(rows, run_dir, f"{file_index:05d}-{len(runs):05d}.jsonl"))
+    return runs, count
+
+
+def _read_run(path: Path) -> Iterator[list]:
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            yield json.loads(line)
+
+
+def merge_runs(runs: Iterable[Path]) -> Iterator[MosidNocRecord]:
+    """K-way merge of sorted runs, keeping the winning row per key."""
+    merged = heapq.merge(*(_read_run(path) for path in runs), key=lambda row: row[:4])
+    for _, group in itertools.groupby(merged, key=lambda row: (row[0], row[1])):
+        *_, winner = group
+        yield MosidNocRecord(*winner[4:])
+
+
+@dataclass
+class StreamingReport:
+    """Row counts for one streaming ingest."""
+
+    files: int = 0
+    rows_parsed: int = 0
+    records_written: int = 0
+    runs: int = 0
+
+
+def ingest_streaming(
+    raw_dir: Path,
+    output_dir: Path,
+    workers: int | None = None,
+    run_size: int = DEFAULT_RUN_SIZE,
+    arrow: bool = False,
+) -> StreamingReport:
+    """Full rebuild in bounded memory.
+
+    Files are parsed in a process pool into sorted runs on disk, then an
+    external k-way merge dedupes on ``(mosid, noc_code)`` and streams both
+    outputs. Peak memory is set by ``run_size`` per worker, not by the input
+    size. The incremental manifest is removed because it no longer
+    describes the outputs; the next incremental run re-reads every file.
+    """
     output_dir.mkdir(parents=True, exist_ok=True)
-    records = [
-        record
-        for filename, row in iter_raw_rows(raw_dir)
-        if (record := build_record(filename, row)) is not None
-    ]
-    normalized = dedupe_records(records)
-    normalized.sort(key=lambda rec: (rec.mosid, rec.noc_code))
-    write_csv(normalized, output_dir / "mosid_noc.csv")
-    write_json(normalized, output_dir / "mosid_noc.json")
-    return normalized
+    files = raw_files(raw_dir)
+    report = StreamingReport(files=len(files))
+    with tempfile.TemporaryDirectory(dir=output_dir, prefix=".ingest-runs-") as tmp:
+        run_dir = Path(tmp)
+        runs: list[Path] = []
+        if workers == 0:
+            results = (spill_sorted_runs(index, path, run_dir, run_size) for index, path in enumerate(files))
+            for file_runs, count in results:
+                runs.extend(file_runs)
+                report.rows_parsed += count
+        else:
+            with ProcessPoolExecutor(workers) as pool:
+                futures = [
+                    pool.submit(spill_sorted_runs, index, path, run_dir, run_size)
+                    for index, path in enumerate(files)
+                ]
+                for future in futures:
+                    file_runs, count = future.result()
+                    runs.extend(file_runs)
+                    report.rows_parsed += count
+        report.runs = len(runs)
+
+        csv_tmp, json_tmp = run_dir / "mosid_noc.csv", run_dir / "mosid_noc.json"
+        arrow_path = output_dir / ARROW_NAME if arrow else None
+        report.records_written = write_outputs(merge_runs(runs), csv_tmp, json_tmp, arrow_path)
+        os.replace(csv_tmp, output_dir / "mosid_noc.csv")
+        os.replace(json_tmp, output_dir / "mosid_noc.json")
+    (output_dir / MANIFEST_NAME).unlink(missing_ok=True)
+    return report
 
 
 def main() -> None:
@@ -184,9 +566,31 @@ def main() -> None:
         default=Path(__file__).resolve().parents[2] / "data" / "processed",
         help="Directory for normalized outputs",
     )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Skip unchanged files and keep transcription dates of unchanged records",
+    )
+    mode.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Full rebuild in bounded memory for very large inputs",
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes for --streaming (0 runs in-process)")
+    parser.add_argument("--run-size", type=int, default=DEFAULT_RUN_SIZE, help="Rows per sorted run for --streaming")
+    parser.add_argument("--arrow", action="store_true", help=f"Also write {ARROW_NAME} (needs pyarrow)")
     args = parser.parse_args()
 
-    ingest(args.raw_dir, args.output_dir)
+    if args.streaming:
+        streamed = ingest_streaming(args.raw_dir, args.output_dir, args.workers, args.run_size, args.arrow)
+        print(
+            f"Parsed {streamed.rows_parsed:,} rows from {streamed.files} files into {streamed.runs} runs; "
+            f"wrote {streamed.records_written:,} records"
+        )
+        return
+    report = ingest_incremental(args.raw_dir, args.output_dir, incremental=args.incremental, arrow=args.arrow)
+    print(report.summary())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,235 @@
+"""Concurrent MNET scraper built on a pool of Playwright browser contexts.
+
+Each MOSID is scraped on its own page, checked out from a fixed pool of
+browser contexts, so ``concurrency`` pages work at once. A token bucket caps
+how many searches start per second, waits are tied to page events rather
+than fixed sleeps, and failed MOSIDs are retried with exponential backoff.
+
+Playwright is imported lazily so the rate limiting and retry helpers can be
+used (and tested) without a browser installed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Awaitable, Callable, Iterable, TypeVar
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, BrowserContext, Page
+
+T = TypeVar("T")
+
+MNET_SEARCH_URL = "https://caface-rfacace.forces.gc.ca/mnet-oesc/en/cafSearch"
+
+# A finished search renders either the NOC table or this "no results" notice.
+NOC_TABLE_SELECTOR = "#noc_table"
+NO_RESULTS_SELECTOR = "#noResults"
+
+# Extracts every NOC row in one round trip once the row details are open.
+NOC_ROWS_JS = """
+rows => rows.map(row => ({
+    noc_code: row.querySelector("th")?.innerText.trim() ?? "",
+    civilian_title: row.querySelector("summary > b")?.innerText.trim() ?? "",
+    task_statements: Array.from(
+        row.querySelectorAll("div#detailPanelBodyTable > p"),
+        p => p.innerText.trim(),
+    ),
+}))
+"""
+
+
+class TokenBucket:
+    """Async token bucket: ``rate`` tokens per second, bursts up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float | None = None, clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError("Rate must be positive.")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0, jitter: float = 0.1) -> float:
+    """Delay before retry ``attempt`` (1-based): exponential, capped, jittered."""
+
+    delay = min(cap, base * 2 ** (attempt - 1))
+    return delay + random.uniform(0, jitter * delay)
+
+
+async def retry(
+    fn: Callable[[], Awaitable[T]],
+    attempts: int = 3,
+    base_delay: float = 0.5,
+    max_delay: float = 30.0,
+    retry_on: tuple[type[BaseException], ...] = (Exception,),
+) -> T:
+    """Await ``fn()`` until it succeeds or ``attempts`` calls have failed."""
+
+    for attempt in range(1, attempts + 1):
+        try:
+            return await fn()
+        except retry_on:
+            if attempt == attempts:
+                raise
+            await asyncio.sleep(backoff_delay(attempt, base_delay, max_delay))
+    raise AssertionError("unreachable")
+
+
+class ContextPool:
+    """Fixed set of isolated browser contexts, each with one reusable page."""
+
+    def __init__(self, browser: "Browser", size: int):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1.")
+        self.browser = browser
+        self.size = size
+        self._contexts: list[BrowserContext] = []
+        self._pages: asyncio.Queue[Page] = asyncio.Queue()
+
+    async def __aenter__(self) -> "ContextPool":
+        for _ in range(self.size):
+            context = await self.browser.new_context()
+            self._contexts.append(context)
+            self._pages.put_nowait(await context.new_page())
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        for context in self._contexts:
+            await context.close()
+        self._contexts.clear()
+
+    async def run(self, fn: Callable[["Page"], Awaitable[T]]) -> T:
+        """Run ``fn(page)`` on the next free page."""
+
+        page = await self._pages.get()
+        try:
+            return await fn(page)
+        finally:
+            self._pages.put_nowait(page)
+
+
+async def list_mosid_labels(page: "Page", url: str = MNET_SEARCH_URL) -> list[str]:
+    """Return the ``"CODE: TITLE"`` labels offered by the MOSID dropdown."""
+
+    await page.goto(url)
+    labels = await page.locator("#mosidList option").all_inner_texts()
+    return [label.strip() for label in labels if ":" in label]
+
+
+async def scrape_mosid(
+    page: "Page",
+    label: str,
+    url: str = MNET_SEARCH_URL,
+    timeout_ms: float = 10_000,
+    table_timeout_ms: float = 5_000,
+) -> list[dict]:
+    """Scrape the NOC equivalencies listed for one MOSID label.
+
+    Only a search that renders the explicit "no results" notice returns
+    ``[]``. If neither that notice nor the NOC table appears within
+    ``table_timeout_ms`` the Playwright timeout propagates, so the caller
+    retries the MOSID instead of recording it as having no equivalencies.
+    """
+
+    await page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
+    await page.select_option("#mosidList", label=label, timeout=timeout_ms)
+    await page.click("#mosidSearch", timeout=timeout_ms)
+    await page.wait_for_selector(
+        f"{NOC_TABLE_SELECTOR}, {NO_RESULTS_SELECTOR}", state="attached", timeout=table_timeout_ms
+    )
+    if not await page.locator(NOC_TABLE_SELECTOR).count():
+        return []
+    rows = page.locator("#noc_table tbody tr")
+    for index in range(await rows.count()):
+        row = rows.nth(index)
+        await row.locator("summary").click(timeout=timeout_ms)
+        # Wait for the row to expand rather than sleeping a fixed interval.
+        await row.locator("details[open]").wait_for(state="attached", timeout=timeout_ms)
+    return await page.eval_on_selector_all("#noc_table tbody tr", NOC_ROWS_JS)
+
+
+@dataclass
+class ScrapeReport:
+    """Outcome of one concurrent scrape."""
+
+    scraped: dict[str, list[dict]] = field(default_factory=dict)
+    failed: dict[str, str] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    def summary(self) -> str:
+        return f"Scraped {len(self.scraped):,} MOSIDs ({len(self.failed):,} failed) in {self.seconds:.1f}s"
+
+
+async def scrape_mosids(
+    labels: Iterable[str],
+    *,
+    url: str = MNET_SEARCH_URL,
+    concurrency: int = 4,
+    rate: float = 2.0,
+    attempts: int = 3,
+    timeout_ms: float = 10_000,
+    table_timeout_ms: float = 5_000,
+    on_result: Callable[[str, list[dict]], None] | None = None,
+    browser: "Browser | None" = None,
+) -> ScrapeReport:
+    """Scrape many MOSIDs over ``concurrency`` browser contexts.
+
+    ``rate`` caps new searches per second across all contexts. ``on_result``
+    is called as each MOSID finishes so callers can persist progress. A
+    ``browser`` may be passed in; otherwise headless Chromium is launched.
+    """
+
+    from playwright.async_api import Error as PlaywrightError, async_playwright
+
+    bucket = TokenBucket(rate, capacity=concurrency)
+    report = ScrapeReport()
+    started = time.perf_counter()
+
+    async def scrape_one(pool: ContextPool, label: str) -> None:
+        async def attempt() -> list[dict]:
+            await bucket.acquire()
+            return await pool.run(lambda page: scrape_mosid(page, label, url, timeout_ms, table_timeout_ms))
+
+        try:
+            noc_data = await retry(attempt, attempts, retry_on=(PlaywrightError,))
+        except PlaywrightError as exc:
+            report.failed[label] = str(exc).splitlines()[0]
+            return
+        report.scraped[label] = noc_data
+        if on_result is not None:
+            on_result(label, noc_data)
+
+    async def run(active: "Browser") -> None:
+        async with ContextPool(active, concurrency) as pool:
+            await asyncio.gather(*(scrape_one(pool, label) for label in dict.fromkeys(labels)))
+
+    if browser is not None:
+        await run(browser)
+    else:
+        async with async_playwright() as playwright:
+            launched = await playwright.chromium.launch()
+            try:
+                await run(launched)
+            finally:
+                await launched.close()
+    report.seconds = time.perf_counter() - started
+    return report
@@ -0,0 +1,175 @@
+"""Compare the MOSIDs offered by MNET with the ones we already hold.
+
+The site list comes from the live search page or from a cached snapshot
+(a saved copy of the page, or a text file with one ``CODE: TITLE`` label per
+line). The local list comes from the SQLite artifact or the crosswalk JSON.
+The result separates codes only on the site (``added``), codes no longer on
+the site (``removed``) and codes whose title changed (``renamed``).
+
+Usable as a library (``verify_mosids`` and ``update_mnet_data`` call it
+in-process) or as a CLI::
+
+    python scripts/mosid_coverage.py --site-snapshot cafSearch.html --against json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import sys
+from contextlib import closing
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Mapping
+
+from scrape_mnet_mosids import URL, fetch_mosid_labels, parse_mosid_labels
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+DB_PATH = SCRIPTS_DIR.parent / "mnet.db"
+JSON_PATH = SCRIPTS_DIR.parent.parent / "data" / "processed" / "mnet_data.json"
+if str(SCRIPTS_DIR.parent) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR.parent))
+
+
+def split_label(label: str) -> tuple[str, str]:
+    """Split ``"00005: CRMN"`` into ``("00005", "CRMN")``."""
+
+    code, _, title = label.partition(":")
+    return code.strip(), " ".join(title.split())
+
+
+def labels_to_titles(labels: Iterable[str]) -> dict[str, str]:
+    """Map MOSID codes to titles, keeping the first title seen per code."""
+
+    titles: dict[str, str] = {}
+    for label in labels:
+        if ":" not in label:
+            continue
+        code, title = split_label(label)
+        titles.setdefault(code, title)
+    return titles
+
+
+def site_titles(snapshot: Path | None = None, url: str = URL) -> dict[str, str]:
+    """MOSIDs on the MNET site, from ``snapshot`` when given, else live."""
+
+    if snapshot is None:
+        return labels_to_titles(fetch_mosid_labels(url))
+    text = Path(snapshot).read_text(encoding="utf-8")
+    if "<select" in text:
+        return labels_to_titles(parse_mosid_labels(text))
+    return labels_to_titles(text.splitlines())
+
+
+def db_titles(db_path: Path = DB_PATH) -> dict[str, str]:
+    """MOSIDs in the SQLite artifact."""
+
+    uri = f"{Path(db_path).resolve().as_uri()}?mode=ro"
+    with closing(sqlite3.connect(uri, uri=True)) as conn:
+        rows = conn.execute("SELECT mosid, title FROM mosids ORDER BY mosid, title")
+        return labels_to_titles(f"{code}: {title}" for code, title in rows)
+
+
+def json_titles(json_path: Path = JSON_PATH) -> dict[str, str]:
+    """MOSIDs in a crosswalk JSON keyed by ``"CODE: TITLE"``.
+
+    ``json_path`` may also be a directory of Arrow tables, in which case
+    only the memory-mapped ``mosids`` table is read.
+    """
+
+    if Path(json_path).is_dir():
+        from app.columnar import read_table, table_path
+
+        mosids = read_table(table_path(json_path, "mosids"))
+        codes, titles = mosids.column("mosid").to_pylist(), mosids.column("title").to_pylist()
+        return labels_to_titles(f"{code}: {title}" for code, title in zip(codes, titles))
+    with open(json_path, "r", encoding="utf-8") as f:
+        return labels_to_titles(json.load(f))
+
+
+@dataclass(frozen=True)
+class CoverageDiff:
+    """Differences between the site's MOSIDs and the local ones."""
+
+    added: tuple[str, ...] = ()
+    removed: tuple[str, ...] = ()
+    renamed: Mapping[str, tuple[str, str]] = field(default_factory=dict)
+    site_count: int = 0
+    local_count: int = 0
+
+    @property
+    def in_sync(self) -> bool:
+        return not (self.added or self.removed or self.renamed)
+
+    def as_dict(self) -> dict:
+        return {
+            "site_count": self.site_count,
+            "local_count": self.local_count,
+            "added": list(self.added),
+            "removed": list(self.removed),
+            "renamed": {code: {"local": old, "site": new} for code, (old, new) in self.renamed.items()},
+        }
+
+
+def diff_mosids(site: Mapping[str, str], local: Mapping[str, str]) -> CoverageDiff:
+    """Compare ``{code: title}`` maps from the site and the local data."""
+
+    return CoverageDiff(
+        added=tuple(sorted(site.keys() - local.keys())),
+        removed=tuple(sorted(local.keys() - site.keys())),
+        renamed={
+            code: (local[code], site[code])
+            for code in sorted(site.keys() & local.keys())
+            if local[code].casefold() != site[code].casefold()
+        },
+        site_count=len(site),
+        local_count=len(local),
+    )
+
+
+def coverage(
+    against: str = "db",
+    snapshot: Path | None = None,
+    url: str = URL,
+    db_path: Path = DB_PATH,
+    json_path: Path = JSON_PATH,
+) -> CoverageDiff:
+    """Diff the site (live or ``snapshot``) against the ``db`` or ``json`` data."""
+
+    local = db_titles(db_path) if against == "db" else json_titles(json_path)
+    return diff_mosids(site_titles(snapshot, url), local)
+
+
+def format_text(diff: CoverageDiff) -> str:
+    lines = [f"Site MOSIDs: {diff.site_count}", f"Local MOSIDs: {diff.local_count}"]
+    if diff.in_sync:
+        lines.append("Local data covers every MOSID on the MNET website.")
+    for name, codes in (("Added on site", diff.added), ("Removed from site", diff.removed)):
+        if codes:
+            lines.append(f"{name} ({len(codes)}):")
+            lines.extend(f"  - {code}" for code in codes)
+    if diff.renamed:
+        lines.append(f"Renamed ({len(diff.renamed)}):")
+        lines.extend(f"  - {code}: {old} -> {new}" for code, (old, new) in diff.renamed.items())
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Diff MNET's MOSID list against local data.")
+    parser.add_argument("--site-snapshot", type=Path, help="Saved search page or label list instead of the live site")
+    parser.add_argument("--url", default=URL, help="MNET CAF search page")
+    parser.add_argument("--against", choices=("db", "json"), default="db", help="Local data to compare with")
+    parser.add_argument("--db-path", type=Path, default=DB_PATH, help="SQLite artifact")
+    parser.add_argument("--json-path", type=Path, default=JSON_PATH, help="Crosswalk JSON or Arrow table directory")
+    parser.add_argument("--format", choices=("text", "json"), default="text", help="Output format")
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 when the lists differ")
+    args = parser.parse_args(argv)
+
+    diff = coverage(args.against, args.site_snapshot, args.url, args.db_path, args.json_path)
+    print(json.dumps(diff.as_dict(), indent=2) if args.format == "json" else format_text(diff))
+    return 1 if args.check and not diff.in_sync else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
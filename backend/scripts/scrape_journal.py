@@ -0,0 +1,180 @@
+"""Write-ahead journal for scrape results.
+
+Each scraped MOSID is appended to a JSONL journal as soon as it finishes, so
+a crash loses at most the MOSIDs since the last fsync instead of the whole
+run. fsyncs are batched by count and elapsed time. A restarted scrape skips
+everything already in the journal, and ``compact`` folds the journal into
+the canonical ``mnet_data.json`` with an atomic rename.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Iterator
+
+
+def journal_path_for(data_path: Path) -> Path:
+    """Default journal location next to the data file it feeds."""
+
+    data_path = Path(data_path)
+    return data_path.with_name(f"{data_path.stem}.journal.jsonl")
+
+
+def drop_torn_tail(path: Path, block_size: int = 64 * 1024) -> int:
+    """Truncate an unterminated last line left by a crash mid-write.
+
+    Otherwise the next entry would be appended onto the fragment and lost
+    with it. Returns the number of bytes removed.
+    """
+
+    try:
+        f = open(path, "r+b")
+    except FileNotFoundError:
+        return 0
+    with f:
+        size = end = f.seek(0, os.SEEK_END)
+        while end > 0:
+            start = max(0, end - block_size)
+            f.seek(start)
+            block = f.read(end - start)
+            newline = block.rfind(b"\n")
+            if newline >= 0:
+                end = start + newline + 1
+                break
+            end = start
+        if end != size:
+            f.truncate(end)
+            f.flush()
+            os.fsync(f.fileno())
+        return size - end
+
+
+class ScrapeJournal:
+    """Append-only JSONL journal of ``{"mosid": label, "nocs": [...]}`` lines."""
+
+    def __init__(self, path: Path, fsync_every: int = 20, fsync_interval: float = 2.0):
+        self.path = Path(path)
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.appended = 0
+        self.fsyncs = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        drop_torn_tail(self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def __enter__(self) -> "ScrapeJournal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def append(self, label: str, noc_data: list[dict[str, Any]]) -> None:
+        self._file.write(json.dumps({"mosid": label, "nocs": noc_data}, ensure_ascii=False) + "\n")
+        self.appended += 1
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+
+    def sync(self) -> None:
+        """Flush buffered lines and fsync them to disk."""
+
+        if not self._unsynced:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.fsyncs += 1
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+
+def iter_journal(path: Path) -> Iterator[tuple[str, list[dict[str, Any]]]]:
+    """Yield ``(label, noc_data)`` entries in write order.
+
+    A line cut short by a crash mid-write is skipped; the MOSID it held is
+    simply scraped again.
+    """
+
+    try:
+        f = open(path, "r", encoding="utf-8")
+    except FileNotFoundError:
+        return
+    with f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+                yield entry["mosid"], entry["nocs"]
+            except (ValueError, KeyError, TypeError):
+                continue
+
+
+def read_journal(path: Path) -> dict[str, list[dict[str, Any]]]:
+    """Return the journal as a dict; later entries for a MOSID win."""
+
+    return dict(iter_journal(path))
+
+
+def load_data(data_path: Path, strict: bool = False) -> dict[str, list[dict[str, Any]]]:
+    """Read the canonical data, or ``{}`` when it is missing.
+
+    A file that is not valid JSON also reads as ``{}`` unless ``strict`` is
+    set, in which case it raises ``ValueError`` instead.
+    """
+
+    try:
+        with open(data_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except json.JSONDecodeError as error:
+        if strict:
+            raise ValueError(f"{data_path} is not valid JSON ({error}); restore it before compacting.") from error
+        return {}
+
+
+def load_with_journal(data_path: Path, journal_path: Path | None = None) -> dict[str, list[dict[str, Any]]]:
+    """Canonical data overlaid with any entries journaled since the last compaction."""
+
+    data = load_data(data_path)
+    data.update(iter_journal(journal_path or journal_path_for(data_path)))
+    return data
+
+
+def compact(data_path: Path, journal_path: Path | None = None) -> int:
+    """Fold the journal into ``data_path`` atomically and remove the journal.
+
+    The merged file is written and fsynced under a temporary name, then
+    renamed over the original, so readers see either the old or the new
+    file. Replaying a journal that survived a crash is idempotent. Returns
+    the number of journal entries folded in. A corrupt ``data_path`` raises
+    ``ValueError`` and leaves both files untouched, rather than being
+    replaced by the journal entries alone.
+    """
+
+    data_path = Path(data_path)
+    journal_path = Path(journal_path or journal_path_for(data_path))
+    entries = read_journal(journal_path)
+    if not entries:
+        journal_path.unlink(missing_ok=True)
+        return 0
+    data = load_data(data_path, strict=True)
+    data.update(entries)
+    tmp_path = data_path.with_name(f".{data_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, data_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    journal_path.unlink()
+    return len(entries)
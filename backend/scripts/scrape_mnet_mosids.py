@@ -1,12 +1,36 @@
-import requests
-from bs4 import BeautifulSoup
+"""List the MOSID labels offered by the MNET CAF search page."""
 
 URL = "https://caface-rfacace.forces.gc.ca/mnet-oesc/en/cafSearch"
-response = requests.get(URL)
-soup = BeautifulSoup(response.content, "lxml")
-
-mosid_select = soup.find("select", {"id": "mosidList"})
-if mosid_select:
-    for option in mosid_select.find_all("option"):
-        if option.text.strip() and "Choose a MOSID" not in option.text:
-            print(option.text.strip())
+
+
+def parse_mosid_labels(html):
+    """Return the ``"CODE: TITLE"`` options of the ``#mosidList`` dropdown."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "lxml")
+    mosid_select = soup.find("select", {"id": "mosidList"})
+    if not mosid_select:
+        return []
+    return [
+        option.text.strip()
+        for option in mosid_select.find_all("option")
+        if option.text.strip() and "Choose a MOSID" not in option.text
+    ]
+
+
+def fetch_mosid_labels(url=URL, timeout=30):
+    """Download the search page and return its MOSID labels."""
+    import requests
+
+    response = requests.get(url, timeout=timeout)
+    response.raise_for_status()
+    return parse_mosid_labels(response.content)
+
+
+def main():
+    for label in fetch_mosid_labels():
+        print(label)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,93 +1,105 @@
-from playwright.sync_api import sync_playwright, TimeoutError
-import json
-import time
-import subprocess
+import argparse
+import asyncio
+import sys
 from pathlib import Path
 
+from mnet_scraper import MNET_SEARCH_URL, list_mosid_labels, scrape_mosids
+from mosid_coverage import coverage
+from scrape_journal import ScrapeJournal, compact, journal_path_for, load_with_journal
+
 DATA_PATH = Path(__file__).resolve().parent.parent.parent / "data" / "processed" / "mnet_data.json"
-VERIFIER_PATH = Path(__file__).resolve().parent / "verify_mosids.py"
-
-def get_missing_mosids():
-    """Executes the verifier script to get the list of missing MOSIDs."""
-    result = subprocess.run(
-        ["poetry", "run", "python", str(VERIFIER_PATH)],
-        capture_output=True,
-        text=True,
-        cwd=VERIFIER_PATH.parent.parent,
-    )
-    if result.returncode != 0:
-        raise RuntimeError(f"Failed to run verify_mosids.py: {result.stderr}")
-
-    missing_mosids = []
-    for line in result.stdout.strip().split("\n"):
-        if line.strip().startswith("-"):
-            missing_mosids.append(line.strip().split(" ")[1])
-    return missing_mosids
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+def export_arrow(arrow_dir):
+    """Refresh the memory-mappable Arrow copy of mnet_data.json."""
+    from app.columnar import write_mnet_tables
+
+    counts = write_mnet_tables(load_with_journal(DATA_PATH), arrow_dir)
+    print(f"Wrote {sum(counts.values()):,} rows to {arrow_dir}.")
+
+def get_missing_mosids(snapshot=None, url=MNET_SEARCH_URL):
+    """Return the MOSID codes on the MNET website that the database lacks."""
+    return list(coverage("db", snapshot, url).added)
+
+async def scrape_missing(missing_mosids, all_noc_data, journal, args):
+    """Resolve dropdown labels for the missing codes and scrape them concurrently."""
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch()
+        try:
+            # Scrape the full list of MOSIDs from the site to match the text in the dropdown
+            page = await browser.new_page()
+            all_mosids_on_site = await list_mosid_labels(page, args.url)
+            await page.close()
+            mosid_map = {m.split(":")[0].strip(): m for m in all_mosids_on_site}
+
+            labels = []
+            for mosid_code in missing_mosids:
+                mosid_label = mosid_map.get(mosid_code)
+                if not mosid_label:
+                    print(f"Could not find label for MOSID code {mosid_code}. Skipping.")
+                elif mosid_label in all_noc_data:
+                    print(f"Skipping {mosid_label} (already scraped).")
+                else:
+                    labels.append(mosid_label)
+
+            def record(label, noc_data):
+                journal.append(label, noc_data)
+                all_noc_data[label] = noc_data
+                print(f"Scraped {label} ({len(noc_data)} NOC equivalencies).")
+
+            return await scrape_mosids(
+                labels,
+                url=args.url,
+                concurrency=args.concurrency,
+                rate=args.rate,
+                attempts=args.attempts,
+                on_result=record,
+                browser=browser,
+            )
+        finally:
+            await browser.close()
 
 def main():
-    missing_mosids = get_missing_mosids()
+    parser = argparse.ArgumentParser(description="Scrape MOSIDs missing from the database and add them to mnet_data.json.")
+    parser.add_argument("--url", default=MNET_SEARCH_URL, help="MNET CAF search page")
+    parser.add_argument("--concurrency", type=int, default=4, help="Browser contexts scraping at once")
+    parser.add_argument("--rate", type=float, default=2.0, help="Maximum searches started per second")
+    parser.add_argument("--attempts", type=int, default=3, help="Attempts per MOSID before giving up")
+    parser.add_argument("--journal", type=Path, default=journal_path_for(DATA_PATH), help="Write-ahead journal of scraped MOSIDs")
+    parser.add_argument("--fsync-every", type=int, default=20, help="Journal entries per fsync")
+    parser.add_argument("--site-snapshot", type=Path, help="Saved search page to find missing MOSIDs from")
+    parser.add_argument("--arrow-dir", type=Path, help="Also refresh the Arrow tables here (needs pyarrow)")
+    args = parser.parse_args()
+
+    missing_mosids = get_missing_mosids(args.site_snapshot, args.url)
     if not missing_mosids:
+        # Still fold in anything an interrupted run left in the journal.
+        compact(DATA_PATH, args.journal)
         print("No missing MOSIDs to scrape. The data is already up to date.")
+        if args.arrow_dir:
+            export_arrow(args.arrow_dir)
         return
 
     print(f"Found {len(missing_mosids)} missing MOSIDs. Starting scrape...")
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch()
-        page = browser.new_page()
+    # MOSIDs journaled by an interrupted run count as scraped.
+    all_noc_data = load_with_journal(DATA_PATH, args.journal)
 
-        try:
-            with open(DATA_PATH, "r") as f:
-                all_noc_data = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            all_noc_data = {}
-
-        # Scrape the full list of MOSIDs from the site to match the text in the dropdown
-        page.goto("https://caface-rfacace.forces.gc.ca/mnet-oesc/en/cafSearch")
-        all_mosids_on_site = page.locator("#mosidList option").all_inner_texts()
-        mosid_map = {m.split(":")[0].strip(): m.strip() for m in all_mosids_on_site if ":" in m}
-
-        for mosid_code in missing_mosids:
-            mosid_label = mosid_map.get(mosid_code)
-            if not mosid_label:
-                print(f"Could not find label for MOSID code {mosid_code}. Skipping.")
-                continue
-
-            if mosid_label in all_noc_data:
-                print(f"Skipping {mosid_label} (already scraped).")
-                continue
-
-            print(f"Scraping data for {mosid_label}...")
-            page.goto("https://caface-rfacace.forces.gc.ca/mnet-oesc/en/cafSearch")
-            page.wait_for_selector("#mosidList")
-            page.select_option("#mosidList", label=mosid_label)
-            page.click("#mosidSearch")
-            try:
-                page.wait_for_selector("#noc_table", timeout=5000)
-                noc_data = []
-                for row in page.locator("#noc_table tbody tr").all():
-                    row.locator("summary").click()
-                    page.wait_for_timeout(100) # wait for the page to update
-                    noc_code = row.locator("th").inner_text()
-                    civilian_title = row.locator("summary > b").inner_text()
-                    task_statements = [p.inner_text() for p in row.locator("div#detailPanelBodyTable > p").all()]
-                    noc_data.append({
-                        "noc_code": noc_code,
-                        "civilian_title": civilian_title,
-                        "task_statements": task_statements
-                    })
-                all_noc_data[mosid_label] = noc_data
-            except TimeoutError:
-                print(f"  > No NOC table found for {mosid_label}. Skipping.")
-                all_noc_data[mosid_label] = []
-
-            time.sleep(1) # Be respectful of the server
-
-        with open(DATA_PATH, "w") as f:
-            json.dump(all_noc_data, f, indent=4)
-
-        browser.close()
+    with ScrapeJournal(args.journal, fsync_every=args.fsync_every) as journal:
+        report = asyncio.run(scrape_missing(missing_mosids, all_noc_data, journal, args))
+    for label, error in report.failed.items():
+        print(f"  > Failed to scrape {label}: {error}")
+    print(report.summary())
+
+    folded = compact(DATA_PATH, args.journal)
+    print(f"Folded {folded} journaled MOSIDs into {DATA_PATH.name}.")
     print("Scraping complete. mnet_data.json has been updated.")
+    if args.arrow_dir:
+        export_arrow(args.arrow_dir)
 
 if __name__ == "__main__":
     main()
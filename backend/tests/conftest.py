@@ -1,8 +1,42 @@
-"""Pytest configuration for ensuring local package imports."""
+"""Pytest configuration for ensuring local package and script imports, plus
+the artifact fixtures shared across test modules."""
 
+import shutil
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
+for path in (ROOT, ROOT / "scripts"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from app.database import MNET_DATA_PATH, RANKS_PATH, build_database, connect_readonly  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def built_db_path(tmp_path_factory):
+    """The bundled sources built once per session; tests must not modify it."""
+
+    path = tmp_path_factory.mktemp("artifact") / "mnet.db"
+    build_database(path, MNET_DATA_PATH, RANKS_PATH)
+    return path
+
+
+@pytest.fixture
+def db_path(tmp_path, built_db_path):
+    """A private copy of the built artifact that a test may rebuild."""
+
+    path = tmp_path / "mnet.db"
+    shutil.copy(built_db_path, path)
+    return path
+
+
+@pytest.fixture(scope="module")
+def conn(built_db_path):
+    """Read-only connection to the shared artifact."""
+
+    connection = connect_readonly(built_db_path)
+    yield connection
+    connection.close()
@@ -0,0 +1,59 @@
+"""Tests for the memory-mapped Arrow copy of the crosswalk."""
+
+import json
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from app.columnar import read_mnet_data, read_table, table_path, write_mnet_tables  # noqa: E402
+from app.database import RANKS_PATH, build_database, connect_readonly, fetch_mosid_profile, source_hash  # noqa: E402
+
+MNET_DATA = {
+    "00005: CRMN": [
+        {"noc_code": "14111", "civilian_title": "Data entry clerks", "task_statements": ["Enter data", "Verify data"]},
+        {"noc_code": "42101", "civilian_title": "Firefighters", "task_statements": []},
+    ],
+    "00008: ACS TECH": [],
+    "00010: ARMD": [
+        {"noc_code": "43100", "civilian_title": "Officers", "task_statements": ["Lead troops"]},
+    ],
+}
+
+
+def test_tables_round_trip_to_the_json_shape(tmp_path):
+    counts = write_mnet_tables(MNET_DATA, tmp_path)
+    assert counts == {
+        "mosids": 3,
+        "nocs": 3,
+        "noc_task_statements": 3,
+        "mosid_noc_mappings": 3,
+        "mosid_noc_titles": 0,
+    }
+    assert read_mnet_data(tmp_path) == MNET_DATA
+
+
+def test_read_table_maps_the_file_without_copying(tmp_path):
+    write_mnet_tables(MNET_DATA, tmp_path)
+    before = pa.total_allocated_bytes()
+    table = read_table(table_path(tmp_path, "mosid_noc_mappings"))
+    assert pa.total_allocated_bytes() == before
+    assert table.column("noc").to_pylist() == ["14111", "42101", "43100"]
+    assert table.column("mosid").to_pylist() == ["00005", "00005", "00010"]
+
+
+def test_database_builds_from_a_columnar_directory(tmp_path):
+    json_path = tmp_path / "mnet_data.json"
+    json_path.write_text(json.dumps(MNET_DATA))
+    columnar = tmp_path / "columnar"
+    write_mnet_tables(MNET_DATA, columnar)
+
+    build_database(tmp_path / "from_json.db", json_path, RANKS_PATH)
+    build_database(tmp_path / "from_arrow.db", columnar, RANKS_PATH)
+    for name in ("from_json.db", "from_arrow.db"):
+        conn = connect_readonly(tmp_path / name)
+        try:
+            assert fetch_mosid_profile(conn, "00005")["equivalencies"][0]["task_statements"] == ["Enter data", "Verify data"]
+        finally:
+            conn.close()
+    assert source_hash(columnar, RANKS_PATH) != source_hash(json_path, RANKS_PATH)
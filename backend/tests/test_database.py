@@ -0,0 +1,89 @@
+"""Tests for the build-time SQLite artifact."""
+
+import shutil
+import sqlite3
+
+import pytest
+
+from app.database import (
+    MNET_DATA_PATH,
+    RANKS_PATH,
+    build_database,
+    connect_readonly,
+    ensure_database,
+    read_build_info,
+    source_hash,
+)
+
+
+@pytest.fixture
+def sources(tmp_path):
+    mnet = tmp_path / "mnet_data.json"
+    ranks = tmp_path / "rank_responsibilities.yaml"
+    shutil.copy(MNET_DATA_PATH, mnet)
+    shutil.copy(RANKS_PATH, ranks)
+    return mnet, ranks
+
+
+def test_build_database_stores_source_hash(tmp_path, sources):
+    db_path = tmp_path / "mnet.db"
+    digest, stats = build_database(db_path, *sources)
+    assert stats.rows_by_table["mosids"] > 0
+    info = read_build_info(db_path)
+    assert info["source_hash"] == digest == source_hash(*sources)
+    assert "built_at" in info
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_ensure_database_skips_rebuild_when_hash_matches(tmp_path, sources):
+    db_path = tmp_path / "mnet.db"
+    ensure_database(db_path, *sources)
+    inode = db_path.stat().st_ino
+    ensure_database(db_path, *sources)
+    assert db_path.stat().st_ino == inode
+
+
+def test_ensure_database_rebuilds_when_sources_change(tmp_path, sources):
+    db_path = tmp_path / "mnet.db"
+    first = ensure_database(db_path, *sources)
+    mnet, ranks = sources
+    ranks.write_text("- rank: Captain\n  responsibilities:\n    - Command a company\n")
+    second = ensure_database(db_path, *sources)
+    assert first != second
+    assert read_build_info(db_path)["source_hash"] == second
+    with connect_readonly(db_path) as conn:
+        assert conn.execute("SELECT rank_name FROM ranks").fetchall() == [("Captain",)]
+
+
+def test_connect_readonly_rejects_writes(tmp_path, sources):
+    db_path = tmp_path / "mnet.db"
+    build_database(db_path, *sources)
+    conn = connect_readonly(db_path)
+    try:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM ranks")
+    finally:
+        conn.close()
+
+
+def test_read_build_info_missing_file(tmp_path):
+    assert read_build_info(tmp_path / "missing.db") == {}
+
+
+def test_fetch_mosid_profiles_single_and_chunked_lists_agree(tmp_path, sources, monkeypatch):
+    from app import database
+
+    db_path = tmp_path / "mnet.db"
+    build_database(db_path, *sources)
+    codes = ["00008", "missing", "00005", "00008"]
+    conn = connect_readonly(db_path)
+    try:
+        in_list = database.fetch_mosid_profiles(conn, codes)
+        monkeypatch.setattr(database, "BATCH_IN_LIMIT", 1)
+        chunked = database.fetch_mosid_profiles(conn, codes)
+    finally:
+        conn.close()
+    assert in_list == chunked
+    profiles, missing = in_list
+    assert list(profiles) == ["00008", "00005"]
+    assert missing == ["missing"]
@@ -1,13 +1,26 @@
 """Tests for the FastAPI HTTP surface."""
 
+import asyncio
+import json
+
+import httpx
+import pytest
 from fastapi.testclient import TestClient
 
-from app.mcp_server import app
+from app.http_app import app
 
 
 client = TestClient(app)
 
 
+@pytest.fixture
+def internal_headers(monkeypatch):
+    from app import http_app
+
+    monkeypatch.setattr(http_app, "INTERNAL_TOKEN", "s3cret")
+    return {"X-Internal-Token": "s3cret"}
+
+
 def test_get_rank_responsibilities_found():
     response = client.get("/v1/ranks/Captain")
     assert response.status_code == 200
@@ -48,3 +61,263 @@ def test_batch_lookup_returns_found_entries():
     assert "results" in body
     assert "00005" in body["results"]
     assert "99999" not in body["results"]
+
+
+def test_get_mosid_profile_sets_cache_headers_and_honours_etag():
+    first = client.get("/v1/mosids/00005")
+    etag = first.headers["etag"]
+    assert etag.startswith('"') and etag.endswith('"')
+    assert "max-age" in first.headers["cache-control"]
+
+    revalidated = client.get("/v1/mosids/00005", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == etag
+
+    changed = client.get("/v1/mosids/00005", headers={"If-None-Match": '"stale"'})
+    assert changed.status_code == 200
+    assert changed.json() == first.json()
+
+
+def test_batch_lookup_preserves_request_order():
+    response = client.post(
+        "/v1/mosids:batchLookup",
+        json={"mosid_codes": ["00008", "00005", "00008"]},
+    )
+    assert list(response.json()["results"]) == ["00008", "00005"]
+
+
+def test_batch_lookup_reports_not_found_codes():
+    response = client.post(
+        "/v1/mosids:batchLookup",
+        json={"mosid_codes": ["99999", "00005", "invalid"]},
+    )
+    assert response.json()["not_found"] == ["99999", "invalid"]
+
+
+def test_batch_lookup_limits_public_and_internal_callers(internal_headers):
+    codes = [f"{index:05d}" for index in range(26)]
+    public = client.post("/v1/mosids:batchLookup", json={"mosid_codes": codes})
+    assert public.status_code == 422
+    internal = client.post("/internal/v1/mosids:batchLookup", json={"mosid_codes": codes}, headers=internal_headers)
+    assert internal.status_code == 200
+    assert "00005" in internal.json()["results"]
+
+
+def test_internal_routes_require_the_shared_token(monkeypatch, internal_headers):
+    from app import http_app
+
+    body = {"mosid_codes": ["00005"]}
+    assert client.post("/internal/v1/mosids:batchLookup", json=body).status_code == 403
+    assert client.post("/internal/v1/mosids:batchLookup", json=body, headers={"X-Internal-Token": "guess"}).status_code == 403
+    assert client.get("/internal/v1/stats").status_code == 403
+    monkeypatch.setattr(http_app, "INTERNAL_TOKEN", "")
+    assert client.post("/internal/v1/mosids:batchLookup", json=body, headers={"X-Internal-Token": ""}).status_code == 403
+
+
+def test_internal_batch_lookup_over_the_in_list_limit(internal_headers):
+    codes = [f"{index:05d}" for index in range(600)]
+    response = client.post("/internal/v1/mosids:batchLookup", json={"mosid_codes": codes}, headers=internal_headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert "00005" in body["results"]
+    assert len(body["results"]) + len(body["not_found"]) == 600
+
+
+def test_internal_stats_exposes_pool_queue_metrics(internal_headers):
+    client.get("/v1/ranks/Private")
+    stats = client.get("/internal/v1/stats", headers=internal_headers).json()
+    assert stats["pool"]["acquisitions"] >= 1
+    assert "total_wait_seconds" in stats["pool"]
+    assert "hits" in stats["response_cache"]
+
+
+def _read_ndjson(response):
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def test_export_streams_every_mosid_as_ndjson():
+    response = client.get("/v1/mosids:export")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    profiles = _read_ndjson(response)
+    codes = [profile["mosid"] for profile in profiles]
+    assert codes == sorted(codes)
+    assert "00005" in codes
+    assert profiles[codes.index("00005")] == client.get("/v1/mosids/00005").json()
+
+
+def test_export_filters_and_resumes():
+    by_noc = _read_ndjson(client.get("/v1/mosids:export", params={"noc_code": "14111"}))
+    assert by_noc
+    assert all(
+        any(item["noc_code"] == "14111" for item in profile["equivalencies"])
+        for profile in by_noc
+    )
+
+    by_prefix = _read_ndjson(client.get("/v1/mosids:export", params={"mosid_prefix": "0000"}))
+    assert by_prefix and all(profile["mosid"].startswith("0000") for profile in by_prefix)
+
+    everything = _read_ndjson(client.get("/v1/mosids:export"))
+    resumed = _read_ndjson(client.get("/v1/mosids:export", params={"after": everything[0]["mosid"]}))
+    assert resumed == everything[1:]
+
+
+def test_export_gzip_encodes_when_accepted():
+    response = client.get("/v1/mosids:export", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert _read_ndjson(response) == _read_ndjson(
+        client.get("/v1/mosids:export", headers={"Accept-Encoding": "identity"})
+    )
+
+
+def test_export_gzip_stream_decodes_across_many_chunks(monkeypatch):
+    from app import http_app
+
+    expected = _read_ndjson(client.get("/v1/mosids:export"))
+    monkeypatch.setattr(http_app, "EXPORT_CHUNK_BYTES", 1)
+    response = client.get("/v1/mosids:export", headers={"Accept-Encoding": "gzip"})
+    assert _read_ndjson(response) == expected
+
+
+def test_concurrent_exports_share_threadpool_workers(monkeypatch):
+    from app import http_app
+
+    expected = _read_ndjson(client.get("/v1/mosids:export"))
+    monkeypatch.setattr(http_app, "EXPORT_CHUNK_BYTES", 1)
+
+    async def export_all():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+            return await asyncio.gather(*(async_client.get("/v1/mosids:export") for _ in range(8)))
+
+    for response in asyncio.run(export_all()):
+        assert response.status_code == 200
+        assert _read_ndjson(response) == expected
+
+
+def test_noc_reverse_lookup():
+    response = client.get("/v1/nocs/14111/mosids")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["noc_code"] == "14111"
+    assert "00005" in [mapping["mosid"] for mapping in body["mosids"]]
+
+    group = client.get("/v1/nocs/14/mosids").json()
+    assert len(group["mosids"]) >= len(body["mosids"])
+
+    assert client.get("/v1/nocs/00000/mosids").status_code == 404
+
+
+def test_similar_mosids_endpoint():
+    response = client.get("/v1/mosids/00005/similar", params={"limit": 3})
+    assert response.status_code == 200
+    scores = [item["score"] for item in response.json()["similar"]]
+    assert 0 < len(scores) <= 3
+    assert scores == sorted(scores, reverse=True)
+    assert client.get("/v1/mosids/99999/similar").status_code == 404
+    assert client.get("/v1/mosids/00005/similar", params={"limit": 0}).status_code == 422
+
+
+def test_recommend_nocs_endpoints():
+    response = client.post("/v1/nocs:recommend", json={"text": "register invoices and forms for data capture", "limit": 3})
+    assert response.status_code == 200
+    assert response.json()["nocs"][0]["noc_code"] == "14111"
+    assert client.post("/v1/nocs:recommend", json={"text": ""}).status_code == 422
+
+    by_mosid = client.get("/v1/mosids/00005/recommendedNocs")
+    assert by_mosid.status_code == 200
+    assert "14111" not in [item["noc_code"] for item in by_mosid.json()["nocs"]]
+    assert client.get("/v1/mosids/99999/recommendedNocs").status_code == 404
+
+
+def test_search_endpoint():
+    response = client.get("/v1/search", params={"q": "firefighters", "limit": 5})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["results"]
+    assert len(body["results"]) <= 5
+    assert client.get("/v1/search", params={"q": "x", "kind": "bogus"}).status_code == 422
+
+
+def test_indicator_match_endpoint():
+    response = client.post(
+        "/v1/indicators:match",
+        json={"text": "Platoon commander who coordinated resupply."},
+    )
+    assert response.status_code == 200
+    indicators = {hit["indicator"] for hit in response.json()["hits"]}
+    assert indicators == {"platoon commander", "coordinated resupply"}
+
+
+def test_batch_translate_endpoint():
+    response = client.post(
+        "/v1/translations:batchTranslate",
+        json={
+            "entries": [
+                {"id": "a", "indicators": ["led section"], "values": {"team_size": 8}},
+                {"id": "b", "text": "Nothing to see here."},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    first, second = response.json()["results"]
+    assert first["bullets"][0]["text"].startswith("Directed a 8-person")
+    assert second == {"id": "b", "bullets": [], "unmatched_indicators": []}
+
+
+def test_batch_translate_endpoint_rejects_empty_batches():
+    response = client.post("/v1/translations:batchTranslate", json={"entries": []})
+    assert response.status_code == 422
+
+
+def test_resume_job_lifecycle(monkeypatch):
+    import time
+
+    from app.service import resume_jobs
+
+    monkeypatch.setattr(resume_jobs(), "workers", 0)
+    body = "\n".join(json.dumps({"record_id": f"r{i}", "mosid": "00005", "rank_current": "Corporal"}) for i in range(3))
+    created = client.post("/v1/resumeJobs", content=body, headers={"Content-Type": "application/x-ndjson"})
+    assert created.status_code == 202
+    job_id = created.json()["job_id"]
+    assert created.headers["location"] == f"/v1/resumeJobs/{job_id}"
+
+    deadline = time.monotonic() + 10
+    while (status := client.get(f"/v1/resumeJobs/{job_id}").json())["status"] in ("queued", "running"):
+        assert time.monotonic() < deadline
+        time.sleep(0.02)
+    assert status["status"] == "succeeded"
+    assert status["progress"]["records_done"] == 3
+    assert set(status["progress"]["stage_seconds"]) >= {"rank", "mosid", "indicators", "translate"}
+
+    results = client.get(f"/v1/resumeJobs/{job_id}/results")
+    assert [record["record_id"] for record in _read_ndjson(results)] == ["r0", "r1", "r2"]
+
+
+def test_resume_job_errors():
+    assert client.get("/v1/resumeJobs/missing").status_code == 404
+    assert client.post("/v1/resumeJobs", content=b"").status_code == 400
+
+
+def test_rejected_resume_uploads_leave_no_job(monkeypatch):
+    from app import http_app
+    from app.service import resume_jobs
+
+    before = resume_jobs().stats()
+    assert client.post("/v1/resumeJobs", content=b"").status_code == 400
+    monkeypatch.setattr(http_app, "MAX_JOB_UPLOAD_BYTES", 4)
+    assert client.post("/v1/resumeJobs", content=b'{"record_id": "r0"}\n').status_code == 413
+    assert resume_jobs().stats() == before
+    assert not list(resume_jobs().workdir.glob("*.input.jsonl"))
+
+
+def test_metrics_endpoint_reports_routes_tools_and_cache():
+    client.get("/v1/mosids/00005")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'caf_http_request_duration_seconds_count{method="GET",route="/v1/mosids/{mosid_code}",status="200"}' in body
+    assert "caf_response_cache_hit_ratio " in body
+    assert 'caf_db_duration_seconds_count{operation="query"}' in body
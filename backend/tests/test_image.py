@@ -0,0 +1,97 @@
+"""Tests for the memory-mapped binary data image."""
+
+import shutil
+from contextlib import closing
+
+import pytest
+
+from app import service
+from app.database import (
+    MNET_DATA_PATH,
+    RANKS_PATH,
+    build_database,
+    connect_readonly,
+    fetch_mosid_profile,
+    fetch_rank,
+)
+from app.image import DataImage, ImageStore, build_image, ensure_image, read_image_version
+from app.noc_index import load_noc_index
+
+
+@pytest.fixture
+def image_path(tmp_path, db_path):
+    path = tmp_path / "mnet.img"
+    build_image(db_path, path)
+    return path
+
+
+def test_image_matches_sqlite_lookups(db_path, image_path):
+    image = DataImage(image_path)
+    with closing(connect_readonly(db_path)) as conn:
+        codes = [code for (code,) in conn.execute("SELECT mosid FROM mosids")]
+        ranks = [name for (name,) in conn.execute("SELECT rank_name FROM ranks")]
+        assert len(image) == len(set(codes))
+        for code in codes + ["99999", "", "zzzzz"]:
+            assert image.mosid(code) == fetch_mosid_profile(conn, code)
+        for rank in ranks + ["General", ""]:
+            assert image.rank(rank) == fetch_rank(conn, rank)
+
+
+def test_image_is_mapped_read_only(image_path):
+    image = DataImage(image_path)
+    with pytest.raises(TypeError):
+        image._blob[0] = 0
+
+
+def test_ensure_image_rebuilds_only_for_a_new_artifact(tmp_path, db_path, image_path):
+    version = read_image_version(image_path)
+    mtime = image_path.stat().st_mtime_ns
+    assert ensure_image(db_path, image_path) == version
+    assert image_path.stat().st_mtime_ns == mtime
+
+    ranks = tmp_path / "ranks.yaml"
+    shutil.copy(RANKS_PATH, ranks)
+    with ranks.open("a") as handle:
+        handle.write("\n- rank: Captain\n  responsibilities:\n    - Command a company\n")
+    build_database(db_path, MNET_DATA_PATH, ranks)
+    assert ensure_image(db_path, image_path) != version
+    assert read_image_version(image_path) != version
+    assert read_image_version(tmp_path / "missing.img") == ""
+
+
+def test_store_remaps_when_image_is_replaced(tmp_path, db_path, image_path):
+    store = ImageStore(image_path, check_interval=0)
+    before = store.current()
+    assert store.current() is before
+
+    ranks = tmp_path / "ranks.yaml"
+    shutil.copy(RANKS_PATH, ranks)
+    with ranks.open("a") as handle:
+        handle.write("\n- rank: Captain\n  responsibilities:\n    - Command a company\n")
+    build_database(db_path, MNET_DATA_PATH, ranks)
+    build_image(db_path, image_path)
+
+    after = store.current()
+    assert after is not before
+    assert after.version != before.version
+    assert after.rank("Captain")["responsibilities"] == ["Command a company"]
+    assert before.rank("Captain") == {}
+
+
+def test_image_noc_lookups_match_the_sqlite_index(db_path, image_path):
+    image = DataImage(image_path)
+    with closing(connect_readonly(db_path)) as conn:
+        index = load_noc_index(conn)
+    keys = list(index.entries) + ["1", "14111 ", "99999", "", "141111"]
+    for key in keys:
+        assert image.noc_mosids(key) == index.lookup(key)
+    assert image.noc_mosids("14")["mosids"]
+
+
+def test_tools_read_from_image_when_enabled(monkeypatch, image_path):
+    monkeypatch.setattr(service, "SNAPSHOTS", ImageStore(image_path))
+    assert service.get_mosid_data("00005")["mosid"] == "00005"
+    assert service.get_rank_data("Private")["responsibilities"]
+    assert service.get_mosid_data_batch(["00005", "99999"])["99999"] == {}
+    assert service.data_version() == read_image_version(image_path)
+    assert "00005" in [item["mosid"] for item in service.get_noc_mosids("14111")["mosids"]]
@@ -0,0 +1,78 @@
+"""Tests for the compiled indicator matcher."""
+
+from app.indicators import IndicatorMatcher
+
+CATALOG = {
+    "version": "test",
+    "families": [
+        {
+            "mosid_family": "00109 - Signals Technician",
+            "indicators": [
+                {"name": "incident response", "keywords": ["incident response", "cyber incident response"]},
+                {"name": "equipment custodian", "keywords": ["equipment custodian"]},
+            ],
+        },
+        {
+            "mosid_family": "00168 - Medical Technician",
+            "indicators": [{"name": "casualty evacuation", "keywords": ["casevac", "medical evacuation"]}],
+        },
+    ],
+}
+
+
+def test_scan_normalizes_case_and_whitespace_and_reports_offsets():
+    text = "Served as EQUIPMENT\n   Custodian for the det."
+    (hit,) = IndicatorMatcher(CATALOG).scan(text)
+    assert hit.indicator == "equipment custodian"
+    assert text[hit.start:hit.end] == hit.text == "EQUIPMENT\n   Custodian"
+
+
+def test_scan_prefers_longest_keyword_and_respects_word_boundaries():
+    matcher = IndicatorMatcher(CATALOG)
+    hits = matcher.scan("Led cyber incident response; coordinated casevacs and casevac.")
+    assert [(hit.keyword, hit.text) for hit in hits] == [
+        ("cyber incident response", "cyber incident response"),
+        ("casevac", "casevac"),
+    ]
+
+
+def test_scan_resolves_hits_whose_case_folding_differs_from_the_regex():
+    matcher = IndicatorMatcher(CATALOG)
+    text = "Handled İNCİDENT response and MEDİCAL evacuation."
+    hits = matcher.scan(text)
+    assert [(hit.indicator, hit.text) for hit in hits] == [
+        ("incident response", "İNCİDENT response"),
+        ("casualty evacuation", "MEDİCAL evacuation"),
+    ]
+    assert IndicatorMatcher.from_path().match("led a sectİon")["hits"]
+
+
+def test_scan_filters_by_family():
+    matcher = IndicatorMatcher(CATALOG)
+    text = "Equipment custodian; medical evacuation."
+    hits = matcher.scan(text, mosid_family="00168 - Medical Technician")
+    assert [hit.indicator for hit in hits] == ["casualty evacuation"]
+
+
+def test_match_summarizes_counts():
+    result = IndicatorMatcher(CATALOG).match("incident response, then incident response again")
+    assert result["catalog_version"] == "test"
+    assert result["indicators"] == [
+        {"mosid_family": "00109 - Signals Technician", "indicator": "incident response", "count": 2}
+    ]
+
+
+def test_keywords_and_sources_list_the_catalog():
+    matcher = IndicatorMatcher(CATALOG)
+    assert set(matcher.keywords) == {
+        "incident response", "cyber incident response", "equipment custodian", "casevac", "medical evacuation"
+    }
+    assert len(matcher.sources) == 5
+    assert ("00168 - Medical Technician", "casualty evacuation", "casevac") in matcher.sources
+    assert matcher.families == ("00109 - Signals Technician", "00168 - Medical Technician")
+
+
+def test_bundled_catalog_compiles():
+    matcher = IndicatorMatcher.from_path()
+    hits = matcher.scan("Served as platoon commander and ran training program.")
+    assert {hit.indicator for hit in hits} == {"platoon commander", "oversaw training"}
@@ -0,0 +1,153 @@
+"""Tests for the incremental MOSID↔NOC ingest."""
+
+import json
+import os
+
+import pytest
+
+import ingest_mosid_noc
+from ingest_mosid_noc import MANIFEST_NAME, ingest, ingest_incremental, ingest_streaming
+
+HEADER = "MOSID,CAF Trade Title,NOC 2021,Civilian Occupation Title,Role Description\n"
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    raw, out = tmp_path / "raw", tmp_path / "processed"
+    raw.mkdir()
+    (raw / "a_2023.csv").write_text(HEADER + "00010,Armour Officer,43100,Officers,Leads\n00105,Infantry,43102,NCMs,Fights\n")
+    (raw / "b_2024.tsv").write_text(HEADER.replace(",", "\t") + "00321\tSignals Officer\t21311\tEngineers\tBuilds\n")
+    return raw, out
+
+
+def stamp(out, date):
+    """Pretend the current outputs were transcribed on ``date``."""
+    path = out / "mosid_noc.json"
+    records = json.loads(path.read_text())
+    for record in records:
+        record["transcription_date"] = date
+    path.write_text(json.dumps(records))
+
+
+def test_unchanged_files_are_skipped_and_outputs_untouched(dirs):
+    raw, out = dirs
+    ingest(raw, out)
+    stamp(out, "2024-01-01")
+    before = (out / "mosid_noc.json").read_text()
+
+    report = ingest_incremental(raw, out)
+    assert report.files_read == [] and report.files_skipped == ["a_2023.csv", "b_2024.tsv"]
+    assert not report.written
+    assert (out / "mosid_noc.json").read_text() == before
+
+
+def test_changed_file_merges_only_its_records_and_keeps_dates(dirs, monkeypatch):
+    raw, out = dirs
+    ingest(raw, out)
+    stamp(out, "2024-01-01")
+    (raw / "a_2023.csv").write_text(HEADER + "00010,Armour Officer,43100,Officers,Leads\n00162,AC Op,72601,Controllers,Watches\n")
+    parsed = []
+    iter_file_rows = ingest_mosid_noc.iter_file_rows
+
+    def tracking_iter_file_rows(path):
+        parsed.append(path.name)
+        return iter_file_rows(path)
+
+    monkeypatch.setattr(ingest_mosid_noc, "iter_file_rows", tracking_iter_file_rows)
+
+    report = ingest_incremental(raw, out)
+    assert parsed == report.files_read == ["a_2023.csv"]
+    assert (report.added, report.updated, report.removed) == (1, 0, 1)
+    dates = {record["mosid"]: record["transcription_date"] for record in json.loads((out / "mosid_noc.json").read_text())}
+    assert dates["00010"] == dates["00321"] == "2024-01-01"
+    assert dates["00162"] != "2024-01-01"
+    assert "00105" not in dates
+
+
+def test_unchanged_file_is_reread_when_a_shadowing_file_goes_away(dirs):
+    raw, out = dirs
+    (raw / "b_2024.tsv").write_text(
+        HEADER.replace(",", "\t") + "00321\tSignals Officer\t21311\tEngineers\tBuilds\n00010\tArmour\t43100\tNew\tNew\n"
+    )
+    ingest(raw, out)
+    assert {r.civilian_title for r in ingest_incremental(raw, out).records if r.mosid == "00010"} == {"New"}
+
+    (raw / "b_2024.tsv").unlink()
+    report = ingest_incremental(raw, out)
+    assert report.files_removed == ["b_2024.tsv"] and report.files_read == ["a_2023.csv"]
+    assert [(r.mosid, r.civilian_title) for r in report.records] == [("00010", "Officers"), ("00105", "NCMs")]
+    manifest = json.loads((out / MANIFEST_NAME).read_text())
+    assert list(manifest["files"]) == ["a_2023.csv"]
+
+
+def test_incremental_matches_full_rebuild(dirs, tmp_path):
+    raw, out = dirs
+    ingest_incremental(raw, out)
+    (raw / "c_2025.csv").write_text(HEADER + "00105,Infantry,43102,Soldiers,Fights\n")
+    incremental = [r.to_row() for r in ingest_incremental(raw, out).records]
+    full = [r.to_row() for r in ingest(raw, tmp_path / "full")]
+    assert incremental == full
+
+
+def test_nested_files_win_in_the_same_order_for_every_ingest(dirs, tmp_path):
+    raw, out = dirs
+    ingest_incremental(raw, out)
+    # Part by part "z/c_2025.csv" is read before "z-b_2024.csv", although
+    # the plain strings sort the other way round.
+    (raw / "z").mkdir()
+    (raw / "z" / "c_2025.csv").write_text(HEADER + "00105,Infantry,43102,Soldiers,Fights\n")
+    (raw / "z-b_2024.csv").write_text(HEADER + "00105,Infantry,43102,Riflemen,Fights\n")
+    incremental = [r.to_row() for r in ingest_incremental(raw, out).records]
+    full = [r.to_row() for r in ingest(raw, tmp_path / "full")]
+    assert incremental == full
+    assert [row["civilian_title"] for row in full if row["mosid"] == "00105"] == ["Riflemen"]
+    ingest_streaming(raw, tmp_path / "streamed", workers=0)
+    assert (tmp_path / "streamed" / "mosid_noc.json").read_bytes() == (out / "mosid_noc.json").read_bytes()
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_streaming_matches_in_memory_ingest(dirs, tmp_path, workers):
+    raw, out = dirs
+    (raw / "c_2025.csv").write_text(
+        HEADER + "".join(f"{i:05d},Trade {i},{i % 7}{i:04d},Title,Desc\n" for i in range(50)) + "00105,Infantry,43102,Soldiers,Fights\n"
+    )
+    ingest_incremental(raw, out)
+    report = ingest_streaming(raw, tmp_path / "streamed", workers=workers, run_size=8)
+    assert report.runs > report.files == 3
+    for name in ("mosid_noc.csv", "mosid_noc.json"):
+        assert (tmp_path / "streamed" / name).read_bytes() == (out / name).read_bytes()
+    assert report.records_written == len(json.loads((out / "mosid_noc.json").read_text()))
+    assert not list((tmp_path / "streamed").glob(".ingest-runs-*"))
+
+
+def test_arrow_output_matches_csv(dirs):
+    pytest.importorskip("pyarrow")
+    from app.columnar import read_table
+
+    raw, out = dirs
+    ingest_incremental(raw, out, incremental=False, arrow=True)
+    table = read_table(out / "mosid_noc.arrow")
+    assert table.column_names == list(ingest_mosid_noc.OUTPUT_FIELDS)
+    assert table.to_pylist() == json.loads((out / "mosid_noc.json").read_text())
+
+    (out / "mosid_noc.arrow").unlink()
+    report = ingest_incremental(raw, out, arrow=True)
+    assert not report.written and (out / "mosid_noc.arrow").exists()
+
+
+def test_stale_arrow_output_is_refreshed(dirs):
+    pytest.importorskip("pyarrow")
+    from app.columnar import read_table
+
+    raw, out = dirs
+    arrow_path = out / "mosid_noc.arrow"
+    ingest_incremental(raw, out, incremental=False, arrow=True)
+    (raw / "c_2025.csv").write_text(HEADER + "00999,Cook,63200,Cooks,Cooks\n")
+    assert ingest_incremental(raw, out).written
+    # Make the leftover Arrow file unambiguously older than the new JSON.
+    json_mtime = (out / "mosid_noc.json").stat().st_mtime_ns
+    os.utime(arrow_path, ns=(json_mtime - 10**9, json_mtime - 10**9))
+
+    report = ingest_incremental(raw, out, arrow=True)
+    assert not report.written
+    assert read_table(arrow_path).to_pylist() == json.loads((out / "mosid_noc.json").read_text())
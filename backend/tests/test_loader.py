@@ -0,0 +1,90 @@
+"""Tests for the shared bulk loader."""
+
+import sqlite3
+
+from app.database import INDEXES, create_schema, fetch_mosid_profile
+from app.loader import bulk_load
+
+MNET_DATA = {
+    "00005: CRMN": [
+        {"noc_code": "14111", "civilian_title": "Data entry clerks", "task_statements": ["Enter data", "Verify data"]},
+        {"noc_code": "42101", "civilian_title": "Firefighters", "task_statements": ["Fight fires"]},
+    ],
+    "00008: ACS TECH": [
+        {"noc_code": "22310", "civilian_title": "Electrical technicians", "task_statements": ["Test circuits"]},
+    ],
+}
+RANK_DATA = [
+    {"rank": "Private", "responsibilities": ["Follow orders"]},
+    {"rank": "Corporal", "responsibilities": ["Supervise teams", "Maintain standards"]},
+]
+
+
+def _load():
+    conn = sqlite3.connect(":memory:")
+    create_schema(conn)
+    stats = bulk_load(conn, MNET_DATA, RANK_DATA, indexes=INDEXES)
+    return conn, stats
+
+
+def test_bulk_load_links_children_to_assigned_ids():
+    conn, _ = _load()
+    rows = conn.execute(
+        """
+        SELECT m.mosid, mm.noc, t.statement
+        FROM mosids m
+        JOIN mosid_noc_mappings mm ON mm.mosid = m.mosid
+        JOIN noc_task_statements t ON t.noc = mm.noc
+        ORDER BY mm.id, t.position
+        """
+    ).fetchall()
+    assert rows == [
+        ("00005", "14111", "Enter data"),
+        ("00005", "14111", "Verify data"),
+        ("00005", "42101", "Fight fires"),
+        ("00008", "22310", "Test circuits"),
+    ]
+    responsibilities = conn.execute(
+        """
+        SELECT r.rank_name, rr.responsibility
+        FROM ranks r JOIN rank_responsibilities rr ON rr.rank_id = r.id
+        ORDER BY rr.id
+        """
+    ).fetchall()
+    assert responsibilities[-1] == ("Corporal", "Maintain standards")
+
+
+def test_bulk_load_reports_counts_and_creates_indexes():
+    conn, stats = _load()
+    assert stats.rows_by_table == {
+        "mosids": 2,
+        "nocs": 3,
+        "noc_task_statements": 4,
+        "mosid_noc_mappings": 3,
+        "mosid_noc_titles": 0,
+        "ranks": 2,
+        "rank_responsibilities": 3,
+        "search_index": 12,
+    }
+    assert stats.rows == 29
+    assert stats.rows_per_second > 0
+    index_names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert "idx_mosid_noc_mappings_mosid" in index_names
+
+
+def test_shared_noc_statements_are_stored_once():
+    conn = sqlite3.connect(":memory:")
+    create_schema(conn)
+    shared = {"noc_code": "14111", "civilian_title": "Data entry clerks", "task_statements": ["Enter data", "Verify data"]}
+    mnet_data = {
+        "00005: CRMN": [shared],
+        "00008: ACS TECH": [{**shared, "civilian_title": "Clerks", "task_statements": ["Verify data", "Enter data"]}],
+    }
+    stats = bulk_load(conn, mnet_data, [], indexes=INDEXES)
+    assert stats.rows_by_table["noc_task_statements"] == 2
+    assert stats.rows_by_table["mosid_noc_mappings"] == 2
+    assert conn.execute("SELECT mapping_id, title FROM mosid_noc_titles").fetchall() == [(2, "Clerks")]
+    for code, title in (("00005", "Data entry clerks"), ("00008", "Clerks")):
+        (equivalency,) = fetch_mosid_profile(conn, code)["equivalencies"]
+        assert equivalency["civilian_title"] == title
+        assert equivalency["task_statements"] == ["Enter data", "Verify data"]
@@ -1,23 +1,29 @@
-from app.mcp_server import mcp
+import asyncio
+
+from app.mcp_app import mcp
+
+
+def call_tool(name, **arguments):
+    """Invoke a registered tool function, awaiting it on a fresh event loop."""
+    tool = mcp._tool_manager.get_tool(name)
+    assert tool.is_async
+    return asyncio.run(tool.fn(**arguments))
 
 def test_get_rank_data_tool_found():
     """Test the get_rank_data tool when data is found."""
-    tool = mcp._tool_manager.get_tool("get_rank_data")
-    result = tool.fn(rank_name="Captain")
+    result = call_tool("get_rank_data", rank_name="Captain")
     assert result["rank"] == "Captain"
     assert "responsibilities" in result
     assert isinstance(result["responsibilities"], list)
 
 def test_get_rank_data_tool_not_found():
     """Test the get_rank_data tool when data is not found."""
-    tool = mcp._tool_manager.get_tool("get_rank_data")
-    result = tool.fn(rank_name="General")
+    result = call_tool("get_rank_data", rank_name="General")
     assert result == {}
 
 def test_get_mosid_data_tool_found():
     """Test the get_mosid_data tool when data is found."""
-    tool = mcp._tool_manager.get_tool("get_mosid_data")
-    result = tool.fn(mosid_code="00005")
+    result = call_tool("get_mosid_data", mosid_code="00005")
     assert result["mosid"] == "00005"
     assert "title" in result
     assert "equivalencies" in result
@@ -26,15 +32,64 @@ def test_get_mosid_data_tool_found():
 
 def test_get_mosid_data_tool_not_found():
     """Test the get_mosid_data tool when data is not found."""
-    tool = mcp._tool_manager.get_tool("get_mosid_data")
-    result = tool.fn(mosid_code="invalid-mosid")
+    result = call_tool("get_mosid_data", mosid_code="invalid-mosid")
     assert result == {}
 
 def test_get_mosid_data_batch_tool():
     """Test the get_mosid_data_batch tool."""
-    tool = mcp._tool_manager.get_tool("get_mosid_data_batch")
-    result = tool.fn(mosid_codes=["00005", "00008"])
+    result = call_tool("get_mosid_data_batch", mosid_codes=["00005", "00008"])
     assert "00005" in result
     assert "00008" in result
     assert "equivalencies" in result["00005"]
     assert "equivalencies" in result["00008"]
+
+def test_get_mosid_data_batch_tool_over_the_in_list_limit():
+    """Large batches stay on the read-only pooled connections."""
+    codes = [f"{index:05d}" for index in range(600)]
+    result = call_tool("get_mosid_data_batch", mosid_codes=codes)
+    assert len(result) == 600
+    assert result["00005"]["mosid"] == "00005"
+
+def test_get_noc_mosids_tool():
+    """Test the reverse NOC lookup tool."""
+    tool = mcp._tool_manager.get_tool("get_noc_mosids")
+    result = tool.fn(noc_code="14111")
+    assert result["noc_code"] == "14111"
+    assert any(mapping["mosid"] == "00005" for mapping in result["mosids"])
+    assert tool.fn(noc_code="00000") == {}
+
+def test_similar_mosids_tool():
+    """Test the similar-trade tool."""
+    tool = mcp._tool_manager.get_tool("similar_mosids")
+    result = tool.fn(mosid_code="00005", limit=3)
+    assert result["mosid"] == "00005"
+    assert 0 < len(result["similar"]) <= 3
+    assert "00005" not in [item["mosid"] for item in result["similar"]]
+    assert tool.fn(mosid_code="99999") == {}
+
+def test_recommend_nocs_tool():
+    """Test the NOC recommendation tool for free text and for a MOSID."""
+    tool = mcp._tool_manager.get_tool("recommend_nocs")
+    by_text = tool.fn(text="firefighters respond to fires", limit=5)
+    assert "42101" in [item["noc_code"] for item in by_text["nocs"]]
+    by_mosid = tool.fn(mosid_code="00005", limit=5)
+    mapped = {item["noc_code"] for item in call_tool("get_mosid_data", mosid_code="00005")["equivalencies"]}
+    assert not mapped & {item["noc_code"] for item in by_mosid["nocs"]}
+
+def test_search_tool():
+    """Test the full-text search tool."""
+    result = call_tool("search", query="data entry", limit=2)
+    assert len(result["results"]) == 2
+    assert result["next_offset"] == 2
+
+def test_match_indicators_tool():
+    """Test the indicator matcher tool."""
+    tool = mcp._tool_manager.get_tool("match_indicators")
+    result = tool.fn(text="Served as section commander.")
+    assert result["hits"][0]["indicator"] == "led section"
+
+def test_translate_tool():
+    """Test the batch translation tool."""
+    tool = mcp._tool_manager.get_tool("translate")
+    result = tool.fn(entries=[{"indicators": ["incident response"]}])
+    assert result["results"][0]["bullets"][0]["trigger"] == "cybersecurity_response"
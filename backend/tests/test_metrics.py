@@ -0,0 +1,79 @@
+"""Tests for the metrics registry and request instrumentation."""
+
+import asyncio
+import json
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.database import fetch_mosid_profile
+from app.metrics import Instrumentation, Registry
+from app.pool import AsyncConnectionPool, connect_pooled
+
+
+def samples(text):
+    return dict(line.rsplit(" ", 1) for line in text.splitlines() if line and not line.startswith("#"))
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    histogram = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value, ("/a",))
+    text = registry.render()
+    assert "# TYPE latency_seconds histogram" in text
+    assert samples(text) == {
+        'latency_seconds_bucket{route="/a",le="0.1"}': "1",
+        'latency_seconds_bucket{route="/a",le="1"}': "3",
+        'latency_seconds_bucket{route="/a",le="+Inf"}': "4",
+        'latency_seconds_sum{route="/a"}': "4.05",
+        'latency_seconds_count{route="/a"}': "4",
+    }
+
+
+def test_tool_decorator_times_calls_and_failures():
+    metrics = Instrumentation()
+
+    @metrics.tool("lookup")
+    async def lookup(code):
+        if not code:
+            raise ValueError("empty")
+        return {"code": code}
+
+    assert asyncio.run(lookup("00005")) == {"code": "00005"}
+    try:
+        asyncio.run(lookup(""))
+    except ValueError:
+        pass
+    assert metrics.tool_duration.count(("lookup", "ok")) == 1
+    assert metrics.tool_duration.count(("lookup", "error")) == 1
+    assert metrics.tool_in_flight.value(("lookup",)) == 0
+
+
+def test_middleware_counts_queries_per_route_and_writes_traces(tmp_path, db_path):
+    metrics = Instrumentation(trace_path=tmp_path / "trace.jsonl")
+    pool = AsyncConnectionPool(db_path, size=1, connect=metrics.connect(connect_pooled))
+    app = FastAPI()
+    app.add_middleware(metrics.middleware)
+
+    @app.get("/mosids/{code}")
+    async def read(code: str):
+        return await pool.run(metrics.timed_query, fetch_mosid_profile, code)
+
+    client = TestClient(app)
+    assert client.get("/mosids/00005").status_code == 200
+    assert client.get("/mosids/00008").status_code == 200
+    assert client.get("/missing").status_code == 404
+
+    assert metrics.http_duration.count(("GET", "/mosids/{code}", "200")) == 2
+    assert metrics.http_duration.count(("GET", "<unmatched>", "404")) == 1
+    assert metrics.db_duration.count(("connect",)) == 1
+    assert metrics.db_duration.count(("query",)) == 2
+    assert metrics.db_statements.value() == 2
+
+    metrics.close()
+    traces = [json.loads(line) for line in (tmp_path / "trace.jsonl").read_text().splitlines()]
+    assert [trace["name"] for trace in traces] == ["GET /mosids/{code}", "GET /mosids/{code}", "GET <unmatched>"]
+    assert [span["name"] for span in traces[0]["spans"]] == ["db.connect", "db.query"]
+    assert [span["name"] for span in traces[1]["spans"]] == ["db.query"]
+    assert [trace["queries"] for trace in traces] == [1, 1, 0]
@@ -0,0 +1,165 @@
+"""Tests for the concurrent MNET scraper.
+
+The browser test runs against a saved copy of the search page served from
+``tests/fixtures/mnet`` and is skipped when Chromium is not installed.
+"""
+
+import asyncio
+import functools
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from mnet_scraper import TokenBucket, backoff_delay, retry
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "mnet"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_allows_burst_then_paces(monkeypatch):
+    clock = FakeClock()
+    slept = []
+
+    async def fake_sleep(seconds):
+        slept.append(seconds)
+        clock.now += seconds
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    bucket = TokenBucket(rate=2.0, capacity=2, clock=clock)
+
+    async def take(count):
+        for _ in range(count):
+            await bucket.acquire()
+
+    asyncio.run(take(4))
+    assert slept == [pytest.approx(0.5), pytest.approx(0.5)]
+    assert clock.now == pytest.approx(1.0)
+
+
+def test_backoff_delay_is_exponential_and_capped():
+    assert backoff_delay(1, base=1.0, jitter=0) == 1.0
+    assert backoff_delay(3, base=1.0, jitter=0) == 4.0
+    assert backoff_delay(10, base=1.0, cap=5.0, jitter=0) == 5.0
+    assert 2.0 <= backoff_delay(2, base=1.0, jitter=0.5) <= 3.0
+
+
+def test_retry_recovers_then_gives_up():
+    calls = []
+
+    async def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise ConnectionError("transient")
+        return "ok"
+
+    assert asyncio.run(retry(flaky, attempts=3, base_delay=0)) == "ok"
+
+    async def broken():
+        raise ConnectionError("down")
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(retry(broken, attempts=2, base_delay=0))
+
+    async def wrong_type():
+        calls.append(1)
+        raise KeyError("not retried")
+
+    calls.clear()
+    with pytest.raises(KeyError):
+        asyncio.run(retry(wrong_type, attempts=5, base_delay=0, retry_on=(ConnectionError,)))
+    assert len(calls) == 1
+
+
+@pytest.fixture
+def mnet_site():
+    """Serve the saved search page from a local stand-in server."""
+
+    handler = functools.partial(SimpleHTTPRequestHandler, directory=str(FIXTURES))
+    handler.log_message = lambda *args: None
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/cafSearch.html"
+    server.shutdown()
+    server.server_close()
+
+
+def test_scrape_mosids_against_fixture(mnet_site):
+    async_api = pytest.importorskip("playwright.async_api")
+    from mnet_scraper import list_mosid_labels, scrape_mosids
+
+    async def scrape():
+        async with async_api.async_playwright() as playwright:
+            try:
+                browser = await playwright.chromium.launch()
+            except async_api.Error as exc:
+                pytest.skip(f"Chromium is not available: {str(exc).splitlines()[0]}")
+            try:
+                page = await browser.new_page()
+                labels = await list_mosid_labels(page, mnet_site)
+                seen = []
+                report = await scrape_mosids(
+                    labels,
+                    url=mnet_site,
+                    concurrency=2,
+                    rate=50,
+                    table_timeout_ms=500,
+                    on_result=lambda label, _: seen.append(label),
+                    browser=browser,
+                )
+            finally:
+                await browser.close()
+        return labels, seen, report
+
+    labels, seen, report = asyncio.run(scrape())
+    assert labels == ["00005: CRMN", "00101: SAR TECH", "00010: INFMN"]
+    assert sorted(seen) == sorted(labels) and not report.failed
+    assert report.scraped["00005: CRMN"][0] == {
+        "noc_code": "14111",
+        "civilian_title": "Data entry clerks",
+        "task_statements": [
+            "Receive and register invoices, forms, records and other documents for data capture",
+            "Input data into computerized databases, spreadsheets or other templates",
+        ],
+    }
+    assert [noc["noc_code"] for noc in report.scraped["00005: CRMN"]] == ["14111", "13110"]
+    assert report.scraped["00010: INFMN"] == []
+
+
+def test_scrape_mosids_retries_and_fails_when_results_never_render(mnet_site):
+    async_api = pytest.importorskip("playwright.async_api")
+    from mnet_scraper import scrape_mosids
+
+    stalled = mnet_site.replace("cafSearch.html", "cafSearchStalled.html")
+
+    async def scrape():
+        async with async_api.async_playwright() as playwright:
+            try:
+                browser = await playwright.chromium.launch()
+            except async_api.Error as exc:
+                pytest.skip(f"Chromium is not available: {str(exc).splitlines()[0]}")
+            try:
+                return await scrape_mosids(
+                    ["00005: CRMN"],
+                    url=stalled,
+                    concurrency=1,
+                    rate=50,
+                    attempts=2,
+                    table_timeout_ms=200,
+                    browser=browser,
+                )
+            finally:
+                await browser.close()
+
+    report = asyncio.run(scrape())
+    assert report.scraped == {}
+    assert "00005: CRMN" in report.failed
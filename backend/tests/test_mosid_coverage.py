@@ -0,0 +1,73 @@
+"""Tests for the MOSID coverage diff."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from mosid_coverage import coverage, diff_mosids, json_titles, labels_to_titles, main, site_titles
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "mnet"
+
+
+def test_diff_reports_added_removed_and_renamed():
+    site = {"00005": "CRMN", "00101": "SAR TECH", "00200": "NEW TRADE"}
+    local = {"00005": "crmn", "00101": "SAR TECHNICIAN", "00010": "INFMN"}
+    diff = diff_mosids(site, local)
+    assert diff.added == ("00200",)
+    assert diff.removed == ("00010",)
+    assert diff.renamed == {"00101": ("SAR TECHNICIAN", "SAR TECH")}
+    assert not diff.in_sync
+    assert diff_mosids(site, site).in_sync
+
+
+def test_labels_to_titles_normalizes_labels():
+    labels = ["Choose a MOSID", "00005:  CRMN ", "00005: DUPLICATE", "00101: SAR  TECH"]
+    assert labels_to_titles(labels) == {"00005": "CRMN", "00101": "SAR TECH"}
+
+
+def test_site_snapshot_from_saved_page_or_label_list(tmp_path):
+    pytest.importorskip("bs4")
+    assert site_titles(FIXTURES / "cafSearch.html") == {"00005": "CRMN", "00101": "SAR TECH", "00010": "INFMN"}
+    labels = tmp_path / "labels.txt"
+    labels.write_text("00005: CRMN\n00300: INF OFF\n")
+    assert site_titles(labels) == {"00005": "CRMN", "00300": "INF OFF"}
+
+
+def test_coverage_against_json_and_db(tmp_path):
+    from app.database import RANKS_PATH, build_database
+
+    snapshot = tmp_path / "labels.txt"
+    snapshot.write_text("00005: CRMN\n00300: INF OFF\n")
+    crosswalk = tmp_path / "mnet_data.json"
+    crosswalk.write_text(json.dumps({"00005: CRMN": [], "00010: INFMN": []}))
+
+    diff = coverage("json", snapshot, json_path=crosswalk)
+    assert (diff.added, diff.removed) == (("00300",), ("00010",))
+
+    db_path = tmp_path / "mnet.db"
+    build_database(db_path, crosswalk, RANKS_PATH)
+    assert coverage("db", snapshot, db_path=db_path).as_dict() == diff.as_dict()
+
+
+def test_cli_json_output_and_check_status(tmp_path, capsys):
+    snapshot = tmp_path / "labels.txt"
+    snapshot.write_text("00005: CRMN\n")
+    crosswalk = tmp_path / "mnet_data.json"
+    crosswalk.write_text(json.dumps({"00005: CRMN": []}))
+    args = ["--site-snapshot", str(snapshot), "--against", "json", "--json-path", str(crosswalk)]
+
+    assert main([*args, "--format", "json", "--check"]) == 0
+    assert json.loads(capsys.readouterr().out)["added"] == []
+
+    snapshot.write_text("00005: CRMN\n00009: ARTYMN - AD\n")
+    assert main([*args, "--check"]) == 1
+    assert "  - 00009" in capsys.readouterr().out
+
+
+def test_json_titles_reads_an_arrow_directory(tmp_path):
+    pytest.importorskip("pyarrow")
+    from app.columnar import write_mnet_tables
+
+    write_mnet_tables({"00005: CRMN": [], "00008: ACS TECH": []}, tmp_path)
+    assert json_titles(tmp_path) == {"00005": "CRMN", "00008": "ACS TECH"}
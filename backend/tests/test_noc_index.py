@@ -0,0 +1,36 @@
+"""Tests for the reverse NOC→MOSID index."""
+
+from app.noc_index import build_noc_index, index_keys
+
+ROWS = [
+    ("14111", "Data entry clerks", "00005", "CRMN"),
+    ("14111", "Data entry clerks", "00008", "ACS TECH"),
+    ("14112", "Desktop publishing operators", "00008", "ACS TECH"),
+    ("42101", "Firefighters", "00005", "CRMN"),
+]
+
+
+def test_index_keys_cover_group_prefixes():
+    assert index_keys("14111") == ["14111", "14", "141", "1411"]
+    assert index_keys("1411") == ["1411", "14", "141"]
+
+
+def test_lookup_by_full_code():
+    index = build_noc_index(ROWS, version="v1")
+    result = index.lookup("14111")
+    assert result["noc_code"] == "14111"
+    assert [mapping["mosid"] for mapping in result["mosids"]] == ["00005", "00008"]
+    assert result["mosids"][0] == {
+        "mosid": "00005",
+        "title": "CRMN",
+        "noc_code": "14111",
+        "civilian_title": "Data entry clerks",
+    }
+
+
+def test_lookup_by_prefix_spans_occupations():
+    index = build_noc_index(ROWS)
+    pairs = [(m["noc_code"], m["mosid"]) for m in index.lookup("141")["mosids"]]
+    assert pairs == [("14111", "00005"), ("14111", "00008"), ("14112", "00008")]
+    assert index.lookup("4") == {}
+    assert index.lookup("99999") == {}
@@ -0,0 +1,70 @@
+"""Tests for the bounded async SQLite connection pool."""
+
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+
+from app.database import (
+    BATCH_IN_LIMIT,
+    fetch_mosid_profile,
+    fetch_mosid_profiles,
+)
+from app.pool import AsyncConnectionPool
+
+
+def test_run_executes_query_on_pooled_connection(db_path):
+    pool = AsyncConnectionPool(db_path, size=2)
+    profile = asyncio.run(pool.run(fetch_mosid_profile, "00005"))
+    assert profile["mosid"] == "00005"
+    stats = pool.stats()
+    assert stats["open"] == 1
+    assert stats["idle"] == 1
+    assert stats["in_use"] == 0
+
+
+def test_large_batch_runs_on_read_only_pooled_connection(db_path):
+    pool = AsyncConnectionPool(db_path, size=1)
+    codes = ["00005", *(f"X{number}" for number in range(BATCH_IN_LIMIT + 100)), "00008"]
+    profiles, missing = asyncio.run(pool.run(fetch_mosid_profiles, codes))
+    assert list(profiles) == ["00005", "00008"]
+    assert len(missing) == BATCH_IN_LIMIT + 100
+
+
+def test_pool_is_bounded_and_records_queue_waits(db_path):
+    pool = AsyncConnectionPool(db_path, size=1)
+    release = threading.Event()
+
+    def blocking_query(conn):
+        release.wait(timeout=5)
+        return conn.execute("SELECT 1").fetchone()[0]
+
+    async def scenario():
+        first = asyncio.create_task(pool.run(blocking_query))
+        await asyncio.sleep(0.05)
+        second = asyncio.create_task(pool.run(lambda conn: conn.execute("SELECT 2").fetchone()[0]))
+        await asyncio.sleep(0.05)
+        assert pool.stats()["waiting"] == 1
+        release.set()
+        return await asyncio.gather(first, second)
+
+    assert asyncio.run(scenario()) == [1, 2]
+    stats = pool.stats()
+    assert stats["open"] == 1
+    assert stats["waits"] == 1
+    assert stats["max_wait_seconds"] > 0
+
+
+def test_pool_serves_callers_on_different_event_loops(db_path):
+    pool = AsyncConnectionPool(db_path, size=1)
+    for code in ("00005", "00008"):
+        assert asyncio.run(pool.run(fetch_mosid_profile, code))["mosid"] == code
+    assert pool.stats()["acquisitions"] == 2
+
+
+def test_pooled_connections_are_read_only(db_path):
+    pool = AsyncConnectionPool(db_path, size=1)
+    with pytest.raises(sqlite3.OperationalError):
+        asyncio.run(pool.run(lambda conn: conn.execute("DELETE FROM ranks")))
+    assert pool.stats()["in_use"] == 0
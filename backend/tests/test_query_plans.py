@@ -0,0 +1,37 @@
+"""Query-plan checks guarding the lookup indexes against full table scans."""
+
+import sqlite3
+
+import pytest
+
+from app.database import (
+    MOSID_PROFILE_SQL,
+    MOSID_PROFILES_IN_SQL,
+    RANK_RESPONSIBILITIES_SQL,
+)
+
+LOOKUPS = {
+    "mosid_profile": (MOSID_PROFILE_SQL, ("00005",)),
+    "mosid_batch_in": (MOSID_PROFILES_IN_SQL.format(placeholders="?, ?, ?"), ("00005", "00008", "99999")),
+    "rank_responsibilities": (RANK_RESPONSIBILITIES_SQL, ("Private",)),
+}
+
+
+def query_plan(conn: sqlite3.Connection, sql: str, params: tuple) -> list[str]:
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+@pytest.mark.parametrize("name", sorted(LOOKUPS))
+def test_lookup_uses_key_searches(conn, name):
+    sql, params = LOOKUPS[name]
+    plan = query_plan(conn, sql, params)
+    assert plan
+    for step in plan:
+        assert step.startswith("SEARCH "), f"{name} falls back to a scan: {plan}"
+        if step.startswith(("SEARCH m ", "SEARCH mt ")):
+            # One ``mosids`` row per profile and at most one title override
+            # per mapping, each read through its unique index.
+            continue
+        # WITHOUT ROWID tables hold their rows in the primary key b-tree.
+        assert "COVERING INDEX" in step or "PRIMARY KEY" in step, f"{name} reads table rows: {plan}"
+    assert not any("TEMP B-TREE" in step for step in plan)
@@ -0,0 +1,76 @@
+"""Tests for the TF-IDF similar-trade and NOC recommendation index."""
+
+import math
+
+import pytest
+
+from app.recommend import CsrRows, Vectorizer, build_recommender, scipy_available, tokenize
+
+PROFILES = [
+    ("00005", {"title": "CRMN", "equivalencies": [
+        {"noc_code": "14111", "civilian_title": "Data entry clerks", "task_statements": ["Enter data", "Verify data entries"]},
+    ]}),
+    ("00008", {"title": "ACS TECH", "equivalencies": [
+        {"noc_code": "22310", "civilian_title": "Electrical technicians", "task_statements": ["Test electrical circuits"]},
+    ]}),
+    ("00010", {"title": "DATA CLK", "equivalencies": [
+        {"noc_code": "14111", "civilian_title": "Data entry clerks", "task_statements": ["Enter data", "Verify data entries"]},
+    ]}),
+    ("00020", {"title": "FIRE FTR", "equivalencies": []}),
+]
+NOCS = [
+    ("14111", "Data entry clerks", ["Enter data", "Verify data entries"]),
+    ("14112", "Records clerks", ["File records", "Verify data"]),
+    ("22310", "Electrical technicians", ["Test electrical circuits"]),
+    ("42101", "Firefighters", ["Fight fires"]),
+]
+BACKENDS = ["python", pytest.param("scipy", marks=pytest.mark.skipif(not scipy_available(), reason="scipy missing"))]
+
+
+def test_tokenize_drops_stop_words_and_folds_plurals():
+    assert tokenize("Verify the data entries, and test 2 circuits") == ["verify", "data", "entry", "test", "circuit"]
+
+
+def test_vectorizer_rows_are_unit_length():
+    vectorizer = Vectorizer.fit([tokenize("enter data"), tokenize("test circuits")])
+    row = vectorizer.transform(tokenize("enter data data"))
+    assert math.isclose(sum(weight * weight for weight in row.values()), 1.0)
+    assert vectorizer.transform(["unknown"]) == {}
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_similar_mosids_rank_shared_duties_first(backend):
+    index = build_recommender(PROFILES, NOCS, backend=backend)
+    result = index.similar_mosids("00005")
+    assert result["title"] == "CRMN"
+    assert [item["mosid"] for item in result["similar"]] == ["00010"]
+    assert index.similar_mosids("99999") == {}
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_recommendations_skip_mapped_nocs(backend):
+    index = build_recommender(PROFILES, NOCS, backend=backend)
+    nocs = [item["noc_code"] for item in index.recommend_for_mosid("00005")["nocs"]]
+    assert nocs == ["14112"]
+    assert index.recommend_for_text("fight fires", limit=1)["nocs"][0]["noc_code"] == "42101"
+    assert index.recommend_for_text("zzz")["nocs"] == []
+
+
+@pytest.mark.skipif(not scipy_available(), reason="scipy missing")
+def test_backends_agree():
+    csr = build_recommender(PROFILES, NOCS, top_k=2, backend="scipy")
+    sparse = build_recommender(PROFILES, NOCS, top_k=2, backend="python")
+    assert csr.similar == sparse.similar
+    assert csr.recommended == sparse.recommended
+    assert csr.recommend_for_text("verify data") == sparse.recommend_for_text("verify data")
+
+
+@pytest.mark.skipif(not scipy_available(), reason="scipy missing")
+def test_csr_single_query_matches_block_product():
+    vectorizer = Vectorizer.fit([tokenize(text) for text in ("enter data", "verify data", "test circuits", "fight fires")])
+    rows = CsrRows([vectorizer.transform(tokenize(text)) for text in ("enter data", "verify data", "test circuits")], len(vectorizer.vocabulary))
+    query = vectorizer.transform(tokenize("enter and verify data"))
+    (single,) = rows.top_k([query], 3, [{0}])
+    assert single == rows.top_k([query, {}], 3, [{0}, set()])[0]
+    assert [index for index, _ in single] == [1]
+    assert rows.top_k([{}], 3) == [()]
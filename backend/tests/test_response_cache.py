@@ -0,0 +1,60 @@
+"""Tests for the pre-serialized response cache."""
+
+import asyncio
+import dataclasses
+import json
+
+from app import service
+from app.response_cache import ResponseCache, etag_for, etag_matches
+from app.snapshot import SnapshotStore
+
+
+def test_get_and_put_count_hits_and_misses():
+    cache = ResponseCache()
+    assert cache.get(("00005", "v1")) is None
+    stored = cache.put(("00005", "v1"), b'{"mosid":"00005"}')
+    assert cache.get(("00005", "v1")) is stored
+    assert stored.etag == etag_for(stored.body)
+    assert cache.get(("00005", "v2")) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_cached_mosid_keys_entries_by_the_version_it_read(monkeypatch, db_path):
+    store = SnapshotStore(db_path, check_interval=3600)
+    cache = ResponseCache()
+    monkeypatch.setattr(service, "SNAPSHOTS", store)
+    monkeypatch.setattr(service, "RESPONSE_CACHE", cache)
+
+    first = asyncio.run(service.cached_mosid("00005"))
+    assert json.loads(first.body)["mosid"] == "00005"
+    assert asyncio.run(service.cached_mosid("00005")) is first
+    assert asyncio.run(service.cached_mosid("99999")) is None
+    assert cache.get(("00005", store.latest.version)) is first
+
+    renamed = dataclasses.replace(store.latest, version="v2", mosids={"00005": store.latest.mosids["00005"]._replace(title="NEW")})
+    store.swap(renamed)
+    entries, not_found = asyncio.run(service.cached_mosids(["00005", "00008"]))
+    assert json.loads(entries["00005"].body)["title"] == "NEW"
+    assert cache.get(("00005", "v2")) is entries["00005"]
+    assert not_found == ["00008"]
+
+
+def test_lru_eviction_respects_byte_bound():
+    cache = ResponseCache(max_bytes=10)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    cache.get("a")
+    cache.put("c", b"cccc")
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] == 8
+
+
+def test_etag_matches_handles_lists_weak_tags_and_wildcard():
+    etag = '"abc"'
+    assert etag_matches('"x", W/"abc"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"x"', etag)
+    assert not etag_matches(None, etag)
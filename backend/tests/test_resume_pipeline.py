@@ -0,0 +1,106 @@
+"""Tests for the batch résumé pipeline."""
+
+import json
+import time
+from datetime import date
+
+import pytest
+
+from app.resume_pipeline import STAGES, PipelineContext, ResumeJobManager, iter_chunks, process_lines, run_batch
+
+MEMBER = {
+    "record_id": "m-1",
+    "rank_current": "Sergeant",
+    "mosid": "00005",
+    "enrolment_date": "2010-06-15",
+    "release_date": "2024-06-01",
+    "security_clearance_level": "Secret",
+    "positions": [
+        {
+            "title": "Section Commander",
+            "unit": "1 PPCLI",
+            "start_date": "2019-07",
+            "duties": ["Served as section commander", "Coordinated resupply for the company"],
+        }
+    ],
+    "deployments": [{"mission": "Op REASSURANCE", "role": "Platoon leader", "theatre": "Latvia"}],
+    "awards": [{"name": "CD", "date": "2022-01-10"}],
+    "medical_category": "restricted",
+}
+
+
+@pytest.fixture(scope="module")
+def ctx(built_db_path):
+    context = PipelineContext(built_db_path, as_of=date(2025, 1, 1))
+    yield context
+    context.close()
+
+
+def test_record_resolves_every_stage(ctx):
+    (line,), timings, failed = process_lines(ctx, [(1, json.dumps(MEMBER))])
+    result = json.loads(line)
+    assert failed == 0 and set(timings) == set(STAGES)
+    resume = result["resume"]
+    assert result["record_id"] == "m-1"
+    assert resume["summary"] == {"security_clearance": "Active Secret Clearance"}
+    assert resume["professional_profile"]["headline"] == "Data entry clerks | CRMN | 13 years of experience"
+    assert 3 <= len(resume["professional_profile"]["summary_bullets"]) <= 5
+    (position,) = resume["experience"]
+    assert position["end_date"] == "Present"
+    assert len(position["achievements"]) == 2
+    assert resume["skills"]["leadership"]
+    assert resume["awards"] == [{"name": "CD", "year": 2022}]
+    assert "medical_category" not in json.dumps(resume)
+    assert "Missing summary.full_name" in result["warnings"]
+
+
+def test_bad_records_are_reported_not_fatal(ctx):
+    lines = [(1, "{not json"), (2, json.dumps({"record_id": "x", "positions": [None]})), (3, json.dumps({}))]
+    output, _, failed = process_lines(ctx, lines)
+    results = [json.loads(line) for line in output]
+    assert failed == 2
+    assert results[0]["line"] == 1 and "error" in results[0]
+    assert results[1]["record_id"] == "x" and "error" in results[1]
+    assert results[2]["record_id"] == "3" and "resume" in results[2]
+
+
+def test_iter_chunks_numbers_lines_and_skips_blanks():
+    chunks = list(iter_chunks(["a\n", "\n", "b\n", "c\n"], chunk_size=2))
+    assert chunks == [[(1, "a\n"), (3, "b\n")], [(4, "c\n")]]
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_run_batch_keeps_input_order(tmp_path, built_db_path, workers):
+    source = tmp_path / "cohort.jsonl"
+    source.write_text("".join(json.dumps({**MEMBER, "record_id": f"m-{i}"}) + "\n" for i in range(23)))
+    seen = []
+    state = run_batch(
+        source,
+        tmp_path / "resumes.jsonl",
+        built_db_path,
+        workers=workers,
+        chunk_size=4,
+        max_in_flight=2,
+        progress=lambda progress: seen.append(progress.records_done),
+    )
+    records = [json.loads(line) for line in (tmp_path / "resumes.jsonl").read_text().splitlines()]
+    assert [record["record_id"] for record in records] == [f"m-{i}" for i in range(23)]
+    assert state.records_done == state.records_read == 23
+    assert seen == sorted(seen) and seen[-1] == 23
+    assert state.stage_seconds["mosid"] > 0
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_finished_jobs_are_pruned_with_their_results(tmp_path, built_db_path):
+    manager = ResumeJobManager(built_db_path, tmp_path, retention_seconds=60, max_finished=2)
+    now = time.time()
+    jobs = [manager.new_job() for _ in range(5)]
+    for job, finished_at in zip(jobs, [now - 120, now - 30, now - 20, now - 10, None]):
+        job.finished_at = finished_at
+        job.output_path.write_text("{}\n")
+
+    # The expired job goes, then the oldest beyond the two most recent.
+    assert manager.prune() == [jobs[0].job_id, jobs[1].job_id]
+    assert manager.get(jobs[0].job_id) is None and not jobs[0].output_path.exists()
+    assert not jobs[1].output_path.exists()
+    assert all(manager.get(job.job_id) is job and job.output_path.exists() for job in jobs[2:])
@@ -0,0 +1,75 @@
+"""Tests for the scrape write-ahead journal."""
+
+import json
+import os
+
+import pytest
+
+from scrape_journal import ScrapeJournal, compact, journal_path_for, load_with_journal, read_journal
+
+NOCS = [{"noc_code": "14111", "civilian_title": "Data entry clerks", "task_statements": []}]
+
+
+def test_journal_round_trip_and_later_entries_win(tmp_path):
+    path = tmp_path / "mnet_data.journal.jsonl"
+    with ScrapeJournal(path) as journal:
+        journal.append("00005: CRMN", [])
+        journal.append("00101: SAR TECH", NOCS)
+    with ScrapeJournal(path) as journal:
+        journal.append("00005: CRMN", NOCS)
+    assert read_journal(path) == {"00005: CRMN": NOCS, "00101: SAR TECH": NOCS}
+
+
+def test_fsync_is_batched(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr(os, "fsync", lambda fd: synced.append(fd))
+    with ScrapeJournal(tmp_path / "j.jsonl", fsync_every=3, fsync_interval=3600) as journal:
+        for index in range(7):
+            journal.append(f"{index:05d}: X", [])
+        assert journal.fsyncs == len(synced) == 2
+    assert journal.fsyncs == len(synced) == 3
+
+
+def test_torn_final_line_is_ignored(tmp_path):
+    path = tmp_path / "j.jsonl"
+    path.write_text(json.dumps({"mosid": "00005: CRMN", "nocs": NOCS}) + "\n" + '{"mosid": "00101: SAR')
+    assert read_journal(path) == {"00005: CRMN": NOCS}
+
+
+def test_append_after_torn_tail_starts_a_fresh_line(tmp_path):
+    path = tmp_path / "j.jsonl"
+    path.write_text(json.dumps({"mosid": "00005: CRMN", "nocs": []}) + "\n" + '{"mosid": "00101: SAR')
+    with ScrapeJournal(path, fsync_every=1) as journal:
+        journal.append("00102: NEW", NOCS)
+    assert read_journal(path) == {"00005: CRMN": [], "00102: NEW": NOCS}
+    assert path.read_text().endswith("\n")
+
+
+def test_compact_folds_journal_into_data_atomically(tmp_path):
+    data_path = tmp_path / "mnet_data.json"
+    data_path.write_text(json.dumps({"00005: CRMN": [], "00010: INFMN": []}))
+    journal_path = journal_path_for(data_path)
+    assert journal_path.name == "mnet_data.journal.jsonl"
+    with ScrapeJournal(journal_path) as journal:
+        journal.append("00005: CRMN", NOCS)
+        journal.append("00101: SAR TECH", NOCS)
+
+    assert set(load_with_journal(data_path)) == {"00005: CRMN", "00010: INFMN", "00101: SAR TECH"}
+    assert compact(data_path) == 2
+    assert json.loads(data_path.read_text()) == {"00005: CRMN": NOCS, "00010: INFMN": [], "00101: SAR TECH": NOCS}
+    assert not journal_path.exists()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["mnet_data.json"]
+    assert compact(data_path) == 0
+
+
+def test_compact_refuses_to_overwrite_corrupt_data(tmp_path):
+    data_path = tmp_path / "mnet_data.json"
+    data_path.write_text('{"00005: CRMN": [')
+    journal_path = journal_path_for(data_path)
+    with ScrapeJournal(journal_path) as journal:
+        journal.append("00101: SAR TECH", NOCS)
+
+    with pytest.raises(ValueError, match="not valid JSON"):
+        compact(data_path)
+    assert data_path.read_text() == '{"00005: CRMN": ['
+    assert read_journal(journal_path) == {"00101: SAR TECH": NOCS}
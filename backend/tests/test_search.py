@@ -0,0 +1,37 @@
+"""Tests for FTS5 full-text search."""
+
+from app.search import search, to_match_query
+
+
+def test_to_match_query_neutralises_fts_syntax():
+    assert to_match_query('data "entry" OR NEAR(x') == '"data" "entry" "OR" "NEAR" "x"'
+    assert to_match_query("  --  ") == ""
+
+
+def test_search_ranks_task_statements_with_snippets(conn):
+    result = search(conn, "data entry", kind="task", limit=3)
+    assert result["results"]
+    top = result["results"][0]
+    assert top["kind"] == "task"
+    assert "[" in top["snippet"] and "]" in top["snippet"]
+    assert top["mosid"] and top["noc_code"]
+    scores = [hit["score"] for hit in result["results"]]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_search_covers_civilian_titles_and_ranks(conn):
+    titles = search(conn, "firefighters", kind="noc")["results"]
+    assert any(hit["title"] == "Firefighters" for hit in titles)
+    ranks = search(conn, "orders", kind="rank")["results"]
+    assert ranks and all("rank" in hit for hit in ranks)
+
+
+def test_search_paginates(conn):
+    first = search(conn, "data", limit=2)
+    assert first["next_offset"] == 2
+    second = search(conn, "data", limit=2, offset=2)
+    assert second["results"] != first["results"]
+
+
+def test_empty_query_returns_no_results(conn):
+    assert search(conn, "!!!") == {"query": "!!!", "results": [], "next_offset": None}
@@ -0,0 +1,129 @@
+"""Tests for the immutable in-memory snapshot mode."""
+
+import asyncio
+import logging
+import shutil
+import sys
+import threading
+from contextlib import closing
+
+import pytest
+
+from app import service
+from app.database import (
+    MNET_DATA_PATH,
+    RANKS_PATH,
+    build_database,
+    connect_readonly,
+    fetch_mosid_profile,
+    fetch_rank,
+)
+from app import snapshot as snapshot_module
+from app.snapshot import SnapshotStore, load_snapshot
+
+
+def test_snapshot_matches_sqlite_lookups(db_path):
+    snapshot = load_snapshot(db_path)
+    with closing(connect_readonly(db_path)) as conn:
+        for code in ("00005", "00008", "99999"):
+            assert snapshot.mosid(code) == fetch_mosid_profile(conn, code)
+        for rank in ("Private", "Sergeant", "General"):
+            assert snapshot.rank(rank) == fetch_rank(conn, rank)
+
+
+def test_snapshot_is_frozen_and_interned(db_path):
+    snapshot = load_snapshot(db_path)
+    with pytest.raises(TypeError):
+        snapshot.mosids["00005"] = None
+    profile = snapshot.mosids["00005"]
+    assert isinstance(profile.equivalencies, tuple)
+    statement = profile.equivalencies[0].task_statements[0]
+    assert sys.intern(statement) is statement
+
+
+def test_store_swaps_snapshot_when_artifact_changes(tmp_path, db_path):
+    store = SnapshotStore(db_path, check_interval=0)
+    before = store.current()
+    assert store.current() is before
+
+    ranks = tmp_path / "ranks.yaml"
+    shutil.copy(RANKS_PATH, ranks)
+    with ranks.open("a") as handle:
+        handle.write("\n- rank: Captain\n  responsibilities:\n    - Command a company\n")
+    build_database(db_path, MNET_DATA_PATH, ranks)
+
+    after = store.current()
+    assert after is not before
+    assert after.version != before.version
+    assert after.rank("Captain")["responsibilities"] == ["Command a company"]
+    assert before.rank("Captain") == {}
+
+
+def test_tools_read_from_snapshot_when_enabled(monkeypatch, db_path):
+    monkeypatch.setattr(service, "SNAPSHOTS", SnapshotStore(db_path))
+    assert service.get_mosid_data("00005")["mosid"] == "00005"
+    assert service.get_rank_data("Private")["responsibilities"]
+    assert service.get_mosid_data("99999") == {}
+
+
+def test_async_lookups_reload_off_the_event_loop(monkeypatch, tmp_path, db_path):
+    store = SnapshotStore(db_path, check_interval=0)
+    monkeypatch.setattr(service, "SNAPSHOTS", store)
+    load_threads = []
+    load_if_changed = store.load_if_changed
+
+    def recording_load():
+        load_threads.append(threading.current_thread())
+        return load_if_changed()
+
+    monkeypatch.setattr(store, "load_if_changed", recording_load)
+    ranks = tmp_path / "ranks.yaml"
+    shutil.copy(RANKS_PATH, ranks)
+    with ranks.open("a") as handle:
+        handle.write("\n- rank: Captain\n  responsibilities:\n    - Command a company\n")
+    build_database(db_path, MNET_DATA_PATH, ranks)
+
+    async def lookups():
+        # The stale snapshot answers while the reload runs in the executor.
+        first = await service.get_rank_data_async("Captain")
+        for _ in range(200):
+            if store.latest.rank("Captain"):
+                break
+            await asyncio.sleep(0.01)
+        return first, await service.get_rank_data_async("Captain")
+
+    first, second = asyncio.run(lookups())
+    assert first == {}
+    assert second["responsibilities"] == ["Command a company"]
+    assert load_threads and threading.main_thread() not in load_threads
+
+
+def test_failed_background_reload_is_logged_and_retried(monkeypatch, caplog, tmp_path, db_path):
+    store = SnapshotStore(db_path, check_interval=0)
+    monkeypatch.setattr(service, "SNAPSHOTS", store)
+    before = store.latest
+    ranks = tmp_path / "ranks.yaml"
+    shutil.copy(RANKS_PATH, ranks)
+    with ranks.open("a") as handle:
+        handle.write("\n- rank: Captain\n  responsibilities:\n    - Command a company\n")
+    build_database(db_path, MNET_DATA_PATH, ranks)
+
+    def broken_load(path):
+        raise OSError("disk went away")
+
+    async def lookup_until(predicate):
+        for _ in range(200):
+            await service.get_rank_data_async("Captain")
+            await asyncio.sleep(0.01)
+            if predicate():
+                return
+
+    with monkeypatch.context() as patch, caplog.at_level(logging.ERROR, logger="app.service"):
+        patch.setattr(snapshot_module, "load_snapshot", broken_load)
+        asyncio.run(lookup_until(lambda: caplog.records))
+    assert "Reloading the served data failed" in caplog.text
+    assert store.latest is before
+
+    # The artifact did not change again, yet the next check loads it.
+    asyncio.run(lookup_until(lambda: store.latest is not before))
+    assert store.latest.rank("Captain")["responsibilities"] == ["Command a company"]
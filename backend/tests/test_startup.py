@@ -0,0 +1,109 @@
+"""Cold-start budgets for the server entry points.
+
+Each check runs a fresh interpreter against a prebuilt artifact, so the
+figures cover module imports plus opening the database, as a newly spawned
+MCP stdio session or a new HTTP worker would see them. Budgets are roughly
+twice the times measured on a single-CPU container.
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+from app.database import MNET_DATA_PATH
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative ``-X importtime`` budgets in milliseconds.
+IMPORT_BUDGETS_MS = {
+    "app.service": 250,
+    "app.http_app": 1200,
+    "app.mcp_app": 2000,
+}
+
+# Modules each entry point must not load.
+EXCLUDED_MODULES = {
+    "app.service": ("fastapi", "mcp", "pydantic", "yaml", "numpy", "scipy"),
+    "app.http_app": ("mcp", "yaml", "numpy", "scipy"),
+    "app.mcp_app": ("fastapi", "yaml", "numpy", "scipy"),
+}
+
+# Interpreter start to first response, in milliseconds.
+FIRST_REQUEST_BUDGETS_MS = {"http": 1200, "mcp": 2000}
+
+FIRST_HTTP_REQUEST = """
+import asyncio, json, time
+started = time.perf_counter()
+from app.http_app import app
+
+async def main():
+    sent = []
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    async def send(message):
+        sent.append(message)
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/v1/mosids/00005", "raw_path": b"/v1/mosids/00005",
+        "root_path": "", "query_string": b"", "headers": [], "client": None, "server": None,
+    }
+    await app(scope, receive, send)
+    return sent[0]["status"]
+
+status = asyncio.run(main())
+print(json.dumps({"status": status, "ms": (time.perf_counter() - started) * 1000}))
+"""
+
+FIRST_MCP_CALL = """
+import asyncio, json, time
+started = time.perf_counter()
+from app.mcp_app import mcp
+
+result = asyncio.run(mcp._tool_manager.call_tool("get_mosid_data", {"mosid_code": "00005"}))
+print(json.dumps({"status": result["mosid"], "ms": (time.perf_counter() - started) * 1000}))
+"""
+
+
+@pytest.fixture(scope="module")
+def server_env(built_db_path):
+    return {**os.environ, "CAF_RESUME_DB_PATH": str(built_db_path), "CAF_RESUME_MNET_DATA": str(MNET_DATA_PATH)}
+
+
+def run_python(args, env):
+    return subprocess.run([sys.executable, *args], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+
+
+def import_ms(module, env):
+    """Best-of-three cumulative import time of ``module`` in milliseconds."""
+
+    pattern = re.compile(rf"^import time:\s+\d+ \|\s+(\d+) \| {re.escape(module)}$", re.MULTILINE)
+    times = []
+    for _ in range(3):
+        stderr = run_python(["-X", "importtime", "-c", f"import {module}"], env).stderr
+        times.append(int(pattern.search(stderr).group(1)) / 1000)
+    return min(times)
+
+
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGETS_MS))
+def test_import_time_within_budget(module, server_env):
+    elapsed = import_ms(module, server_env)
+    assert elapsed <= IMPORT_BUDGETS_MS[module], f"{module} imported in {elapsed:.0f} ms"
+
+
+@pytest.mark.parametrize("module", sorted(EXCLUDED_MODULES))
+def test_entry_point_skips_unneeded_modules(module, server_env):
+    code = f"import json, sys; import {module}; print(json.dumps(sorted(sys.modules)))"
+    loaded = set(json.loads(run_python(["-c", code], server_env).stdout))
+    assert not loaded & set(EXCLUDED_MODULES[module])
+
+
+@pytest.mark.parametrize(("surface", "code", "expected"), [("http", FIRST_HTTP_REQUEST, 200), ("mcp", FIRST_MCP_CALL, "00005")])
+def test_time_to_first_request_within_budget(surface, code, expected, server_env):
+    runs = [json.loads(run_python(["-c", code], server_env).stdout.strip().splitlines()[-1]) for _ in range(3)]
+    assert all(run["status"] == expected for run in runs)
+    elapsed = min(run["ms"] for run in runs)
+    assert elapsed <= FIRST_REQUEST_BUDGETS_MS[surface], f"first {surface} request after {elapsed:.0f} ms"
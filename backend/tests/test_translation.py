@@ -0,0 +1,97 @@
+"""Tests for the template translation engine."""
+
+from app.translation import TranslationEngine, parse_format
+
+CATALOG = {
+    "version": "test",
+    "families": [
+        {
+            "mosid_family": "00109 - Signals Technician",
+            "templates": [
+                {
+                    "trigger": "network_operations",
+                    "source_indicators": ["maintained communications suite", "deployed signals detachment"],
+                    "civilian_translation": "Supported {user_base} users\n  within {sla}.",
+                    "default_values": {"user_base": "250+", "sla": "mission timelines"},
+                },
+                {
+                    "trigger": "equipment_accountability",
+                    "source_indicators": ["equipment custodian"],
+                    "civilian_translation": "Tracked {equipment_scope} worth ${value:,}.",
+                    "default_values": {"equipment_scope": "assets"},
+                },
+            ],
+        },
+        {
+            "mosid_family": "00168 - Medical Technician",
+            "templates": [
+                {
+                    "trigger": "patient_care",
+                    "source_indicators": ["Equipment Custodian"],
+                    "civilian_translation": "Managed clinic stock.",
+                }
+            ],
+        },
+    ],
+}
+
+
+def test_parse_format_splits_literals_and_fields():
+    pieces = parse_format("Led {team_size:d} people.")
+    assert [(piece.literal, piece.field, piece.spec) for piece in pieces] == [
+        ("Led ", "team_size", "d"),
+        (" people.", None, ""),
+    ]
+
+
+def test_defaults_are_rendered_once_at_load():
+    (template,) = TranslationEngine(CATALOG).templates_for("maintained  communications suite")
+    assert template.default_text == "Supported 250+ users within mission timelines."
+    assert template.render() is template.default_text
+    assert template.render({"unrelated": "x"}) is template.default_text
+
+
+def test_overrides_and_missing_placeholders():
+    (template, _) = TranslationEngine(CATALOG).templates_for("equipment custodian")
+    assert template.render() == "Tracked assets worth ${value}."
+    assert template.render({"value": 12000}) == "Tracked assets worth $12,000."
+
+
+def test_translate_entry_merges_indicators_and_filters_family():
+    engine = TranslationEngine(CATALOG)
+    result = engine.translate_entry(
+        ["deployed signals detachment", "Maintained communications suite", "led section"],
+        {"user_base": 40},
+    )
+    assert result["bullets"] == [
+        {
+            "mosid_family": "00109 - Signals Technician",
+            "trigger": "network_operations",
+            "text": "Supported 40 users within mission timelines.",
+            "indicators": ["deployed signals detachment", "maintained communications suite"],
+        }
+    ]
+    assert result["unmatched_indicators"] == ["led section"]
+
+    filtered = engine.translate_entry(["equipment custodian"], mosid_family="00168 - Medical Technician")
+    assert [bullet["trigger"] for bullet in filtered["bullets"]] == ["patient_care"]
+
+
+def test_bundled_templates_translate_text_batches():
+    from app.indicators import IndicatorMatcher
+
+    engine = TranslationEngine.from_path()
+    result = engine.translate(
+        [
+            {"id": "tour-1", "text": "Served as platoon leader on Op REASSURANCE."},
+            {"indicators": ["coordinated resupply"]},
+        ],
+        IndicatorMatcher.from_path(),
+    )
+    assert result["templates_version"] == engine.version
+    first, second = result["results"]
+    assert first["id"] == "tour-1"
+    assert first["bullets"][0]["trigger"] == "deployment_leadership"
+    assert "35-person" in first["bullets"][0]["text"]
+    assert second["id"] == "1"
+    assert second["bullets"]